@@ -135,6 +135,7 @@ def main() -> int:
         from Plugin.ops import bake_export_operator as bake_ops
         from Plugin.export import bake_textures, blender_usd_export, postprocess_usd, pack_usdz, diagnostics
         from Plugin.nodes import validate as rk_validate
+        from Plugin.core.material_ir import material_ir_scope
     except Exception as exc:
         _update_status(status_path, "error", 1.0, f"Import failed: {exc}", export_path=payload.get("export_path"))
         print("Import error:", exc)
@@ -155,6 +156,7 @@ def main() -> int:
     original_force_unlit = getattr(scene_settings, "force_unlit_materials", False)
 
     bake_result = None
+    temp_usd_path = None
 
     try:
         bake_ops._ensure_object_mode(bpy.context)
@@ -185,49 +187,52 @@ def main() -> int:
         if getattr(scene_settings, "selected_objects_only", False):
             bake_ops._set_selection(bpy.context, objects_to_export)
 
-        materials = bake_ops._collect_materials_from_objects(objects_to_export)
-        for material in materials:
-            try:
-                result = rk_validate.validate_material(material, strict=True)
-            except TypeError:
-                result = rk_validate.validate_material(material)
-                if result.get("warnings"):
-                    result["errors"].extend(result["warnings"])
-                    result["warnings"] = []
-                result["ok"] = not result["errors"]
-            if result["errors"]:
-                error_count = len(result["errors"])
-                _update_status(
-                    status_path,
-                    "error",
-                    1.0,
-                    f"Unsupported nodes in material '{material.name}' ({error_count})",
-                    export_path=payload.get("export_path"),
-                )
+        # Validation (after baking) and material rewrite share one node-tree snapshot per material.
+        with material_ir_scope():
+            materials = bake_ops._collect_materials_from_objects(objects_to_export)
+            for material in materials:
+                try:
+                    result = rk_validate.validate_material(material, strict=True)
+                except TypeError:
+                    result = rk_validate.validate_material(material)
+                    if result.get("warnings"):
+                        result["errors"].extend(result["warnings"])
+                        result["warnings"] = []
+                    result["ok"] = not result["errors"]
+                if result["errors"]:
+                    error_count = len(result["errors"])
+                    _update_status(
+                        status_path,
+                        "error",
+                        1.0,
+                        f"Unsupported nodes in material '{material.name}' ({error_count})",
+                        export_path=payload.get("export_path"),
+                    )
+                    return 1
+
+            _update_status(status_path, "running", 0.55, "Exporting USD", export_path=payload.get("export_path"))
+            temp_usd_path = blender_usd_export.export_blender_scene(
+                bpy.context,
+                scene_settings,
+                export_path,
+                diag,
+            )
+            if not temp_usd_path or not Path(temp_usd_path).exists():
+                _update_status(status_path, "error", 1.0, "Blender USD export failed", export_path=payload.get("export_path"))
                 return 1
 
-        _update_status(status_path, "running", 0.55, "Exporting USD", export_path=payload.get("export_path"))
-        temp_usd_path = blender_usd_export.export_blender_scene(
-            bpy.context,
-            scene_settings,
-            export_path,
-            diag,
-        )
-        if not temp_usd_path or not Path(temp_usd_path).exists():
-            _update_status(status_path, "error", 1.0, "Blender USD export failed", export_path=payload.get("export_path"))
-            return 1
-
-        _update_status(status_path, "running", 0.7, "Rewriting materials (Unlit)", export_path=payload.get("export_path"))
-        postprocess_usd.process_usd_stage(
-            temp_usd_path,
-            scene_settings,
-            bpy.context,
-            diag
-        )
+            _update_status(status_path, "running", 0.7, "Rewriting materials (Unlit)", export_path=payload.get("export_path"))
+            postprocess_usd.process_usd_stage(
+                temp_usd_path,
+                scene_settings,
+                bpy.context,
+                diag,
+                output_path=None if scene_settings.export_format == "USDZ" else export_path,
+            )
 
-        if diag.data.get("errors"):
-            _update_status(status_path, "error", 1.0, "Postprocess failed; see diagnostics", export_path=payload.get("export_path"))
-            return 1
+            if diag.data.get("errors"):
+                _update_status(status_path, "error", 1.0, "Postprocess failed; see diagnostics", export_path=payload.get("export_path"))
+                return 1
 
         if scene_settings.export_format == "USDZ":
             _update_status(status_path, "running", 0.85, "Packaging USDZ", export_path=payload.get("export_path"))
@@ -238,10 +243,6 @@ def main() -> int:
                 bpy.context,
                 diag
             )
-        else:
-            import shutil
-            if temp_usd_path != export_path:
-                shutil.move(temp_usd_path, export_path)
 
         _update_status(status_path, "done", 1.0, "Bake & Export complete", str(log_path), export_path)
         return 0
@@ -252,6 +253,7 @@ def main() -> int:
         traceback.print_exc()
         return 1
     finally:
+        blender_usd_export.remove_temp_export(temp_usd_path)
         scene_settings.force_unlit_materials = original_force_unlit
         try:
             bpy.context.scene.render.engine = original_engine
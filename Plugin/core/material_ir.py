@@ -0,0 +1,313 @@
+"""
+Single-pass snapshot of a Blender material node tree.
+
+Validation (`nodes/validate.py`), export warnings and extraction
+(`export/materials/extract/core.py`) all read the same `MaterialIR` instead of
+walking `material.node_tree` themselves. The snapshot is built with one pass
+over `node_tree.nodes` and one over `node_tree.links`:
+
+- Topology (nodes, sockets, links, `is_linked`, reachability from the active
+  Material Output) is captured eagerly.
+- Any other attribute (`default_value`, `image`, `operation`, `color_ramp`, ...)
+  is read from Blender on first access and memoized, so each bpy attribute is
+  fetched at most once per export no matter how many consumers read it.
+
+Snapshot objects duck-type the bpy node/socket/link API used by the exporter,
+so consumers can treat them like the originals. `NodeIR.bpy_node` returns the
+real node when Blender data must be edited (e.g. selecting offending nodes).
+
+Within `material_ir_scope()` (opened by the export operators), snapshots are
+shared per material and `scope_memo()` tables (e.g. node-group templates) are
+shared across materials; outside a scope every call builds fresh data.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_SCOPE_CACHE: Optional[Dict[int, "MaterialIR"]] = None
+_SCOPE_MEMOS: Optional[Dict[str, Dict[Any, Any]]] = None
+
+
+class _Snapshot:
+    """Base for snapshot objects: unknown attributes are read once from bpy."""
+
+    _raw: Any
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        value = getattr(self._raw, attr)
+        if attr == "default_value":
+            value = _freeze_value(value)
+        if not callable(value):
+            self.__dict__[attr] = value
+        return value
+
+
+class SocketIR(_Snapshot):
+    """Snapshot of a node socket."""
+
+    def __init__(self, raw, node: "NodeIR", is_output: bool):
+        self._raw = raw
+        self.node = node
+        self.name = raw.name
+        self.identifier = raw.identifier
+        self.is_output = is_output
+        self.links: Tuple["LinkIR", ...] = ()
+
+    @property
+    def is_linked(self) -> bool:
+        return bool(self.links)
+
+    def __repr__(self) -> str:
+        return f"<SocketIR {self.node.name}.{self.name}>"
+
+
+class LinkIR(_Snapshot):
+    """Snapshot of a node link."""
+
+    def __init__(self, raw, from_socket: SocketIR, to_socket: SocketIR):
+        self._raw = raw
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+
+
+class SocketCollectionIR:
+    """Ordered socket collection with bpy-style name/index lookup."""
+
+    def __init__(self, sockets: List[SocketIR]):
+        self._sockets = tuple(sockets)
+        self._by_name: Dict[str, SocketIR] = {}
+        for socket in self._sockets:
+            # bpy's `.get(name)` returns the first socket with that name.
+            self._by_name.setdefault(socket.name, socket)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._by_name[key]
+        return self._sockets[key]
+
+    def get(self, key: str, default=None):
+        return self._by_name.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        if isinstance(key, str):
+            return key in self._by_name
+        return key in self._sockets
+
+    def __iter__(self) -> Iterator[SocketIR]:
+        return iter(self._sockets)
+
+    def __len__(self) -> int:
+        return len(self._sockets)
+
+    def keys(self) -> List[str]:
+        return [socket.name for socket in self._sockets]
+
+    def values(self) -> List[SocketIR]:
+        return list(self._sockets)
+
+    def items(self) -> List[Tuple[str, SocketIR]]:
+        return [(socket.name, socket) for socket in self._sockets]
+
+
+class NodeIR(_Snapshot):
+    """Snapshot of a shader node."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.name = raw.name
+        self.type = raw.type
+        self.inputs = SocketCollectionIR([SocketIR(socket, self, False) for socket in raw.inputs])
+        self.outputs = SocketCollectionIR([SocketIR(socket, self, True) for socket in raw.outputs])
+
+    @property
+    def bpy_node(self):
+        return self._raw
+
+    def __repr__(self) -> str:
+        return f"<NodeIR {self.name} ({self.type})>"
+
+
+class MaterialIR:
+    """Snapshot of a material's node tree plus precomputed reachability."""
+
+    def __init__(self, material):
+        self.material = material
+        self.name = getattr(material, "name", "Unknown")
+        self.use_nodes = bool(getattr(material, "use_nodes", False))
+        self.nodes: Tuple[NodeIR, ...] = ()
+        self.active_output: Optional[NodeIR] = None
+        self.used_nodes: Tuple[NodeIR, ...] = ()
+        self.volume_linked = False
+        self.displacement_linked = False
+
+        node_tree = getattr(material, "node_tree", None) if self.use_nodes else None
+        self.has_node_tree = node_tree is not None
+        if node_tree is None:
+            return
+
+        self.nodes = tuple(NodeIR(raw_node) for raw_node in node_tree.nodes)
+
+        sockets_by_pointer: Dict[int, SocketIR] = {}
+        for node in self.nodes:
+            for socket in node.inputs:
+                sockets_by_pointer[socket._raw.as_pointer()] = socket
+            for socket in node.outputs:
+                sockets_by_pointer[socket._raw.as_pointer()] = socket
+
+        socket_links: Dict[SocketIR, List[LinkIR]] = {}
+        for raw_link in node_tree.links:
+            from_socket = _lookup_socket(sockets_by_pointer, raw_link.from_socket)
+            to_socket = _lookup_socket(sockets_by_pointer, raw_link.to_socket)
+            if from_socket is None or to_socket is None:
+                continue
+            link = LinkIR(raw_link, from_socket, to_socket)
+            socket_links.setdefault(from_socket, []).append(link)
+            socket_links.setdefault(to_socket, []).append(link)
+        for socket, links in socket_links.items():
+            socket.links = tuple(links)
+
+        self.active_output = _find_active_output(self.nodes)
+        if self.active_output is not None:
+            self._collect_used_nodes()
+
+    @property
+    def surface_node(self) -> Optional[NodeIR]:
+        """Return the node connected to the active Material Output surface."""
+        if self.active_output is None:
+            return None
+        surface_socket = self.active_output.inputs.get('Surface')
+        if not surface_socket or not surface_socket.is_linked:
+            return None
+        return surface_socket.links[0].from_node
+
+    def nodes_of_type(self, node_type: str) -> List[NodeIR]:
+        return [node for node in self.nodes if node.type == node_type]
+
+    def _collect_used_nodes(self) -> None:
+        used: Dict[NodeIR, None] = {}
+        stack: List[NodeIR] = []
+
+        for socket_name in ("Surface", "Volume", "Displacement"):
+            socket = self.active_output.inputs.get(socket_name)
+            if not socket or not socket.is_linked:
+                continue
+            if socket_name == "Volume":
+                self.volume_linked = True
+            if socket_name == "Displacement":
+                self.displacement_linked = True
+            for link in socket.links:
+                stack.append(link.from_node)
+
+            while stack:
+                node = stack.pop()
+                if node in used:
+                    continue
+                used[node] = None
+                for input_socket in reversed(node.inputs._sockets):
+                    for link in reversed(input_socket.links):
+                        if link.from_node not in used:
+                            stack.append(link.from_node)
+
+        self.used_nodes = tuple(used)
+
+
+@contextmanager
+def material_ir_scope():
+    """Share material snapshots between validation, warnings and extraction."""
+    global _SCOPE_CACHE, _SCOPE_MEMOS
+    previous = _SCOPE_CACHE
+    previous_memos = _SCOPE_MEMOS
+    if previous is None:
+        _SCOPE_CACHE = {}
+        _SCOPE_MEMOS = {}
+    try:
+        yield
+    finally:
+        _SCOPE_CACHE = previous
+        _SCOPE_MEMOS = previous_memos
+
+
+def get_material_ir(material) -> MaterialIR:
+    """Return the snapshot for a material (shared inside `material_ir_scope`)."""
+    if _SCOPE_CACHE is None:
+        return MaterialIR(material)
+    try:
+        key = material.as_pointer()
+    except Exception:
+        key = id(material)
+    ir = _SCOPE_CACHE.get(key)
+    if ir is None:
+        ir = MaterialIR(material)
+        _SCOPE_CACHE[key] = ir
+    return ir
+
+
+def scope_memo(name: str) -> Dict[Any, Any]:
+    """Return a named memo table shared for the current `material_ir_scope`."""
+    if _SCOPE_MEMOS is None:
+        return {}
+    return _SCOPE_MEMOS.setdefault(name, {})
+
+
+def group_used_nodes(node_tree) -> Tuple[Any, ...]:
+    """Return the nodes of a node group reachable from its active Group Output."""
+    memo = scope_memo("group_used_nodes")
+    try:
+        key = node_tree.as_pointer()
+    except Exception:
+        key = id(node_tree)
+    if key in memo:
+        return memo[key]
+
+    outputs = [node for node in node_tree.nodes if node.type == 'GROUP_OUTPUT']
+    output = next((node for node in outputs if getattr(node, "is_active_output", False)), None)
+    if output is None and outputs:
+        output = outputs[0]
+
+    used: Dict[Any, None] = {}
+    stack: List[Any] = [output] if output is not None else []
+    while stack:
+        node = stack.pop()
+        if node in used:
+            continue
+        used[node] = None
+        for input_socket in reversed(list(node.inputs)):
+            for link in reversed(list(input_socket.links)):
+                if link.from_node not in used:
+                    stack.append(link.from_node)
+
+    memo[key] = tuple(used)
+    return memo[key]
+
+
+def _lookup_socket(sockets_by_pointer: Dict[int, SocketIR], raw_socket) -> Optional[SocketIR]:
+    if raw_socket is None:
+        return None
+    return sockets_by_pointer.get(raw_socket.as_pointer())
+
+
+def _find_active_output(nodes) -> Optional[NodeIR]:
+    output_nodes = [node for node in nodes if node.type == 'OUTPUT_MATERIAL']
+    if not output_nodes:
+        return None
+    for node in output_nodes:
+        if getattr(node, "is_active_output", False):
+            return node
+    return output_nodes[0]
+
+
+def _freeze_value(value: Any) -> Any:
+    """Copy bpy array values into tuples so snapshots don't alias Blender memory."""
+    if isinstance(value, (str, bytes)):
+        return value
+    if hasattr(value, "__len__") and hasattr(value, "__getitem__"):
+        try:
+            return tuple(value)
+        except TypeError:
+            return value
+    return value
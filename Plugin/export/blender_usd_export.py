@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Optional
 
 from . import animation_export
+from .file_staging import export_work_dir, remove_temp_export
 
 
 _AXIS_TO_USD_EXPORT_ENUM = {
@@ -30,7 +31,6 @@ _VALID_USD_EXPORT_AXES = {
 
 _VALID_USD_EXPORT_NGON_METHODS = {"BEAUTY", "CLIP"}
 
-
 def _axis_for_usd_export(value: str) -> str:
     """Map UI axis values (e.g. '-Z') to Blender USD exporter enum values."""
     if value is None:
@@ -81,24 +81,18 @@ def export_blender_scene(context, settings, final_path: str, diagnostics=None) -
         final_path: Final output path
         
     Returns:
-        Path to exported USD file (temporary if USDZ is requested)
+        Path to the temporary binary (.usdc) USD file. It is post-processed as
+        crate whatever the requested format, and converted to the final format
+        once at the end (see `postprocess_usd.process_usd_stage`). It lives in
+        `file_staging.export_work_dir()`: a fresh temporary directory, or for
+        USDZ output the work directory that keeps staged textures between
+        exports. Callers remove it with `remove_temp_export()` once the export
+        is done.
     """
-    export_format = getattr(settings, "export_format", "USDA")
-    if export_format == 'USD':
-        export_format = 'USDC'
-
-    # Determine output path
-    if export_format == 'USDZ':
-        # Create temporary USD file
-        temp_dir = Path(final_path).parent / ".blendertorcp_temp"
-        temp_dir.mkdir(exist_ok=True)
-        temp_usd = temp_dir / f"{Path(final_path).stem}.usdc"
-        output_path = str(temp_usd)
-    else:
-        output_path = final_path
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Parsing and writing ASCII USD is far slower than crate for heavy meshes,
+    # so the intermediate is always binary.
+    temp_dir = export_work_dir(final_path, keep_staged=getattr(settings, "export_format", None) == 'USDZ')
+    output_path = str(temp_dir / f"{Path(final_path).stem}.usdc")
     
     # Get export settings
     root_prim_name = settings.root_prim_name or "Scene"
@@ -190,6 +184,7 @@ def export_blender_scene(context, settings, final_path: str, diagnostics=None) -
         return output_path
         
     except Exception as e:
+        remove_temp_export(output_path)
         # Check if USD exporter is available
         if not hasattr(bpy.ops.wm, 'usd_export'):
             raise RuntimeError(
@@ -18,6 +18,7 @@ class ExportDiagnostics:
             'materials': {
                 'converted': 0,
                 'failed': 0,
+                'deduplicated': [],
                 'warnings': [],
             },
             'textures': {
@@ -37,6 +38,8 @@ class ExportDiagnostics:
                 'segments': [],
                 'targets': [],
             },
+            'manifest': {},
+            'staging': {},
             'errors': [],
             'warnings': [],
         }
@@ -54,6 +57,13 @@ class ExportDiagnostics:
         })
         self.add_error(f"Material conversion failed: {material_name} ({reason})")
     
+    def add_material_deduplicated(self, material_name: str, shared_path: str):
+        """Record a material bound to a structurally identical shared material"""
+        self.data['materials']['deduplicated'].append({
+            'material': material_name,
+            'shared': shared_path,
+        })
+    
     def add_texture_copied(self, texture_path: str):
         """Record a copied texture"""
         self.data['textures']['copied'] += 1
@@ -109,7 +119,27 @@ class ExportDiagnostics:
         self.data['animations']['total_frames'] = total_frames
         self.data['animations']['segments'] = segments
         self.data['animations']['targets'] = targets
-    
+
+    def set_manifest_stats(self, stats: Dict[str, Any]):
+        """Record MaterialX manifest registry load/hit counters."""
+        self.data['manifest'] = dict(stats)
+
+    def set_material_cache_stats(self, stats: Dict[str, Any]):
+        """Record material extraction cache hit/miss counters."""
+        self.data['materials']['cache'] = dict(stats)
+
+    def set_material_library_stats(self, stats: Dict[str, Any]):
+        """Record sidecar material library hit/write counters."""
+        self.data['materials']['library'] = dict(stats)
+
+    def set_material_template_stats(self, stats: Dict[str, Any]):
+        """Record material template/instance counters."""
+        self.data['materials']['templates'] = dict(stats)
+
+    def set_staging_stats(self, kind: str, stats: Dict[str, Any]):
+        """Record files/bytes staged per strategy for textures or assets."""
+        self.data['staging'][kind] = dict(stats)
+
     def to_dict(self) -> Dict[str, Any]:
         """Get diagnostics as dictionary"""
         return self.data.copy()
@@ -131,6 +161,7 @@ class ExportDiagnostics:
             "=" * 40,
             f"Materials converted: {self.data['materials']['converted']}",
             f"Materials failed: {self.data['materials']['failed']}",
+            f"Materials deduplicated: {len(self.data['materials']['deduplicated'])}",
             f"Textures copied: {self.data['textures']['copied']}",
             f"Textures converted: {self.data['textures']['converted']}",
         ]
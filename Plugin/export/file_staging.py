@@ -0,0 +1,316 @@
+"""
+Parallel file staging for exported textures and assets.
+
+`FileStager` places queued source -> destination files through a bounded
+thread pool. Each file is cloned (reflink: `clonefile` on APFS, `FICLONE` on
+Btrfs/XFS) or hard-linked when the filesystems allow it, and byte-copied
+otherwise. Files are placed under a temporary name and renamed over the
+destination, so re-staging never writes through an earlier hard link into a
+source file.
+
+A strategy the filesystem rejects (e.g. no reflink support on ext4/NTFS, no
+hard links on exFAT) is not retried for other files on the same source device.
+
+`hash_files()` hashes file contents in chunks on the same kind of pool, with
+results cached for the session by (path, size, mtime), so staging can collapse
+byte-identical files into one.
+
+`StagingManifest` (`.blendertorcp_staging.json` next to the export) records the
+source path, size, mtime and content hash of each staged file. A destination
+whose manifest entry still matches both its source and itself is skipped on
+re-export, and recorded hashes seed the hash cache so unchanged sources are not
+read again in a new session.
+
+The intermediate export lives in `export_work_dir()`. For USD/USDA/USDC output
+that is a per-export temporary directory, and files are staged next to the
+final file. For USDZ it is a work directory kept next to the `.usdz`, one per
+output file: `remove_temp_export()` only deletes the intermediate layer, so the
+staged textures, assets, manifest and material library survive until the next
+export of the same file.
+"""
+
+import ctypes
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+MAX_STAGING_WORKERS = 8
+STAGING_STRATEGIES = ("reflink", "hardlink", "copy")
+STAGING_MANIFEST_NAME = ".blendertorcp_staging.json"
+STAGING_MANIFEST_VERSION = 1
+# Per-export scratch directory next to the final output (same filesystem, so
+# staged files can be hard-linked); removed by `remove_temp_export()`.
+TEMP_DIR_PREFIX = ".blendertorcp_temp_"
+# Per-output USDZ work directory next to the final output, kept between exports.
+USDZ_WORK_DIR_PREFIX = ".blendertorcp_usdz_"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Errors meaning "this filesystem cannot do that", as opposed to a per-file failure.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+    errno.EOPNOTSUPP,
+}
+_FICLONE = 0x40049409
+_libc = None
+# (path, size, mtime_ns) -> sha256 hex digest, kept for the Blender session.
+_hash_cache: Dict[Tuple[str, int, int], str] = {}
+
+
+class StagingResult:
+    """Outcome of staging one file; `strategy` is "unchanged" if it was already in place."""
+
+    def __init__(self, source: Path, dest: Path, strategy: Optional[str] = None, size: int = 0, error=None):
+        self.source = source
+        self.dest = dest
+        self.strategy = strategy
+        self.size = size
+        self.error: Optional[Exception] = error
+
+
+class StagingManifest:
+    """Per-directory record of staged files, used to skip unchanged copies."""
+
+    def __init__(self, export_dir: Path):
+        self.export_dir = Path(export_dir)
+        self.path = self.export_dir / STAGING_MANIFEST_NAME
+        self._files: Dict[str, Dict[str, Any]] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict) and data.get("version") == STAGING_MANIFEST_VERSION:
+            self._files = dict(data.get("files") or {})
+        for entry in self._files.values():
+            key = (entry.get("source"), entry.get("size"), entry.get("mtime_ns"))
+            if entry.get("sha256") and None not in key:
+                _hash_cache.setdefault(key, entry["sha256"])
+
+    def is_current(self, source: Path, dest: Path) -> bool:
+        """True if `dest` was staged from `source` and neither has changed since."""
+        entry = self._files.get(self._key(dest))
+        if entry is None or entry.get("source") != str(source):
+            return False
+        try:
+            source_stat = source.stat()
+            dest_stat = dest.stat()
+        except OSError:
+            return False
+        return (
+            entry.get("size") == source_stat.st_size
+            and entry.get("mtime_ns") == source_stat.st_mtime_ns
+            and entry.get("dest_size") == dest_stat.st_size
+            and entry.get("dest_mtime_ns") == dest_stat.st_mtime_ns
+        )
+
+    def source_for(self, dest: Path) -> Optional[Path]:
+        """Return the recorded source of `dest` if it still exists."""
+        entry = self._files.get(self._key(dest))
+        source = Path(entry["source"]) if entry and entry.get("source") else None
+        return source if source is not None and source.exists() else None
+
+    def record(self, source: Path, dest: Path) -> None:
+        """Record that `dest` now holds a copy of `source`."""
+        source_stat = source.stat()
+        dest_stat = dest.stat()
+        self._files[self._key(dest)] = {
+            "source": str(source),
+            "size": source_stat.st_size,
+            "mtime_ns": source_stat.st_mtime_ns,
+            "sha256": _hash_cache.get((str(source), source_stat.st_size, source_stat.st_mtime_ns)),
+            "dest_size": dest_stat.st_size,
+            "dest_mtime_ns": dest_stat.st_mtime_ns,
+        }
+
+    def save(self) -> None:
+        """Write the manifest, dropping entries whose destination is gone."""
+        files = {key: entry for key, entry in sorted(self._files.items()) if (self.export_dir / key).exists()}
+        payload = {"version": STAGING_MANIFEST_VERSION, "files": files}
+        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    def _key(self, dest: Path) -> str:
+        return Path(os.path.relpath(dest, self.export_dir)).as_posix()
+
+
+def export_work_dir(final_path, keep_staged: bool = False) -> Path:
+    """Create the directory the intermediate export of `final_path` is written to.
+
+    With `keep_staged` (USDZ output) this is the output's persistent work
+    directory; otherwise a fresh temporary directory.
+    """
+    final_path = Path(final_path)
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    if keep_staged:
+        work_dir = final_path.parent / f"{USDZ_WORK_DIR_PREFIX}{final_path.name}"
+        work_dir.mkdir(exist_ok=True)
+        return work_dir
+    return Path(tempfile.mkdtemp(prefix=TEMP_DIR_PREFIX, dir=final_path.parent))
+
+
+def remove_temp_export(temp_usd_path: Optional[str]) -> None:
+    """Delete the intermediate export at `temp_usd_path`.
+
+    A temporary directory is removed with everything in it. A USDZ work
+    directory keeps its staged files for the next export of the same output.
+    """
+    if not temp_usd_path:
+        return
+    temp_path = Path(temp_usd_path)
+    if temp_path.parent.name.startswith(TEMP_DIR_PREFIX):
+        shutil.rmtree(temp_path.parent, ignore_errors=True)
+    elif temp_path.parent.name.startswith(USDZ_WORK_DIR_PREFIX):
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+
+
+class FileStager:
+    """Stages queued files in parallel and counts files/bytes per strategy.
+
+    Destinations that already are the source (hard links) and, with a
+    `StagingManifest`, destinations that are still current are left as they
+    are (counted as "unchanged"); newly staged files are recorded.
+    """
+
+    def __init__(self, max_workers: int = MAX_STAGING_WORKERS, manifest: Optional[StagingManifest] = None):
+        self.max_workers = max_workers
+        self.manifest = manifest
+        self._jobs: List[Tuple[Path, Path]] = []
+        self._unsupported: Set[Tuple[str, int]] = set()
+        self._stats: Dict[str, Dict[str, int]] = {
+            strategy: {"files": 0, "bytes": 0} for strategy in (*STAGING_STRATEGIES, "unchanged")
+        }
+
+    def add(self, source: Path, dest: Path) -> None:
+        """Queue `source` to be staged at `dest`."""
+        self._jobs.append((Path(source), Path(dest)))
+
+    def run(self) -> List[StagingResult]:
+        """Stage all queued files; results come back in queue order."""
+        jobs, self._jobs = self._jobs, []
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as pool:
+            results = list(pool.map(self._stage, jobs))
+        for result in results:
+            if result.error is None and result.strategy:
+                self._stats[result.strategy]["files"] += 1
+                self._stats[result.strategy]["bytes"] += result.size
+                if self.manifest is not None and result.strategy in STAGING_STRATEGIES:
+                    try:
+                        self.manifest.record(result.source, result.dest)
+                    except OSError:
+                        pass
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Return files/bytes staged per strategy for diagnostics."""
+        return {strategy: dict(counts) for strategy, counts in self._stats.items()}
+
+    def _stage(self, job: Tuple[Path, Path]) -> StagingResult:
+        source, dest = job
+        try:
+            stat = source.stat()
+            if dest.exists() and os.path.samefile(source, dest):
+                # Hard-linked by an earlier export (or staged onto itself).
+                return StagingResult(source, dest, "unchanged", stat.st_size)
+            if self.manifest is not None and self.manifest.is_current(source, dest):
+                return StagingResult(source, dest, "unchanged", stat.st_size)
+            return StagingResult(source, dest, self._place(source, dest, stat.st_dev), stat.st_size)
+        except Exception as exc:
+            return StagingResult(source, dest, error=exc)
+
+    def _place(self, source: Path, dest: Path, device: int) -> str:
+        temp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.staging")
+        _remove(temp)
+        for strategy in STAGING_STRATEGIES:
+            if (strategy, device) in self._unsupported:
+                continue
+            try:
+                _STRATEGY_FUNCTIONS[strategy](source, temp)
+            except OSError as exc:
+                _remove(temp)
+                if strategy == "copy":
+                    raise
+                if exc.errno in _UNSUPPORTED_ERRNOS:
+                    self._unsupported.add((strategy, device))
+                continue
+            os.replace(temp, dest)
+            return strategy
+        raise RuntimeError(f"No staging strategy succeeded for {source}")
+
+
+def hash_files(paths: Iterable[Path], max_workers: int = MAX_STAGING_WORKERS) -> Dict[Path, str]:
+    """Return the SHA-256 of each readable file in `paths`; unreadable files are left out."""
+    paths = list(dict.fromkeys(Path(path) for path in paths))
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as pool:
+        digests = list(pool.map(_hash_file, paths))
+    return {path: digest for path, digest in zip(paths, digests) if digest is not None}
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    try:
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        digest = _hash_cache.get(key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            digest = _hash_cache[key] = hasher.hexdigest()
+        return digest
+    except OSError:
+        return None
+
+
+def _reflink(source: Path, dest: Path) -> None:
+    if sys.platform == "darwin":
+        global _libc
+        if _libc is None:
+            _libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        if _libc.clonefile(os.fsencode(source), os.fsencode(dest), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(dest))
+        return
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform", str(dest))
+    import fcntl
+
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    shutil.copystat(source, dest)
+
+
+def _hardlink(source: Path, dest: Path) -> None:
+    os.link(source, dest)
+
+
+def _copy(source: Path, dest: Path) -> None:
+    shutil.copy2(source, dest)
+
+
+_STRATEGY_FUNCTIONS = {"reflink": _reflink, "hardlink": _hardlink, "copy": _copy}
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
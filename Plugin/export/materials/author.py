@@ -16,6 +16,7 @@ from .conversions import (
     _create_convert_output,
 )
 from .helpers import (
+    ChildNameIndex,
     _assign_graph_node_names,
     _collect_connected_inputs,
     _get_node_def,
@@ -46,7 +47,8 @@ def create_materialx_material(
         raise ValueError("MaterialX graph has no nodes")
 
     connections = graph.get('connections', [])
-    name_map = _assign_graph_node_names(stage, material_path, nodes)
+    names = ChildNameIndex(stage, material_path)
+    name_map = _assign_graph_node_names(names, nodes)
     connected_inputs = _collect_connected_inputs(connections)
 
     texture_prefs: Dict[Any, str] = {}
@@ -67,6 +69,7 @@ def create_materialx_material(
                 texture_prefs[key] = "color4"
 
     texture_cache: Dict[Any, Dict[str, Any]] = {}
+    coordinate_cache: Dict[Any, Any] = {}
 
     node_shaders: Dict[str, Any] = {}
     node_defs: Dict[str, Any] = {}
@@ -129,7 +132,9 @@ def create_materialx_material(
                     manifest,
                     material_name,
                     texture_cache,
-                    diagnostics
+                    diagnostics,
+                    coordinate_cache,
+                    names,
                 )
                 if texture_output:
                     shader_input = shader.CreateInput(
@@ -218,6 +223,7 @@ def create_materialx_material(
                 from_type,
                 to_type,
                 diagnostics,
+                names,
             )
             shader_input.ConnectToSource(converted_output)
         else:
@@ -0,0 +1,405 @@
+"""
+Persistent material extraction cache.
+
+`rewrite_materials` keys each Blender material by a content hash of its
+reachable node graph (node types and properties, socket defaults, links, node
+group contents and image identity). On a hit the cached `material_data` and the
+built MaterialX graph payload are reused instead of re-extracting; on a miss
+they are stored for the next export.
+
+Entries are stored as JSON, one file per key, in the per-user cache directory
+(never in the export folder, which is often shared or synced). Only plain JSON
+values are written and entries are schema-checked on load, so a planted file
+can at worst be a cache miss. Reads touch the file mtime, and `prune()` evicts
+least-recently-used entries once the directory exceeds its byte budget.
+
+Hashing reads node properties through the material's `MaterialIR`, whose
+memoized values extraction reuses on a miss, so a cold cache does not read
+each bpy attribute twice.
+
+Materials whose content cannot be fingerprinted (generated or unsaved images)
+are never cached.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ...core.material_ir import get_material_ir
+
+
+MATERIAL_CACHE_VERSION = 3
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_DIRNAME = "blendertorcp"
+_TUPLE_TAG = "__tuple__"
+
+# Node properties that only affect the editor, not the exported material.
+_NODE_UI_PROPERTIES = {
+    "rna_type", "location", "width", "width_hidden", "height", "dimensions",
+    "select", "show_options", "show_preview", "show_texture", "hide",
+    "use_custom_color", "color", "parent", "bl_width_default", "bl_width_min",
+    "bl_width_max", "bl_height_default", "bl_height_min", "bl_height_max",
+    "bl_icon", "bl_static_type", "bl_description",
+}
+
+# Nodes extraction reads even when they are not wired to the output.
+_SCANNED_NODE_TYPES = {"BSDF_PRINCIPLED", "EMISSION"}
+
+
+class _Uncacheable(Exception):
+    """Raised while hashing when a material's content cannot be fingerprinted."""
+
+
+class MaterialCache:
+    """On-disk, size-bounded LRU store of extracted material payloads."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES, salt: str = ""):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.salt = salt
+        self._stats: Dict[str, Any] = {
+            "hits": 0,
+            "misses": 0,
+            "uncacheable": 0,
+            "writes": 0,
+            "evictions": 0,
+            "path": str(self.root),
+        }
+
+    def key_for(self, material, variant: str = "") -> Optional[str]:
+        """Return the cache key for a Blender material, or None if uncacheable."""
+        digest = material_content_hash(material, extra=(self.salt, variant))
+        if digest is None:
+            self._stats["uncacheable"] += 1
+        return digest
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for `key`, or None on a miss or stale entry."""
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"), object_hook=_decode_tuples)
+        except Exception:
+            self._stats["misses"] += 1
+            return None
+
+        if (
+            not isinstance(entry, dict)
+            or entry.get("version") != MATERIAL_CACHE_VERSION
+            or entry.get("key") != key
+            or not isinstance(entry.get("material_data"), dict)
+            or not isinstance(entry.get("graph"), (dict, type(None)))
+            or not all(Path(texture).is_file() for texture in _texture_paths(entry["material_data"]))
+        ):
+            self._stats["misses"] += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._stats["hits"] += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        material_data: Dict[str, Any],
+        graph: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store the extracted material data and its built graph."""
+        entry = {
+            "version": MATERIAL_CACHE_VERSION,
+            "key": key,
+            "material_data": material_data,
+            "graph": graph,
+        }
+        path = self._entry_path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            # Payloads holding anything but plain JSON values are not cached.
+            payload = json.dumps(_encode_tuples(entry))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(payload, encoding="utf-8")
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+        self._stats["writes"] += 1
+
+    def prune(self) -> None:
+        """Evict least-recently-used entries until the cache fits its budget."""
+        try:
+            entries = []
+            for path in self.root.glob("*.json"):
+                stat = path.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for diagnostics."""
+        return dict(self._stats)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+
+def material_cache_dir() -> Path:
+    """Return the per-user material cache directory."""
+    if sys.platform == "win32":
+        cache_home = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        cache_home = str(Path.home() / "Library" / "Caches")
+    else:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / CACHE_DIRNAME / "materials"
+
+
+def material_content_hash(material, extra: Iterable[str] = ()) -> Optional[str]:
+    """Hash everything extraction reads from a material's node graph.
+
+    Returns None when the material references data that cannot be fingerprinted
+    (generated, viewer or modified-but-unsaved images).
+    """
+    hasher = hashlib.sha256()
+    hasher.update(repr((MATERIAL_CACHE_VERSION, tuple(extra))).encode("utf-8"))
+    try:
+        hasher.update(repr(_material_token(material)).encode("utf-8"))
+    except _Uncacheable:
+        return None
+    return hasher.hexdigest()
+
+
+def _encode_tuples(value: Any) -> Any:
+    """Convert a payload to JSON values, tagging tuples so they load back as tuples."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode_tuples(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_tuples(item) for item in value]
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {key: _encode_tuples(item) for key, item in value.items()}
+    raise TypeError(f"Uncacheable value of type {type(value).__name__}")
+
+
+def _decode_tuples(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and isinstance(value.get(_TUPLE_TAG), list):
+        return tuple(value[_TUPLE_TAG])
+    return value
+
+
+def _texture_paths(value: Any) -> List[str]:
+    """Collect absolute texture file paths referenced by a material payload."""
+    paths: List[str] = []
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, str) and os.path.isabs(item) and os.path.splitext(item)[1]:
+            paths.append(item)
+    return paths
+
+
+def _material_token(material) -> Tuple[Any, ...]:
+    ir = get_material_ir(material)
+    header = (
+        ir.name,
+        ir.use_nodes,
+        getattr(material, "blend_method", None),
+        _plain(getattr(material, "alpha_threshold", None)),
+        _plain(getattr(material, "diffuse_color", None)),
+    )
+    if not ir.has_node_tree:
+        return header
+
+    # Nodes reachable from the output, plus the unconnected ones extraction scans.
+    nodes = list(ir.used_nodes)
+    seen = set(nodes)
+    for node in ir.nodes:
+        if node not in seen and (node.type in _SCANNED_NODE_TYPES or node is ir.active_output):
+            nodes.append(node)
+            seen.add(node)
+
+    trees: Dict[int, Any] = {}
+    return header + tuple(_node_token(node, trees) for node in nodes)
+
+
+def _node_token(node, trees: Dict[int, Any]) -> Tuple[Any, ...]:
+    """Token for a `NodeIR` or raw bpy node: type, properties, sockets and links.
+
+    Top-level properties are read through `node`, so a `NodeIR` memoizes them
+    for extraction.
+    """
+    raw = getattr(node, "bpy_node", node)
+    return (
+        node.name,
+        getattr(node, "label", ""),
+        node.type,
+        getattr(raw, "bl_idname", None),
+        _rna_token(raw, trees, depth=4, skip=_NODE_UI_PROPERTIES, reader=node),
+        tuple(_socket_token(socket) for socket in node.inputs),
+        tuple(_socket_token(socket) for socket in node.outputs),
+    )
+
+
+def _socket_token(socket) -> Tuple[Any, ...]:
+    links = tuple(
+        (link.from_node.name, link.from_socket.identifier)
+        for link in (socket.links if not socket.is_output else ())
+    )
+    return (
+        socket.identifier,
+        socket.name,
+        _plain(getattr(socket, "default_value", None)),
+        links,
+    )
+
+
+def _rna_token(struct, trees: Dict[int, Any], depth: int, skip=frozenset(), reader=None) -> Tuple[Any, ...]:
+    """Token for the editable RNA properties of a bpy struct.
+
+    Property values are read from `reader` (e.g. the struct's `NodeIR`) when given.
+    """
+    bl_rna = getattr(struct, "bl_rna", None)
+    if bl_rna is None:
+        return ()
+    reader = struct if reader is None else reader
+    items = []
+    for prop in bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in skip or identifier in {"rna_type", "id_data"}:
+            continue
+        prop_type = prop.type
+        if prop_type == "COLLECTION":
+            if depth <= 0 or identifier in {"inputs", "outputs", "internal_links"}:
+                continue
+            try:
+                collection = getattr(reader, identifier)
+            except Exception:
+                continue
+            items.append((identifier, tuple(_value_token(item, trees, depth - 1) for item in collection)))
+            continue
+        if prop_type != "POINTER" and prop.is_readonly:
+            continue
+        try:
+            value = getattr(reader, identifier)
+        except Exception:
+            continue
+        if prop_type == "POINTER":
+            if value is None or depth <= 0:
+                items.append((identifier, None))
+                continue
+            items.append((identifier, _value_token(value, trees, depth - 1)))
+            continue
+        items.append((identifier, _plain(value)))
+    return tuple(items)
+
+
+def _value_token(value, trees: Dict[int, Any], depth: int) -> Any:
+    if hasattr(value, "name_full"):
+        return _id_token(value, trees)
+    if hasattr(value, "bl_rna"):
+        return _rna_token(value, trees, depth)
+    return _plain(value)
+
+
+def _id_token(id_block, trees: Dict[int, Any]) -> Tuple[Any, ...]:
+    """Token for a referenced datablock (image, node group, object, ...)."""
+    if hasattr(id_block, "packed_file") and hasattr(id_block, "colorspace_settings"):
+        return _image_token(id_block)
+    if hasattr(id_block, "nodes") and hasattr(id_block, "links"):
+        return _tree_token(id_block, trees)
+    return (type(id_block).__name__, id_block.name_full)
+
+
+def _tree_token(tree, trees: Dict[int, Any]) -> Tuple[Any, ...]:
+    """Token for a node group tree (all nodes and links, plus custom properties)."""
+    key = tree.as_pointer()
+    if key in trees:
+        return ("TREE", tree.name_full)
+    trees[key] = None
+    custom = tuple(sorted((name, repr(tree.get(name))) for name in tree.keys()))
+    nodes = tuple(_node_token(node, trees) for node in tree.nodes)
+    links = tuple(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in tree.links
+    )
+    token = ("TREE", tree.name_full, custom, nodes, links)
+    trees[key] = token
+    return token
+
+
+def _image_token(image) -> Tuple[Any, ...]:
+    """Token for an image: identity, color management and backing file state."""
+    source = getattr(image, "source", None)
+    if source in {"GENERATED", "VIEWER"} or getattr(image, "is_dirty", False):
+        raise _Uncacheable(image.name_full)
+
+    packed = getattr(image, "packed_file", None)
+    packed_token = None
+    if packed is not None:
+        data = getattr(packed, "data", None) or b""
+        packed_token = (getattr(packed, "size", len(data)), zlib.crc32(data))
+
+    filepath = getattr(image, "filepath", "") or getattr(image, "filepath_raw", "") or ""
+    file_token = None
+    if filepath:
+        try:
+            import bpy
+            filepath = bpy.path.abspath(filepath, library=getattr(image, "library", None))
+        except Exception:
+            pass
+        try:
+            stat = os.stat(filepath)
+            file_token = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_token = None
+
+    colorspace = getattr(getattr(image, "colorspace_settings", None), "name", None)
+    return (
+        "IMAGE",
+        image.name_full,
+        filepath,
+        source,
+        getattr(image, "file_format", None),
+        getattr(image, "alpha_mode", None),
+        colorspace,
+        packed_token,
+        file_token,
+    )
+
+
+def _plain(value: Any) -> Any:
+    """Convert bpy/mathutils values into hashable builtins."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (tuple, list)) or (hasattr(value, "__len__") and hasattr(value, "__getitem__")):
+        try:
+            return tuple(_plain(item) for item in value)
+        except TypeError:
+            pass
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(str(item) for item in value))
+    return repr(value)
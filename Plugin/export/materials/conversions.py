@@ -5,8 +5,8 @@ MaterialX/USD type conversions and conversion-node helpers.
 from typing import Any, Dict, Optional
 
 from ..usd_utils import Sdf, Gf, UsdShade, Vt
-from ...manifest.materialx_nodes import select_nodedef_name_for_node
-from .helpers import _convert_shader_name
+from ...manifest.materialx_nodes import get_conversion_chain
+from .helpers import ChildNameIndex, _convert_shader_name
 
 
 def get_usd_type(value: Any):
@@ -201,38 +201,45 @@ def _create_convert_output(
     from_type: str,
     to_type: str,
     diagnostics=None,
+    names: Optional[ChildNameIndex] = None,
 ):
-    """Create a convert node output between two MaterialX types."""
+    """Create convert node(s) between two MaterialX types.
+
+    Uses the manifest's precomputed conversion graph, so multi-hop conversions
+    (e.g. boolean -> float -> color3) only ever reference real nodedefs. When no
+    chain exists the source output is returned unconverted, with a warning.
+    """
     from_type = (from_type or '').lower()
     to_type = (to_type or '').lower()
     if from_type == to_type:
         return source_output
 
-    nodedef_name = select_nodedef_name_for_node(
-        manifest,
-        "convert",
-        input_type=from_type,
-        output_type=to_type,
-    )
-    if not nodedef_name:
-        nodedef_name = f"ND_convert_{from_type}_{to_type}"
+    chain = get_conversion_chain(manifest, from_type, to_type)
+    if not chain:
+        if diagnostics:
+            diagnostics.add_warning(
+                f"No MaterialX convert nodedef chain for {input_name}: {from_type} -> {to_type}. "
+                "Connecting it unconverted; output may be invalid."
+            )
+        return source_output
+
+    if names is None:
+        names = ChildNameIndex(stage, nodegraph_path)
+    output = source_output
+    for nodedef_name, step_from, step_to in chain:
+        convert_name = _convert_shader_name(names, input_name)
+        convert_prim = stage.DefinePrim(f"{nodegraph_path}/{convert_name}", "Shader")
+        convert_shader = UsdShade.Shader(convert_prim)
+        convert_shader.CreateIdAttr(nodedef_name)
+
+        in_type = _map_mtlx_type_to_sdf(step_from) or output.GetTypeName()
+        out_type = _map_mtlx_type_to_sdf(step_to) or output.GetTypeName()
+
+        in_input = convert_shader.CreateInput("in", in_type)
+        in_input.ConnectToSource(output)
         if diagnostics:
             diagnostics.add_warning(
-                f"Falling back to '{nodedef_name}' for conversion {from_type} -> {to_type}. "
-                "No matching nodedef was found; output may be invalid."
+                f"Inserted convert node '{nodedef_name}' for {input_name}: {step_from} -> {step_to}."
             )
-    convert_name = _convert_shader_name(stage, nodegraph_path, input_name)
-    convert_prim = stage.DefinePrim(f"{nodegraph_path}/{convert_name}", "Shader")
-    convert_shader = UsdShade.Shader(convert_prim)
-    convert_shader.CreateIdAttr(nodedef_name)
-
-    in_type = _map_mtlx_type_to_sdf(from_type) or source_output.GetTypeName()
-    out_type = _map_mtlx_type_to_sdf(to_type) or source_output.GetTypeName()
-
-    in_input = convert_shader.CreateInput("in", in_type)
-    in_input.ConnectToSource(source_output)
-    if diagnostics:
-        diagnostics.add_warning(
-            f"Inserted convert node '{nodedef_name}' for {input_name}: {from_type} -> {to_type}."
-        )
-    return convert_shader.CreateOutput("out", out_type)
+        output = convert_shader.CreateOutput("out", out_type)
+    return output
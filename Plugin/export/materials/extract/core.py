@@ -9,11 +9,12 @@ import os
 import re
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from types import GeneratorType
+from typing import Any, Dict, Generator, List, Mapping, NamedTuple, Optional, Set, Tuple
 
+from ....core.material_ir import SocketCollectionIR, get_material_ir, group_used_nodes, scope_memo
 from ....manifest.materialx_nodes import load_manifest, select_nodedef_name_for_node
 
-_MANIFEST_CACHE: Optional[Dict[str, Any]] = None
 _STAGED_IMAGE_CACHE: Dict[int, str] = {}
 _STAGED_IMAGE_DIR: Optional[Path] = None
 
@@ -60,19 +61,21 @@ def extract_blender_material_data(material) -> Dict[str, Any]:
         data['alpha'] = material.diffuse_color[3] if len(material.diffuse_color) > 3 else 1.0
         return data
 
-    surface_node = _get_surface_shader_node(material)
+    ir = get_material_ir(material)
+    surface_node = ir.surface_node
     if surface_node and surface_node.type == 'GROUP':
         node_tree = getattr(surface_node, "node_tree", None)
         node_id = node_tree.get("rk_node_id") if node_tree else None
         node_name = (node_tree.name or "").lstrip(".") if node_tree else ""
         if node_id or (node_tree and node_name.startswith("RK_")):
             return _extract_rk_group_material_data(surface_node, data)
+        surface_node = _group_surface_node(surface_node) or surface_node
 
     if surface_node and surface_node.type == 'BSDF_PRINCIPLED':
         principled = surface_node
     else:
         principled = None
-        for node in material.node_tree.nodes:
+        for node in ir.nodes:
             if node.type == 'BSDF_PRINCIPLED':
                 principled = node
                 break
@@ -245,7 +248,7 @@ def extract_blender_material_data(material) -> Dict[str, Any]:
         if surface_node and surface_node.type == 'EMISSION':
             emission_node = surface_node
         else:
-            emission_nodes = [n for n in material.node_tree.nodes if n.type == 'EMISSION']
+            emission_nodes = ir.nodes_of_type('EMISSION')
             if emission_nodes:
                 emission_node = emission_nodes[0]
 
@@ -255,18 +258,18 @@ def extract_blender_material_data(material) -> Dict[str, Any]:
             strength_socket = emission_node.inputs.get('Strength')
             if color_socket:
                 if color_socket.is_linked:
-                    texture_path = _extract_image_path_from_socket(color_socket)
+                    texture_path = _linked_image_path(color_socket, 'color3')
                     if texture_path:
                         data['base_color_texture'] = texture_path
                     else:
-                        constant = _extract_constant_from_socket(color_socket)
+                        constant = _linked_constant(color_socket, 'color3')
                         if constant is not None:
                             data['base_color'] = _coerce_constant_value(constant, 'color')
                 else:
                     data['base_color'] = list(color_socket.default_value)[:3]
             if strength_socket:
                 if strength_socket.is_linked:
-                    constant = _extract_constant_from_socket(strength_socket)
+                    constant = _linked_constant(strength_socket, 'float')
                     if constant is not None:
                         data['emission_strength'] = _coerce_constant_value(constant, 'float')
                     else:
@@ -280,10 +283,16 @@ def extract_blender_material_data(material) -> Dict[str, Any]:
 def collect_material_warnings(material) -> List[str]:
     """Collect warnings for Blender nodes unsupported by RealityKit export."""
     warnings: List[str] = []
-    if not material or not material.use_nodes or not material.node_tree:
+    if not material:
         return warnings
 
-    used_nodes, volume_linked, displacement_linked = _collect_used_nodes(material)
+    ir = get_material_ir(material)
+    if not ir.has_node_tree:
+        return warnings
+
+    used_nodes = ir.used_nodes
+    volume_linked = ir.volume_linked
+    displacement_linked = ir.displacement_linked
     if volume_linked:
         warnings.append(
             f"Material '{material.name}': Volume output is not supported in RCP; bake or remove."
@@ -391,116 +400,72 @@ def collect_material_warnings(material) -> List[str]:
         'ATTRIBUTE',
     }
 
-    for node in used_nodes:
+    # Ordinary node groups are checked through their interior nodes. Each tree is
+    # walked once; its warnings are repeated for every group node that uses it.
+    tree_warnings: Dict[Any, List[str]] = {}
+
+    def group_warnings(node_tree) -> List[str]:
+        key = node_tree.as_pointer()
+        if key not in tree_warnings:
+            tree_warnings[key] = []
+            tree_warnings[key] = [
+                message for group_node in group_used_nodes(node_tree) for message in node_warnings(group_node)
+            ]
+        return tree_warnings[key]
+
+    def node_warnings(node) -> List[str]:
         node_type = getattr(node, "type", "")
         node_name = getattr(node, "name", node_type)
 
+        if node_type in {'GROUP_INPUT', 'GROUP_OUTPUT'}:
+            return []
+
         if node_type == 'GROUP':
             node_tree = getattr(node, "node_tree", None)
             node_id = node_tree.get("rk_node_id") if node_tree else None
-            node_name = (node_tree.name or "").lstrip(".") if node_tree else ""
-            if node_id or (node_tree and node_name.startswith("RK_")):
-                continue
-            warnings.append(
-                f"Material '{material.name}': Node group '{node_name}' is not RCP-aware; bake or replace."
-            )
-            continue
+            tree_name = (node_tree.name or "").lstrip(".") if node_tree else ""
+            if node_id or (node_tree and tree_name.startswith("RK_")):
+                return []
+            if node_tree is None:
+                return [f"Node group '{node_name}' has no node tree."]
+            return [f"Node group '{node_name}': {message}" for message in group_warnings(node_tree)]
 
         if node_type in supported_types:
             if node_type == 'TEX_IMAGE' and getattr(node, "image", None) is None:
-                warnings.append(
-                    f"Material '{material.name}': Image Texture node '{node_name}' has no image."
-                )
-            continue
+                return [f"Image Texture node '{node_name}' has no image."]
+            return []
 
         if node_type in {'MIX_RGB', 'MIX'}:
             if _is_identity_mix(node):
-                continue
-            warnings.append(
-                f"Material '{material.name}': Node '{node_name}' ({node_type}) requires baking unless "
+                return []
+            return [
+                f"Node '{node_name}' ({node_type}) requires baking unless "
                 "Factor is 0/1 with a passthrough input."
-            )
-            continue
+            ]
 
         if node_type == 'MATH':
             if _is_identity_math_node(node):
-                continue
-            warnings.append(
-                f"Material '{material.name}': Node '{node_name}' ({node_type}) requires baking unless "
+                return []
+            return [
+                f"Node '{node_name}' ({node_type}) requires baking unless "
                 "it is a pass-through (add 0, subtract 0, multiply 1, divide 1)."
-            )
-            continue
+            ]
 
         if node_type in partial_types:
-            warnings.append(
-                f"Material '{material.name}': Node '{node_name}' ({node_type}) has limited support; "
-                "UV transforms may be ignored."
-            )
-            continue
+            return [f"Node '{node_name}' ({node_type}) has limited support; UV transforms may be ignored."]
 
         if node_type in bake_types:
-            warnings.append(
-                f"Material '{material.name}': Node '{node_name}' ({node_type}) requires baking for RCP."
-            )
-            continue
+            return [f"Node '{node_name}' ({node_type}) requires baking for RCP."]
 
         if node_type in unsupported_types:
-            warnings.append(
-                f"Material '{material.name}': Node '{node_name}' ({node_type}) is not supported by RCP."
-            )
-            continue
-
-        warnings.append(
-            f"Material '{material.name}': Node '{node_name}' ({node_type}) is unrecognized; export may differ."
-        )
-
-    return _dedupe_warnings(warnings)
-
+            return [f"Node '{node_name}' ({node_type}) is not supported by RCP."]
 
-def _collect_used_nodes(material):
-    """Collect nodes contributing to the active material output."""
-    node_tree = material.node_tree
-    used_nodes = set()
-    volume_linked = False
-    displacement_linked = False
+        return [f"Node '{node_name}' ({node_type}) is unrecognized; export may differ."]
 
-    output_nodes = [n for n in node_tree.nodes if n.type == 'OUTPUT_MATERIAL']
-    if not output_nodes:
-        return used_nodes, volume_linked, displacement_linked
-
-    active_output = None
-    for node in output_nodes:
-        if getattr(node, "is_active_output", False):
-            active_output = node
-            break
-    if not active_output:
-        active_output = output_nodes[0]
-
-    def visit(node):
-        if node in used_nodes:
-            return
-        used_nodes.add(node)
-        for input_socket in getattr(node, "inputs", []):
-            if not input_socket.is_linked:
-                continue
-            for link in input_socket.links:
-                from_node = link.from_node
-                if from_node:
-                    visit(from_node)
-
-    for socket_name in ("Surface", "Volume", "Displacement"):
-        socket = active_output.inputs.get(socket_name)
-        if not socket or not socket.is_linked:
-            continue
-        if socket_name == "Volume":
-            volume_linked = True
-        if socket_name == "Displacement":
-            displacement_linked = True
-        for link in socket.links:
-            if link.from_node:
-                visit(link.from_node)
+    for node in used_nodes:
+        warnings.extend(f"Material '{material.name}': {message}" for message in node_warnings(node))
 
-    return used_nodes, volume_linked, displacement_linked
+    return _dedupe_warnings(warnings)
 
 
 def _dedupe_warnings(warnings: List[str]) -> List[str]:
@@ -560,16 +525,12 @@ def _infer_rk_node_id(group_name: str) -> str:
     return group_name
 
 
-def _get_manifest() -> Dict[str, Any]:
-    """Load and cache the MaterialX manifest."""
-    global _MANIFEST_CACHE
-    if _MANIFEST_CACHE is None:
-        try:
-            from ....manifest.materialx_nodes import load_manifest
-            _MANIFEST_CACHE = load_manifest()
-        except Exception:
-            _MANIFEST_CACHE = {}
-    return _MANIFEST_CACHE or {}
+def _get_manifest() -> Mapping[str, Any]:
+    """Return the shared MaterialX manifest (empty if unavailable)."""
+    try:
+        return load_manifest()
+    except Exception:
+        return {}
 
 
 def _input_mtlx_type(node_id: Optional[str], input_name: str) -> Optional[str]:
@@ -675,10 +636,15 @@ def _build_rk_node_graph(surface_node) -> Optional[Dict[str, Any]]:
                     )
                     continue
 
+                mtlx_type = _input_mtlx_type(node_id, input_name)
+                output_type = _mtlx_type_to_output_type(mtlx_type) or _socket_output_type(socket)
+                grouped = _group_link_input(socket, 'texture', output_type)
+                if grouped is not None:
+                    inputs[input_name] = grouped
+                    continue
+
                 texture_path = _extract_image_path_from_socket(socket)
                 if texture_path:
-                    mtlx_type = _input_mtlx_type(node_id, input_name)
-                    output_type = _mtlx_type_to_output_type(mtlx_type) or _socket_output_type(socket)
                     texture_spec = {
                         'type': 'texture',
                         'path': texture_path,
@@ -735,10 +701,14 @@ def _extract_group_inputs(group_node) -> Dict[str, Any]:
     for socket in group_node.inputs:
         input_name = socket.name
         if socket.is_linked:
+            tex_type = 'normal_texture' if _is_normal_socket(socket) else 'texture'
+            grouped = _group_link_input(socket, tex_type, _socket_output_type(socket))
+            if grouped is not None:
+                inputs[input_name] = grouped
+                continue
             texture_path = _extract_image_path_from_socket(socket)
             if texture_path:
                 output_type = _socket_output_type(socket)
-                tex_type = 'normal_texture' if _is_normal_socket(socket) else 'texture'
                 texture_spec = {
                     'type': tex_type,
                     'path': texture_path,
@@ -769,6 +739,66 @@ def _extract_group_inputs(group_node) -> Dict[str, Any]:
     return inputs
 
 
+def _resolve_group_link(socket, expected_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Resolve a socket fed (through reroutes) by an ordinary node group.
+
+    The RealityKit-group and Emission paths read other links with the direct
+    texture/constant helpers, which do not look inside groups. Returns None when
+    the socket is not fed by an ordinary group.
+    """
+    if not socket or not socket.is_linked:
+        return None
+    from_node = socket.links[0].from_node
+    while from_node is not None and from_node.type == 'REROUTE':
+        reroute_input = from_node.inputs[0] if len(from_node.inputs) else None
+        if reroute_input is None or not reroute_input.is_linked:
+            return None
+        from_node = reroute_input.links[0].from_node
+    if from_node is None or from_node.type != 'GROUP' or _is_rk_group_node(from_node):
+        return None
+    return _resolve_socket_value(socket, expected_type=expected_type)
+
+
+def _linked_image_path(socket, expected_type: Optional[str] = None) -> Optional[str]:
+    """Image path behind a linked socket, looking inside ordinary node groups."""
+    resolved = _resolve_group_link(socket, expected_type)
+    if resolved is not None:
+        return resolved["path"] if resolved.get("kind") == "texture" else None
+    return _extract_image_path_from_socket(socket)
+
+
+def _linked_constant(socket, expected_type: Optional[str] = None):
+    """Constant behind a linked socket, looking inside ordinary node groups."""
+    resolved = _resolve_group_link(socket, expected_type)
+    if resolved is not None:
+        return resolved["value"] if resolved.get("kind") == "constant" else None
+    return _extract_constant_from_socket(socket)
+
+
+def _group_link_input(socket, tex_type: str, output_type: str):
+    """Return a RealityKit input value (texture spec or constant) for a group-fed socket."""
+    resolved = _resolve_group_link(socket, output_type)
+    if not resolved:
+        return None
+    if resolved.get("kind") == "constant":
+        return resolved["value"]
+    if resolved.get("kind") != "texture":
+        return None
+    texture_spec = {
+        'type': tex_type,
+        'path': resolved["path"],
+        'output_type': output_type,
+    }
+    if resolved.get("channel"):
+        texture_spec['channel'] = resolved["channel"]
+    if resolved.get("uv_map"):
+        texture_spec['texcoord'] = _normalize_uv_map_name(resolved["uv_map"])
+    for key in ('mapping', 'colorspace', 'alpha_mode'):
+        if resolved.get(key):
+            texture_spec[key] = resolved[key]
+    return texture_spec
+
+
 def _socket_output_type(socket) -> str:
     """Infer MaterialX output type for a Blender socket."""
     socket_type = getattr(socket, "type", "") or ""
@@ -922,28 +952,6 @@ def _extract_uv_map_from_socket(socket) -> Optional[str]:
     return None
 
 
-def _get_surface_shader_node(material):
-    """Return the shader node connected to the active Material Output surface."""
-    node_tree = material.node_tree
-    output_nodes = [n for n in node_tree.nodes if n.type == 'OUTPUT_MATERIAL']
-    if not output_nodes:
-        return None
-
-    active_output = None
-    for node in output_nodes:
-        if getattr(node, "is_active_output", False):
-            active_output = node
-            break
-    if not active_output:
-        active_output = output_nodes[0]
-
-    surface_socket = active_output.inputs.get('Surface')
-    if not surface_socket or not surface_socket.is_linked:
-        return None
-    link = surface_socket.links[0]
-    return link.from_node if link else None
-
-
 def _extract_image_from_node(node):
     """Resolve an image from known Blender node types."""
     image_node = _extract_image_node(node)
@@ -980,318 +988,556 @@ def _extract_image_node(node):
     return None
 
 
+class _GroupSocket:
+    """Input socket of a node inside an ordinary node group, seen through one instance.
+
+    Sockets fed directly by the Group Input node are bound to the matching input
+    of the group instance; other sockets keep their interior links.
+    """
+
+    def __init__(self, socket, instance):
+        self.socket = socket
+        self.instance = instance
+        self.name = socket.name
+        self.identifier = getattr(socket, "identifier", socket.name)
+        self.bound = None
+        if socket.is_linked:
+            link = socket.links[0]
+            from_node = getattr(link, "from_node", None)
+            if getattr(from_node, "type", "") == 'GROUP_INPUT':
+                placeholder = _group_input_placeholder(from_node, link.from_socket, None, None)
+                self.bound = _group_instance_input(instance, placeholder)
+
+    @property
+    def _effective(self):
+        return self.bound if self.bound is not None else self.socket
+
+    @property
+    def is_linked(self) -> bool:
+        return bool(self._effective.is_linked)
+
+    @property
+    def links(self):
+        return self._effective.links
+
+    @property
+    def default_value(self):
+        return self._effective.default_value
+
+
+class _GroupBoundNode:
+    """Node inside an ordinary node group whose inputs are bound to one instance."""
+
+    def __init__(self, node, instance):
+        self._node = node
+        self.name = node.name
+        self.type = node.type
+        self.inputs = SocketCollectionIR([_GroupSocket(socket, instance) for socket in node.inputs])
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self._node, attr)
+
+
+def _group_output_socket(group_node, socket):
+    """Return the Group Output input feeding `socket` of a group node."""
+    node_tree = getattr(group_node, "node_tree", None)
+    if not node_tree:
+        return None
+    outputs = [node for node in node_tree.nodes if node.type == 'GROUP_OUTPUT']
+    group_output = next((node for node in outputs if getattr(node, "is_active_output", False)), None)
+    if group_output is None and outputs:
+        group_output = outputs[0]
+    if group_output is None:
+        return None
+
+    input_socket = group_output.inputs.get(socket.name) if hasattr(group_output.inputs, "get") else None
+    if input_socket is None:
+        try:
+            index = list(group_node.outputs).index(socket)
+        except ValueError:
+            index = None
+        if index is not None and index < len(group_output.inputs):
+            input_socket = group_output.inputs[index]
+    return input_socket
+
+
+def _group_surface_node(group_node):
+    """Return the shader node driving an ordinary group's shader output, bound to the instance."""
+    node = group_node
+    for _ in range(32):
+        if node.type != 'GROUP' or _is_rk_group_node(node):
+            return node if node is not group_node else None
+        outputs = list(node.outputs)
+        socket = next((output for output in outputs if getattr(output, "type", "") == 'SHADER'), None)
+        if socket is None and outputs:
+            socket = outputs[0]
+        input_socket = _group_output_socket(node, socket) if socket is not None else None
+        if input_socket is None or not input_socket.is_linked:
+            return None
+        from_node = input_socket.links[0].from_node
+        while from_node is not None and from_node.type == 'REROUTE':
+            reroute_input = from_node.inputs[0] if len(from_node.inputs) else None
+            if reroute_input is None or not reroute_input.is_linked:
+                return None
+            from_node = reroute_input.links[0].from_node
+        if from_node is None:
+            return None
+        node = _GroupBoundNode(from_node, node)
+    return None
+
+
+def _group_input_placeholder(group_input, socket, channel, expected_type) -> Dict[str, Any]:
+    """Template placeholder for a Group Input socket (filled per group instance)."""
+    try:
+        index = list(group_input.outputs).index(socket)
+    except ValueError:
+        index = None
+    return {
+        "kind": "group_input",
+        "socket": getattr(socket, "identifier", None),
+        "index": index,
+        "name": getattr(socket, "name", None),
+        "resolve_channel": channel,
+        "resolve_type": expected_type,
+        "post": (),
+    }
+
+
+def _placeholder_key(placeholder: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        placeholder["socket"],
+        placeholder["index"],
+        placeholder["name"],
+        placeholder["resolve_channel"],
+        placeholder["resolve_type"],
+    )
+
+
+def _group_instance_input(instance, placeholder: Dict[str, Any]):
+    """Return the input of a group instance matching a Group Input placeholder."""
+    inputs = list(getattr(instance, "inputs", ()))
+    identifier = placeholder.get("socket")
+    if identifier is not None:
+        for socket in inputs:
+            if getattr(socket, "identifier", None) == identifier:
+                return socket
+    index = placeholder.get("index")
+    if index is not None and index < len(inputs):
+        return inputs[index]
+    name = placeholder.get("name")
+    return next((socket for socket in inputs if socket.name == name), None)
+
+
+def _template_placeholders(template: Any) -> List[Dict[str, Any]]:
+    """Collect `group_input` placeholders of a template in depth-first order."""
+    placeholders: List[Dict[str, Any]] = []
+    seen: Set[int] = set()
+    stack = [template]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, (dict, list)) or id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, dict):
+            if item.get("kind") == "group_input":
+                placeholders.append(item)
+                continue
+            stack.extend(reversed(list(item.values())))
+        else:
+            stack.extend(reversed(item))
+    return placeholders
+
+
+def _fill_template(template: Any, bindings: Dict[Tuple[Any, ...], Any], prefix) -> Any:
+    """Substitute placeholder bindings into a group template.
+
+    Unchanged sub-specs are shared with the template. Unresolved specs get the
+    instance's provenance (`prefix()`) prepended to the chain inside the group.
+    """
+    filled: Dict[int, Any] = {}
+    stack: List[Tuple[Any, bool]] = [(template, False)]
+    while stack:
+        item, expanded = stack.pop()
+        if id(item) in filled or not isinstance(item, (dict, list)):
+            continue
+        kind = item.get("kind") if isinstance(item, dict) else None
+        if kind == "group_input":
+            value = bindings.get(_placeholder_key(item))
+            if value is None:
+                value = {"kind": "unresolved", "provenance": list(prefix())}
+            for op in item["post"]:
+                if op[0] == "channel":
+                    value = _with_channel(value, op[1])
+                elif op[0] == "normal_map":
+                    value = _with_normal_map(value, op[1], op[2])
+            filled[id(item)] = value
+            continue
+        if kind == "unresolved":
+            filled[id(item)] = dict(item, provenance=list(prefix()) + list(item.get("provenance") or []))
+            continue
+
+        children = list(item.values()) if isinstance(item, dict) else item
+        if not expanded:
+            stack.append((item, True))
+            stack.extend((child, False) for child in children if isinstance(child, (dict, list)))
+            continue
+
+        new_children = [filled.get(id(child), child) for child in children]
+        if all(new is old for new, old in zip(new_children, children)):
+            filled[id(item)] = item
+        elif isinstance(item, dict):
+            filled[id(item)] = dict(zip(item.keys(), new_children))
+        else:
+            filled[id(item)] = new_children
+    return filled.get(id(template), template)
+
+
+def _with_channel(spec: Optional[Dict[str, Any]], channel: Optional[str]):
+    """Tag a resolved spec with the channel a Separate node picks from it."""
+    if not spec or not channel:
+        return spec
+    if spec.get("kind") == "group_input":
+        return dict(spec, post=spec["post"] + (("channel", channel),))
+    if "channel" not in spec:
+        return dict(spec, channel=channel)
+    return spec
+
+
+def _with_normal_map(spec: Optional[Dict[str, Any]], scale: Optional[float], space: Optional[str]):
+    """Apply Normal Map node parameters to a resolved texture spec."""
+    if not spec:
+        return spec
+    kind = spec.get("kind")
+    if kind == "group_input":
+        return dict(spec, post=spec["post"] + (("normal_map", scale, space),))
+    if kind != "texture":
+        return spec
+    spec = dict(spec)
+    if scale is not None:
+        spec["scale"] = scale
+    if space:
+        spec["space"] = space
+    return spec
+
+
+class _Resolve(NamedTuple):
+    """Request to resolve a linked socket (yielded by, or tail-returned from, a handler)."""
+
+    socket: Any
+    channel: Optional[str] = None
+    expected_type: Optional[str] = None
+
+
 def _resolve_socket_value(
     socket,
-    visited=None,
-    channel=None,
-    provenance=None,
+    channel: Optional[str] = None,
     cache: Optional[Dict[Any, Dict[str, Any]]] = None,
     expected_type: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Resolve a linked socket to a texture or constant spec."""
-    if not socket or not socket.is_linked:
-        return None
+    """Resolve a linked socket to a texture, constant, or node expression spec.
+
+    Returned specs (and the entries stored in `cache`) are shared between
+    callers and must be treated as read-only.
+    """
+    return _SocketResolver(cache).resolve(_Resolve(socket, channel, expected_type))
+
+
+class _SocketResolver:
+    """Explicit work-stack resolver for Blender socket chains.
+
+    Node handlers that need upstream values are generators: they yield a
+    `_Resolve` request per input and receive the resolved spec back, so chain
+    depth never touches the Python recursion limit. Handlers that simply forward
+    to one upstream socket return the `_Resolve` instead (a tail call, no stack
+    frame). Inputs resolve depth-first in order and share one `visited` set, so
+    each node is expanded at most once per top-level resolve.
+
+    Visited nodes are logged as `(node, socket)` pairs; readable provenance
+    labels are only built when an unresolved result needs them.
+
+    Ordinary node groups are translated once per (node tree, output socket,
+    channel, expected type) into a template in which Group Input references are
+    `group_input` placeholders. Each instance fills the placeholders with its own
+    input bindings. Templates are shared across materials via `scope_memo()`.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Dict[Any, Dict[str, Any]]] = None,
+        template_mode: bool = False,
+    ):
+        self.cache = cache
+        self.template_mode = template_mode
+        self.templates = scope_memo("group_templates")
+        self.visited: Set[Any] = set()
+        self.visits: List[Tuple[Any, Any]] = []
+        self._labels: List[str] = []
+
+    def resolve(self, request: _Resolve) -> Optional[Dict[str, Any]]:
+        stack: List[Generator] = []
+        outcome: Any = self._start(request)
+        while True:
+            if isinstance(outcome, _Resolve):
+                outcome = self._start(outcome)
+                continue
+            if isinstance(outcome, GeneratorType):
+                stack.append(outcome)
+                sent = None
+            elif stack:
+                sent = outcome
+            else:
+                return outcome
+            try:
+                outcome = stack[-1].send(sent)
+            except StopIteration as stop:
+                stack.pop()
+                outcome = stop.value
+
+    def provenance(self, count: Optional[int] = None) -> List[str]:
+        """Return labels for the first `count` visited nodes (default: all), in visit order."""
+        labels = self._labels
+        for node, socket in self.visits[len(labels):count]:
+            labels.append(_node_label(node, socket))
+        return labels[:count]
+
+    def unresolved(self) -> Dict[str, Any]:
+        return {"kind": "unresolved", "provenance": self.provenance()}
+
+    def _start(self, request: _Resolve):
+        socket = request.socket
+        while isinstance(socket, _GroupSocket):
+            bound = socket.bound
+            if bound is None:
+                if not socket.is_linked:
+                    return None
+                return self._instantiate_group(socket, request.channel, request.expected_type)
+            if not bound.is_linked:
+                value = _socket_default_value(bound)
+                return _constant_expr(value) if value is not None else None
+            socket = bound
 
-    if visited is None:
-        visited = set()
-    if provenance is None:
-        provenance = []
+        if not socket or not socket.is_linked:
+            return None
 
-    cache_key = None
-    if cache is not None and hasattr(socket, "as_pointer"):
-        try:
-            cache_key = (socket.as_pointer(), channel, expected_type)
-        except Exception:
-            cache_key = None
-    if cache is not None and cache_key is not None and cache_key in cache:
-        return dict(cache[cache_key])
+        cache = self.cache
+        cache_key = None
+        if cache is not None and hasattr(socket, "as_pointer"):
+            try:
+                cache_key = (socket.as_pointer(), request.channel, request.expected_type)
+            except Exception:
+                cache_key = None
+            if cache_key is not None and cache_key in cache:
+                return cache[cache_key]
+
+        link = socket.links[0]
+        from_node = getattr(link, "from_node", None)
+        from_socket = getattr(link, "from_socket", None)
+        if not from_node:
+            return None
 
-    link = socket.links[0]
-    from_node = getattr(link, "from_node", None)
-    from_socket = getattr(link, "from_socket", None)
-    if not from_node:
-        return None
+        if self.template_mode and getattr(from_node, "type", "") == 'GROUP_INPUT':
+            return _group_input_placeholder(from_node, from_socket, request.channel, request.expected_type)
 
-    if from_node in visited:
-        return None
-    visited.add(from_node)
-
-    provenance.append(_node_label(from_node, from_socket))
-    node_type = getattr(from_node, "type", "")
-
-    if node_type == 'REROUTE':
-        input_socket = from_node.inputs[0] if from_node.inputs else None
-        return _resolve_socket_value(
-            input_socket,
-            visited,
-            channel,
-            provenance,
-            cache,
-            expected_type=expected_type,
-        )
+        if from_node in self.visited:
+            return None
+        self.visited.add(from_node)
+        self.visits.append((from_node, from_socket))
+
+        handler = _NODE_HANDLERS.get(getattr(from_node, "type", ""))
+        if handler is None:
+            return self.unsupported(cache_key)
+        return handler(self, from_node, from_socket, request.channel, request.expected_type, cache_key)
+
+    def unsupported(self, cache_key) -> Dict[str, Any]:
+        """Unsupported node type: unresolved with the provenance chain (cached)."""
+        result = self.unresolved()
+        self._store(cache_key, result)
+        return result
 
-    if node_type in {'SEPARATE_COLOR', 'SEPARATE_RGB'}:
-        ch = channel or _channel_from_socket_name(from_socket.name if from_socket else "")
-        input_socket = from_node.inputs.get('Color') if hasattr(from_node, "inputs") else None
-        if input_socket is None and hasattr(from_node, "inputs") and from_node.inputs:
-            input_socket = from_node.inputs[0]
-        resolved = _resolve_socket_value(
-            input_socket,
-            visited,
-            ch,
-            provenance,
-            cache,
-            expected_type='float',
-        )
-        if resolved and ch:
-            resolved.setdefault("channel", ch)
-        return resolved
-
-    if node_type in {'SEPARATE_XYZ', 'SEPXYZ'}:
-        ch = channel or _channel_from_socket_name(from_socket.name if from_socket else "")
-        input_socket = from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None
-        if input_socket is None and hasattr(from_node, "inputs") and from_node.inputs:
-            input_socket = from_node.inputs[0]
-        resolved = _resolve_socket_value(
-            input_socket,
-            visited,
-            ch,
-            provenance,
-            cache,
-            expected_type='float',
-        )
-        if resolved and ch:
-            resolved.setdefault("channel", ch)
-        return resolved
-
-    if node_type == 'NORMAL_MAP':
-        color_socket = from_node.inputs.get('Color')
-        resolved = _resolve_socket_value(
-            color_socket,
-            visited,
-            channel,
-            provenance,
-            cache,
-            expected_type=expected_type,
-        )
-        if resolved and resolved.get("kind") == "texture":
-            # Preserve Normal Map node parameters (best-effort; linked strength is not handled).
-            strength_socket = from_node.inputs.get('Strength') if hasattr(from_node, "inputs") else None
-            if strength_socket and not getattr(strength_socket, "is_linked", False):
-                try:
-                    resolved["scale"] = float(strength_socket.default_value)
-                except Exception:
-                    pass
-
-            space = getattr(from_node, "space", None)
-            if space:
-                space = str(space).upper()
-                if "TANGENT" in space:
-                    resolved["space"] = "tangent"
-                elif "OBJECT" in space:
-                    resolved["space"] = "object"
-        return resolved
-
-    if node_type == 'BUMP':
-        height_socket = from_node.inputs.get('Height')
-        return _resolve_socket_value(
-            height_socket,
-            visited,
-            channel,
-            provenance,
-            cache,
-            expected_type=expected_type,
-        )
+    def _store(self, cache_key, result: Dict[str, Any]) -> None:
+        if self.cache is not None and cache_key is not None:
+            self.cache[cache_key] = result
 
-    if node_type == 'MAPPING':
-        vector_socket = from_node.inputs.get('Vector')
-        return _resolve_socket_value(
-            vector_socket,
-            visited,
-            channel,
-            provenance,
-            cache,
-            expected_type=expected_type,
-        )
+    def _instantiate_group(self, socket: "_GroupSocket", channel, expected_type):
+        """Fill a group's memoized template with one instance's input bindings."""
+        template = self._group_template(socket, channel, expected_type)
+        prefix_count = len(self.visits)
 
-    if node_type == 'GROUP':
-        group_tree = getattr(from_node, "node_tree", None)
-        if not group_tree:
-            return {"kind": "unresolved", "provenance": list(provenance)}
+        bindings: Dict[Tuple[Any, ...], Any] = {}
+        for placeholder in _template_placeholders(template):
+            key = _placeholder_key(placeholder)
+            if key in bindings:
+                continue
+            input_socket = _group_instance_input(socket.instance, placeholder)
+            if input_socket is None:
+                bindings[key] = None
+            elif input_socket.is_linked:
+                bindings[key] = yield _Resolve(
+                    input_socket,
+                    placeholder["resolve_channel"],
+                    placeholder["resolve_type"],
+                )
+            else:
+                value = _socket_default_value(input_socket)
+                bindings[key] = _constant_expr(value) if value is not None else None
 
-        outputs = [n for n in group_tree.nodes if n.type == 'GROUP_OUTPUT']
-        if not outputs:
-            return {"kind": "unresolved", "provenance": list(provenance)}
-        output_node = next((n for n in outputs if getattr(n, "is_active_output", False)), outputs[0])
+        return _fill_template(template, bindings, lambda: self.provenance(prefix_count))
 
-        input_socket = None
-        if from_socket and hasattr(output_node, "inputs"):
-            input_socket = output_node.inputs.get(from_socket.name)
-        if input_socket is None and from_socket and hasattr(from_node, "outputs"):
+    def _group_template(self, socket: "_GroupSocket", channel, expected_type):
+        node_tree = getattr(socket.instance, "node_tree", None)
+        try:
+            key = (node_tree.as_pointer(), socket.socket.as_pointer(), channel, expected_type)
+        except Exception:
+            key = None
+        if key is not None and key in self.templates:
+            return self.templates[key]
+
+        builder = _SocketResolver(cache={}, template_mode=True)
+        builder.templates = self.templates
+        template = builder.resolve(_Resolve(socket.socket, channel, expected_type))
+        if key is not None:
+            self.templates[key] = template
+        return template
+
+    def expr(self, socket, channel, default: Optional[Any] = None):
+        """Resolve an input to an expression: upstream spec if linked, else a constant."""
+        if socket is None:
+            if default is None:
+                return None
+            return _constant_expr(default)
+        if socket.is_linked:
+            return (yield _Resolve(socket, channel))
+        value = _socket_default_value(socket)
+        if value is None:
+            value = default
+        if value is None:
+            return None
+        return _constant_expr(value)
+
+    def input_expr(self, node, name: str, channel, default: Optional[Any] = None):
+        socket = node.inputs.get(name) if hasattr(node, "inputs") else None
+        return self.expr(socket, channel, default)
+
+    # Node handlers: (node, from_socket, channel, expected_type, cache_key) -> spec,
+    # `_Resolve` tail call, or generator.
+
+    def _reroute(self, node, socket, channel, expected_type, cache_key):
+        input_socket = node.inputs[0] if node.inputs else None
+        return _Resolve(input_socket, channel, expected_type)
+
+    def _separate(self, node, socket, channel, input_name: str):
+        ch = channel or _channel_from_socket_name(socket.name if socket else "")
+        input_socket = node.inputs.get(input_name) if hasattr(node, "inputs") else None
+        if input_socket is None and hasattr(node, "inputs") and node.inputs:
+            input_socket = node.inputs[0]
+        resolved = yield _Resolve(input_socket, ch, 'float')
+        return _with_channel(resolved, ch)
+
+    def _separate_color(self, node, socket, channel, expected_type, cache_key):
+        return self._separate(node, socket, channel, 'Color')
+
+    def _separate_xyz(self, node, socket, channel, expected_type, cache_key):
+        return self._separate(node, socket, channel, 'Vector')
+
+    def _normal_map(self, node, socket, channel, expected_type, cache_key):
+        resolved = yield _Resolve(node.inputs.get('Color'), channel, expected_type)
+        if not resolved or resolved.get("kind") not in {"texture", "group_input"}:
+            return resolved
+
+        # Preserve Normal Map node parameters (best-effort; linked strength is not handled).
+        scale = None
+        strength_socket = node.inputs.get('Strength') if hasattr(node, "inputs") else None
+        if strength_socket and not getattr(strength_socket, "is_linked", False):
             try:
-                index = list(from_node.outputs).index(from_socket)
-                if hasattr(output_node, "inputs") and index < len(output_node.inputs):
-                    input_socket = output_node.inputs[index]
+                scale = float(strength_socket.default_value)
             except Exception:
-                input_socket = None
+                scale = None
+
+        space = getattr(node, "space", None)
+        if space:
+            space = str(space).upper()
+            if "TANGENT" in space:
+                space = "tangent"
+            elif "OBJECT" in space:
+                space = "object"
+            else:
+                space = None
+        return _with_normal_map(resolved, scale, space)
+
+    def _bump(self, node, socket, channel, expected_type, cache_key):
+        return _Resolve(node.inputs.get('Height'), channel, expected_type)
+
+    def _mapping(self, node, socket, channel, expected_type, cache_key):
+        return _Resolve(node.inputs.get('Vector'), channel, expected_type)
 
+    def _group(self, node, socket, channel, expected_type, cache_key):
+        input_socket = _group_output_socket(node, socket)
         if input_socket and input_socket.is_linked:
-            return _resolve_socket_value(
-                input_socket,
-                visited,
-                channel,
-                provenance,
-                cache,
-                expected_type=expected_type,
-            )
-        return {"kind": "unresolved", "provenance": list(provenance)}
+            return _Resolve(_GroupSocket(input_socket, node), channel, expected_type)
+        return self.unresolved()
 
-    if node_type in {'MIX_RGB', 'MIX'}:
-        fac_socket = from_node.inputs.get('Fac') if hasattr(from_node, "inputs") else None
-        if fac_socket is None and hasattr(from_node, "inputs"):
-            fac_socket = from_node.inputs.get('Factor')
+    def _mix(self, node, socket, channel, expected_type, cache_key):
+        fac_socket = node.inputs.get('Fac') if hasattr(node, "inputs") else None
+        if fac_socket is None and hasattr(node, "inputs"):
+            fac_socket = node.inputs.get('Factor')
         if fac_socket and not fac_socket.is_linked:
             try:
                 fac = float(fac_socket.default_value)
             except Exception:
                 fac = None
-            a_socket = from_node.inputs.get('Color1') if hasattr(from_node, "inputs") else None
-            b_socket = from_node.inputs.get('Color2') if hasattr(from_node, "inputs") else None
-            if a_socket is None and hasattr(from_node, "inputs"):
-                a_socket = from_node.inputs.get('A')
-            if b_socket is None and hasattr(from_node, "inputs"):
-                b_socket = from_node.inputs.get('B')
+            a_socket = node.inputs.get('Color1') if hasattr(node, "inputs") else None
+            b_socket = node.inputs.get('Color2') if hasattr(node, "inputs") else None
+            if a_socket is None and hasattr(node, "inputs"):
+                a_socket = node.inputs.get('A')
+            if b_socket is None and hasattr(node, "inputs"):
+                b_socket = node.inputs.get('B')
             if fac == 0.0 and a_socket and a_socket.is_linked:
-                return _resolve_socket_value(
-                    a_socket,
-                    visited,
-                    channel,
-                    provenance,
-                    cache,
-                    expected_type=expected_type,
-                )
+                return _Resolve(a_socket, channel, expected_type)
             if fac == 1.0 and b_socket and b_socket.is_linked:
-                return _resolve_socket_value(
-                    b_socket,
-                    visited,
-                    channel,
-                    provenance,
-                    cache,
-                    expected_type=expected_type,
-                )
-
-    if node_type == 'MATH':
-        operation = (getattr(from_node, "operation", "") or "").upper()
-        if hasattr(from_node, "inputs") and len(from_node.inputs) >= 2:
-            in0 = from_node.inputs[0]
-            in1 = from_node.inputs[1]
+                return _Resolve(b_socket, channel, expected_type)
+        return self.unsupported(cache_key)
+
+    def _math(self, node, socket, channel, expected_type, cache_key):
+        operation = (getattr(node, "operation", "") or "").upper()
+        if hasattr(node, "inputs") and len(node.inputs) >= 2:
+            in0 = node.inputs[0]
+            in1 = node.inputs[1]
             if in0 and in0.is_linked and (not in1 or not in1.is_linked):
                 try:
                     value = float(in1.default_value)
                 except Exception:
                     value = None
                 if _is_identity_math(operation, value, linked_index=0):
-                    return _resolve_socket_value(
-                        in0,
-                        visited,
-                        channel,
-                        provenance,
-                        cache,
-                        expected_type=expected_type,
-                    )
+                    return _Resolve(in0, channel, expected_type)
             if in1 and in1.is_linked and (not in0 or not in0.is_linked):
                 try:
                     value = float(in0.default_value)
                 except Exception:
                     value = None
                 if _is_identity_math(operation, value, linked_index=1):
-                    return _resolve_socket_value(
-                        in1,
-                        visited,
-                        channel,
-                        provenance,
-                        cache,
-                        expected_type=expected_type,
-                    )
-
-    if node_type == 'CLAMP':
-        value_expr = _expr_from_socket(
-            from_node.inputs.get('Value') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-        if value_expr is None and hasattr(from_node, "inputs") and from_node.inputs:
-            value_expr = _expr_from_socket(
-                from_node.inputs[0],
-                visited,
-                channel,
-                provenance,
-                cache,
-            )
-        low_expr = _expr_from_socket(
-            from_node.inputs.get('Min') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        high_expr = _expr_from_socket(
-            from_node.inputs.get('Max') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+                    return _Resolve(in1, channel, expected_type)
+        return self.unsupported(cache_key)
+
+    def _clamp(self, node, socket, channel, expected_type, cache_key):
+        value_expr = yield from self.input_expr(node, 'Value', channel)
+        if value_expr is None and hasattr(node, "inputs") and node.inputs:
+            value_expr = yield from self.expr(node.inputs[0], channel)
+        low_expr = yield from self.input_expr(node, 'Min', channel, default=0.0)
+        high_expr = yield from self.input_expr(node, 'Max', channel, default=1.0)
         node_id = _nodedef_for("clamp", expected_type or "float")
         return _make_node_expr(
             node_id,
             {"in": value_expr, "low": low_expr, "high": high_expr},
         )
 
-    if node_type == 'MAP_RANGE':
-        value_expr = _expr_from_socket(
-            from_node.inputs.get('Value') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-        in_min = _expr_from_socket(
-            from_node.inputs.get('From Min') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        in_max = _expr_from_socket(
-            from_node.inputs.get('From Max') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
-        out_min = _expr_from_socket(
-            from_node.inputs.get('To Min') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        out_max = _expr_from_socket(
-            from_node.inputs.get('To Max') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+    def _map_range(self, node, socket, channel, expected_type, cache_key):
+        value_expr = yield from self.input_expr(node, 'Value', channel)
+        in_min = yield from self.input_expr(node, 'From Min', channel, default=0.0)
+        in_max = yield from self.input_expr(node, 'From Max', channel, default=1.0)
+        out_min = yield from self.input_expr(node, 'To Min', channel, default=0.0)
+        out_max = yield from self.input_expr(node, 'To Max', channel, default=1.0)
         inputs = {
             "in": value_expr,
             "inlow": in_min,
@@ -1300,43 +1546,16 @@ def _resolve_socket_value(
             "outhigh": out_max,
             "gamma": _constant_expr(1.0),
         }
-        if getattr(from_node, "clamp", False):
+        if getattr(node, "clamp", False):
             inputs["doclamp"] = _constant_expr(True)
         node_id = _nodedef_for("range", expected_type or "float")
         return _make_node_expr(node_id, inputs)
 
-    if node_type == 'HUE_SAT':
-        color_expr = _expr_from_socket(
-            from_node.inputs.get('Color') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-        hue_expr = _expr_from_socket(
-            from_node.inputs.get('Hue') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.5,
-        )
-        sat_expr = _expr_from_socket(
-            from_node.inputs.get('Saturation') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
-        val_expr = _expr_from_socket(
-            from_node.inputs.get('Value') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+    def _hue_sat(self, node, socket, channel, expected_type, cache_key):
+        color_expr = yield from self.input_expr(node, 'Color', channel)
+        hue_expr = yield from self.input_expr(node, 'Hue', channel, default=0.5)
+        sat_expr = yield from self.input_expr(node, 'Saturation', channel, default=1.0)
+        val_expr = yield from self.input_expr(node, 'Value', channel, default=1.0)
         amount_expr = _make_node_expr(
             _nodedef_for("combine3", "vector3"),
             {"in1": hue_expr, "in2": sat_expr, "in3": val_expr},
@@ -1345,14 +1564,7 @@ def _resolve_socket_value(
             _nodedef_for("hsvadjust", expected_type or "color3"),
             {"in": color_expr, "amount": amount_expr},
         )
-        fac_expr = _expr_from_socket(
-            from_node.inputs.get('Fac') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+        fac_expr = yield from self.input_expr(node, 'Fac', channel, default=1.0)
         if _expr_is_constant(fac_expr, 1.0):
             return hsv_expr
         mix_inputs = {
@@ -1362,16 +1574,10 @@ def _resolve_socket_value(
         }
         return _make_node_expr(_nodedef_for("mix", expected_type or "color3"), mix_inputs)
 
-    if node_type == 'INVERT':
-        color_expr = _expr_from_socket(
-            from_node.inputs.get('Color') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _invert(self, node, socket, channel, expected_type, cache_key):
+        color_expr = yield from self.input_expr(node, 'Color', channel)
         if color_expr is None:
-            return {"kind": "unresolved", "provenance": list(provenance)}
+            return self.unresolved()
         if expected_type and expected_type.startswith("vector"):
             return color_expr
 
@@ -1406,14 +1612,7 @@ def _resolve_socket_value(
                 swizzle_node,
                 {"in": invert_color, "channels": _constant_expr(channel or "r")},
             )
-        fac_expr = _expr_from_socket(
-            from_node.inputs.get('Fac') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+        fac_expr = yield from self.input_expr(node, 'Fac', channel, default=1.0)
         if _expr_is_constant(fac_expr, 0.0):
             return color_expr
         invert_expr = _make_node_expr(
@@ -1427,30 +1626,10 @@ def _resolve_socket_value(
             {"fg": invert_expr, "bg": color_expr, "mix": fac_expr},
         )
 
-    if node_type == 'BRIGHTCONTRAST':
-        color_expr = _expr_from_socket(
-            from_node.inputs.get('Color') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-        bright_expr = _expr_from_socket(
-            from_node.inputs.get('Bright') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        contrast_expr = _expr_from_socket(
-            from_node.inputs.get('Contrast') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
+    def _bright_contrast(self, node, socket, channel, expected_type, cache_key):
+        color_expr = yield from self.input_expr(node, 'Color', channel)
+        bright_expr = yield from self.input_expr(node, 'Bright', channel, default=0.0)
+        contrast_expr = yield from self.input_expr(node, 'Contrast', channel, default=0.0)
         contrast_amount = _make_node_expr(
             _nodedef_for("add", "float"),
             {"in1": contrast_expr, "in2": _constant_expr(1.0)},
@@ -1470,16 +1649,9 @@ def _resolve_socket_value(
             {"in1": contrast_node, "in2": bright_color},
         )
 
-    if node_type == 'VALTORGB':
-        fac_expr = _expr_from_socket(
-            from_node.inputs.get('Fac') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        ramp = getattr(from_node, "color_ramp", None)
+    def _color_ramp(self, node, socket, channel, expected_type, cache_key):
+        fac_expr = yield from self.input_expr(node, 'Fac', channel, default=0.0)
+        ramp = getattr(node, "color_ramp", None)
         elements = list(getattr(ramp, "elements", []) or [])
         if len(elements) >= 2:
             left = elements[0]
@@ -1502,34 +1674,21 @@ def _resolve_socket_value(
         ramp_inputs["texcoord"] = texcoord_expr
         return _make_node_expr(_nodedef_for("ramplr", ramp_type), ramp_inputs)
 
-    if node_type == 'CURVE_RGB':
-        color_expr = _expr_from_socket(
-            from_node.inputs.get('Color') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _curve_rgb(self, node, socket, channel, expected_type, cache_key):
+        color_expr = yield from self.input_expr(node, 'Color', channel)
         if color_expr is None:
-            return {"kind": "unresolved", "provenance": list(provenance)}
+            return self.unresolved()
 
         if expected_type and expected_type not in {'color3', 'color4'}:
             # Curve RGB is a color operation; pass through for non-color targets (e.g. normals).
             return color_expr
 
-        fac_expr = _expr_from_socket(
-            from_node.inputs.get('Fac') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+        fac_expr = yield from self.input_expr(node, 'Fac', channel, default=1.0)
 
-        mapping = getattr(from_node, "mapping", None)
+        mapping = getattr(node, "mapping", None)
         curves = list(getattr(mapping, "curves", []) or []) if mapping else []
         if not curves:
-            return {"kind": "unresolved", "provenance": list(provenance)}
+            return self.unresolved()
 
         combined_curve = curves[0] if len(curves) > 0 else None
         red_curve = curves[1] if len(curves) > 1 else combined_curve
@@ -1596,54 +1755,20 @@ def _resolve_socket_value(
             {"fg": combined_expr, "bg": color_expr, "mix": fac_expr},
         )
 
-    if node_type == 'RGBTOBW':
-        color_expr = _expr_from_socket(
-            from_node.inputs.get('Color') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _rgb_to_bw(self, node, socket, channel, expected_type, cache_key):
+        color_expr = yield from self.input_expr(node, 'Color', channel)
         return _make_node_expr(_nodedef_for("luminance", "float"), {"in": color_expr})
 
-    if node_type == 'COMBINE_COLOR':
-        mode = (getattr(from_node, "mode", "") or "").upper()
+    def _combine_color(self, node, socket, channel, expected_type, cache_key):
+        mode = (getattr(node, "mode", "") or "").upper()
         if mode and mode != "RGB":
-            return {"kind": "unresolved", "provenance": list(provenance)}
-        r_expr = _expr_from_socket(
-            from_node.inputs.get('R') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        g_expr = _expr_from_socket(
-            from_node.inputs.get('G') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        b_expr = _expr_from_socket(
-            from_node.inputs.get('B') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
-        a_socket = from_node.inputs.get('A') if hasattr(from_node, "inputs") else None
+            return self.unresolved()
+        r_expr = yield from self.input_expr(node, 'R', channel, default=0.0)
+        g_expr = yield from self.input_expr(node, 'G', channel, default=0.0)
+        b_expr = yield from self.input_expr(node, 'B', channel, default=0.0)
+        a_socket = node.inputs.get('A') if hasattr(node, "inputs") else None
         if a_socket:
-            a_expr = _expr_from_socket(
-                a_socket,
-                visited,
-                channel,
-                provenance,
-                cache,
-                default=1.0,
-            )
+            a_expr = yield from self.expr(a_socket, channel, default=1.0)
             return _make_node_expr(
                 _nodedef_for("combine4", "color4"),
                 {"in1": r_expr, "in2": g_expr, "in3": b_expr, "in4": a_expr},
@@ -1653,44 +1778,18 @@ def _resolve_socket_value(
             {"in1": r_expr, "in2": g_expr, "in3": b_expr},
         )
 
-    if node_type == 'VECTOR_ROTATE':
-        vector_expr = _expr_from_socket(
-            from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-        axis_expr = _expr_from_socket(
-            from_node.inputs.get('Axis') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=(0.0, 0.0, 1.0),
-        )
-        angle_expr = _expr_from_socket(
-            from_node.inputs.get('Angle') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
+    def _vector_rotate(self, node, socket, channel, expected_type, cache_key):
+        vector_expr = yield from self.input_expr(node, 'Vector', channel)
+        axis_expr = yield from self.input_expr(node, 'Axis', channel, default=(0.0, 0.0, 1.0))
+        angle_expr = yield from self.input_expr(node, 'Angle', channel, default=0.0)
         return _make_node_expr(
             _nodedef_for("rotate3d", "vector3"),
             {"in": vector_expr, "axis": axis_expr, "amount": angle_expr},
         )
 
-    if node_type == 'VECTOR_TRANSFORM':
-        vector_expr = _expr_from_socket(
-            from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-        vector_type = (getattr(from_node, "vector_type", "") or "").upper()
+    def _vector_transform(self, node, socket, channel, expected_type, cache_key):
+        vector_expr = yield from self.input_expr(node, 'Vector', channel)
+        vector_type = (getattr(node, "vector_type", "") or "").upper()
         if vector_type == 'NORMAL':
             node_id = _nodedef_for("transformnormal", "vector3")
         elif vector_type == 'POINT':
@@ -1699,8 +1798,8 @@ def _resolve_socket_value(
             node_id = _nodedef_for("transformvector", "vector3")
         return _make_node_expr(node_id, {"in": vector_expr})
 
-    if node_type == 'NORMAL':
-        output = from_node.outputs.get('Normal') if hasattr(from_node, "outputs") else None
+    def _normal(self, node, socket, channel, expected_type, cache_key):
+        output = node.outputs.get('Normal') if hasattr(node, "outputs") else None
         value = None
         if output:
             try:
@@ -1711,48 +1810,14 @@ def _resolve_socket_value(
             return {"kind": "constant", "value": value}
         return _make_node_expr(_nodedef_for("normal", "vector3"), {"space": "world"})
 
-    if node_type == 'TEX_NOISE':
-        vector_expr = _expr_from_socket(
-            from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _noise(self, node, socket, channel, expected_type, cache_key):
+        vector_expr = yield from self.input_expr(node, 'Vector', channel)
         if vector_expr is None:
             vector_expr = _default_texcoord_expr(vector_dim=3)
-        scale_expr = _expr_from_socket(
-            from_node.inputs.get('Scale') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
-        detail_expr = _expr_from_socket(
-            from_node.inputs.get('Detail') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=2.0,
-        )
-        rough_expr = _expr_from_socket(
-            from_node.inputs.get('Roughness') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.5,
-        )
-        distort_expr = _expr_from_socket(
-            from_node.inputs.get('Distortion') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.0,
-        )
+        scale_expr = yield from self.input_expr(node, 'Scale', channel, default=1.0)
+        detail_expr = yield from self.input_expr(node, 'Detail', channel, default=2.0)
+        rough_expr = yield from self.input_expr(node, 'Roughness', channel, default=0.5)
+        distort_expr = yield from self.input_expr(node, 'Distortion', channel, default=0.0)
         node_id = _nodedef_for("unifiednoise3d", "float")
         inputs = {
             "position": vector_expr,
@@ -1769,61 +1834,21 @@ def _resolve_socket_value(
         }
         return _make_node_expr(node_id, inputs)
 
-    if node_type == 'TEX_VORONOI':
-        vector_expr = _expr_from_socket(
-            from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _voronoi(self, node, socket, channel, expected_type, cache_key):
+        vector_expr = yield from self.input_expr(node, 'Vector', channel)
         if vector_expr is None:
             vector_expr = _default_texcoord_expr(vector_dim=3)
-        jitter_expr = _expr_from_socket(
-            from_node.inputs.get('Randomness') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=1.0,
-        )
+        jitter_expr = yield from self.input_expr(node, 'Randomness', channel, default=1.0)
         node_id = _nodedef_for("worleynoise3d", "float")
         return _make_node_expr(node_id, {"position": vector_expr, "jitter": jitter_expr})
 
-    if node_type == 'TEX_MUSGRAVE':
-        vector_expr = _expr_from_socket(
-            from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _musgrave(self, node, socket, channel, expected_type, cache_key):
+        vector_expr = yield from self.input_expr(node, 'Vector', channel)
         if vector_expr is None:
             vector_expr = _default_texcoord_expr(vector_dim=3)
-        detail_expr = _expr_from_socket(
-            from_node.inputs.get('Detail') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=2.0,
-        )
-        lac_expr = _expr_from_socket(
-            from_node.inputs.get('Lacunarity') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=2.0,
-        )
-        dim_expr = _expr_from_socket(
-            from_node.inputs.get('Dimension') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-            default=0.5,
-        )
+        detail_expr = yield from self.input_expr(node, 'Detail', channel, default=2.0)
+        lac_expr = yield from self.input_expr(node, 'Lacunarity', channel, default=2.0)
+        dim_expr = yield from self.input_expr(node, 'Dimension', channel, default=0.5)
         node_id = _nodedef_for("fractal3d", "float")
         return _make_node_expr(
             node_id,
@@ -1836,43 +1861,36 @@ def _resolve_socket_value(
             },
         )
 
-    if node_type == 'TEX_GRADIENT':
-        vector_expr = _expr_from_socket(
-            from_node.inputs.get('Vector') if hasattr(from_node, "inputs") else None,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
+    def _gradient(self, node, socket, channel, expected_type, cache_key):
+        vector_expr = yield from self.input_expr(node, 'Vector', channel)
         texcoord_expr = vector_expr or _default_texcoord_expr(vector_dim=2)
         return _make_node_expr(
             _nodedef_for("ramplr", "float"),
             {"valuel": _constant_expr(0.0), "valuer": _constant_expr(1.0), "texcoord": texcoord_expr},
         )
 
-    if node_type == 'TEX_ENVIRONMENT':
-        texture_info = _texture_info_from_image_node(from_node)
-        if texture_info:
-            if expected_type:
-                texture_info.setdefault("output_type", expected_type)
-            if cache is not None and cache_key is not None:
-                cache[cache_key] = dict(texture_info)
-            return texture_info
-
-    if node_type == 'TEX_IMAGE':
-        texture_info = _texture_info_from_image_node(from_node)
+    def _environment(self, node, socket, channel, expected_type, cache_key):
+        texture_info = _texture_info_from_image_node(node)
+        if not texture_info:
+            return self.unsupported(cache_key)
+        if expected_type:
+            texture_info.setdefault("output_type", expected_type)
+        self._store(cache_key, texture_info)
+        return texture_info
+
+    def _image(self, node, socket, channel, expected_type, cache_key):
+        texture_info = _texture_info_from_image_node(node)
         if not texture_info:
             return None
         if expected_type:
             texture_info.setdefault("output_type", expected_type)
         if channel:
             texture_info.setdefault("channel", channel)
-        if cache is not None and cache_key is not None:
-            cache[cache_key] = dict(texture_info)
+        self._store(cache_key, texture_info)
         return texture_info
 
-    if node_type == 'RGB':
-        output = from_node.outputs.get('Color') if hasattr(from_node, "outputs") else None
+    def _rgb(self, node, socket, channel, expected_type, cache_key):
+        output = node.outputs.get('Color') if hasattr(node, "outputs") else None
         value = None
         if output:
             try:
@@ -1881,42 +1899,69 @@ def _resolve_socket_value(
                 value = None
         if value is None:
             try:
-                value = list(from_node.outputs[0].default_value)[:3]
+                value = list(node.outputs[0].default_value)[:3]
             except Exception:
                 value = None
         if value is None:
             return None
         result = {"kind": "constant", "value": value}
-        if cache is not None and cache_key is not None:
-            cache[cache_key] = dict(result)
+        self._store(cache_key, result)
         return result
 
-    if node_type == 'VALUE':
-        output = from_node.outputs.get('Value') if hasattr(from_node, "outputs") else None
+    def _value(self, node, socket, channel, expected_type, cache_key):
+        output = node.outputs.get('Value') if hasattr(node, "outputs") else None
         value = None
         if output:
             try:
                 value = float(output.default_value)
             except Exception:
                 value = None
-        if value is None and hasattr(from_node, "outputs") and from_node.outputs:
+        if value is None and hasattr(node, "outputs") and node.outputs:
             try:
-                value = float(from_node.outputs[0].default_value)
+                value = float(node.outputs[0].default_value)
             except Exception:
                 value = None
         if value is None:
             return None
         result = {"kind": "constant", "value": value}
-        if cache is not None and cache_key is not None:
-            cache[cache_key] = dict(result)
+        self._store(cache_key, result)
         return result
 
-    # Unsupported node type: return unresolved with provenance chain.
-    if cache is not None and cache_key is not None:
-        cache[cache_key] = {"kind": "unresolved", "provenance": list(provenance)}
-    return {"kind": "unresolved", "provenance": list(provenance)}
 
-    return None
+_NODE_HANDLERS = {
+    'REROUTE': _SocketResolver._reroute,
+    'SEPARATE_COLOR': _SocketResolver._separate_color,
+    'SEPARATE_RGB': _SocketResolver._separate_color,
+    'SEPARATE_XYZ': _SocketResolver._separate_xyz,
+    'SEPXYZ': _SocketResolver._separate_xyz,
+    'NORMAL_MAP': _SocketResolver._normal_map,
+    'BUMP': _SocketResolver._bump,
+    'MAPPING': _SocketResolver._mapping,
+    'GROUP': _SocketResolver._group,
+    'MIX_RGB': _SocketResolver._mix,
+    'MIX': _SocketResolver._mix,
+    'MATH': _SocketResolver._math,
+    'CLAMP': _SocketResolver._clamp,
+    'MAP_RANGE': _SocketResolver._map_range,
+    'HUE_SAT': _SocketResolver._hue_sat,
+    'INVERT': _SocketResolver._invert,
+    'BRIGHTCONTRAST': _SocketResolver._bright_contrast,
+    'VALTORGB': _SocketResolver._color_ramp,
+    'CURVE_RGB': _SocketResolver._curve_rgb,
+    'RGBTOBW': _SocketResolver._rgb_to_bw,
+    'COMBINE_COLOR': _SocketResolver._combine_color,
+    'VECTOR_ROTATE': _SocketResolver._vector_rotate,
+    'VECTOR_TRANSFORM': _SocketResolver._vector_transform,
+    'NORMAL': _SocketResolver._normal,
+    'TEX_NOISE': _SocketResolver._noise,
+    'TEX_VORONOI': _SocketResolver._voronoi,
+    'TEX_MUSGRAVE': _SocketResolver._musgrave,
+    'TEX_GRADIENT': _SocketResolver._gradient,
+    'TEX_ENVIRONMENT': _SocketResolver._environment,
+    'TEX_IMAGE': _SocketResolver._image,
+    'RGB': _SocketResolver._rgb,
+    'VALUE': _SocketResolver._value,
+}
 
 
 def _texture_info_from_image_node(image_node) -> Optional[Dict[str, Any]]:
@@ -2034,16 +2079,6 @@ def _is_identity_math(operation: str, value: Optional[float], linked_index: int)
     return False
 
 
-def _get_manifest() -> Dict[str, Any]:
-    global _MANIFEST_CACHE
-    if _MANIFEST_CACHE is None:
-        try:
-            _MANIFEST_CACHE = load_manifest()
-        except Exception:
-            _MANIFEST_CACHE = {}
-    return _MANIFEST_CACHE or {}
-
-
 def _nodedef_for(node_name: str, output_type: Optional[str] = None) -> str:
     manifest = _get_manifest()
     nodedef = select_nodedef_name_for_node(
@@ -2078,34 +2113,6 @@ def _expr_is_constant(expr: Optional[Dict[str, Any]], value: float) -> bool:
         return False
 
 
-def _expr_from_socket(
-    socket,
-    visited,
-    channel,
-    provenance,
-    cache,
-    default: Optional[Any] = None,
-):
-    if socket is None:
-        if default is None:
-            return None
-        return _constant_expr(default)
-    if socket.is_linked:
-        return _resolve_socket_value(
-            socket,
-            visited,
-            channel,
-            provenance,
-            cache,
-        )
-    value = _socket_default_value(socket)
-    if value is None:
-        value = default
-    if value is None:
-        return None
-    return _constant_expr(value)
-
-
 def _default_texcoord_expr(vector_dim: int = 2) -> Dict[str, Any]:
     nodedef = _nodedef_for("texcoord", "vector3" if vector_dim == 3 else "vector2")
     return _make_node_expr(nodedef, {})
@@ -23,6 +23,10 @@ class MaterialXGraphBuilder:
         self.diagnostics = diagnostics
         self.node_counter = 0
 
+    def begin_material(self) -> None:
+        """Restart node numbering so each material's graph is order-independent."""
+        self.node_counter = 0
+
     def build_pbr_material(self, material_data: Dict[str, Any]) -> Dict[str, Any]:
         """Build a PBR MaterialX graph.
 
@@ -3,7 +3,7 @@ Shared helpers for MaterialX USD authoring.
 """
 
 import re
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Set, Tuple
 
 from ...manifest.materialx_nodes import select_node_def_for_node
 
@@ -69,18 +69,54 @@ def _sanitize_name(value: str) -> str:
     return sanitized
 
 
-def _assign_graph_node_names(stage, nodegraph_path: str, nodes: List[Dict[str, Any]]) -> Dict[str, str]:
+class ChildNameIndex:
+    """Names of a nodegraph's child prims, seeded once from the stage.
+
+    `next_free()` hands out the same lowest-free `<base>_<n>` a probing loop
+    would, but resumes from the last index returned for that base: children are
+    only ever added while a material is authored, so earlier indices stay taken.
+    Names are not reserved when handed out (a cached texture may never define
+    its `Image_<n>`), so the candidate at the cursor is confirmed with one prim
+    lookup, which also catches children defined outside the index.
+    """
+
+    def __init__(self, stage, nodegraph_path: str):
+        self._stage = stage
+        self._path = nodegraph_path
+        prim = stage.GetPrimAtPath(nodegraph_path)
+        self.names: Set[str] = set(prim.GetAllChildrenNames()) if prim else set()
+        self._cursors: Dict[Tuple[str, int], int] = {}
+
+    def is_taken(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        if self._stage.GetPrimAtPath(f"{self._path}/{name}"):
+            self.names.add(name)
+            return True
+        return False
+
+    def next_free(self, base: str, start: int, taken: Optional[Set[str]] = None) -> int:
+        """Lowest n >= start such that `<base>_<n>` is free (and not in `taken`)."""
+        key = (base, start)
+        index = self._cursors.get(key, start)
+        while self.is_taken(f"{base}_{index}"):
+            index += 1
+        self._cursors[key] = index
+        while taken and (f"{base}_{index}" in taken or self.is_taken(f"{base}_{index}")):
+            index += 1
+        return index
+
+
+def _assign_graph_node_names(names: ChildNameIndex, nodes: List[Dict[str, Any]]) -> Dict[str, str]:
     """Assign unique USD-safe names for graph nodes."""
     name_map: Dict[str, str] = {}
-    used = set()
+    used: Set[str] = set()
     for node in nodes:
         original = node.get("name") or "node"
         base = _sanitize_name(original)
         candidate = base
-        suffix = 1
-        while candidate in used or stage.GetPrimAtPath(f"{nodegraph_path}/{candidate}"):
-            suffix += 1
-            candidate = f"{base}_{suffix}"
+        if candidate in used or names.is_taken(candidate):
+            candidate = f"{base}_{names.next_free(base, 2, used)}"
         used.add(candidate)
         name_map[original] = candidate
     return name_map
@@ -98,31 +134,25 @@ def _collect_connected_inputs(connections: List[Dict[str, str]]) -> Dict[str, se
     return connected
 
 
-def _unique_shader_name(stage, nodegraph_path: str, base_name: str) -> str:
-    """Return a unique shader prim name under the given nodegraph path."""
-    candidate = base_name
-    suffix = 1
-    while stage.GetPrimAtPath(f"{nodegraph_path}/{candidate}"):
-        suffix += 1
-        candidate = f"{base_name}_{suffix}"
-    return candidate
+def _unique_shader_name(names: ChildNameIndex, base_name: str) -> str:
+    """Return a unique shader prim name under the indexed nodegraph."""
+    if not names.is_taken(base_name):
+        return base_name
+    return f"{base_name}_{names.next_free(base_name, 2)}"
 
 
-def _image_shader_name(stage, nodegraph_path: str, input_name: str) -> str:
+def _image_shader_name(names: ChildNameIndex, input_name: str) -> str:
     """Pick a stable image shader name aligned with RCP defaults."""
     base_name = "Image"
-    if not stage.GetPrimAtPath(f"{nodegraph_path}/{base_name}"):
+    if not names.is_taken(base_name):
         return base_name
-    index = 1
-    while stage.GetPrimAtPath(f"{nodegraph_path}/{base_name}_{index}"):
-        index += 1
-    return f"{base_name}_{index}"
+    return f"{base_name}_{names.next_free(base_name, 1)}"
 
 
-def _convert_shader_name(stage, nodegraph_path: str, input_name: str) -> str:
+def _convert_shader_name(names: ChildNameIndex, input_name: str) -> str:
     """Pick a stable convert shader name aligned with RCP defaults."""
     base_name = "Convert"
-    if stage.GetPrimAtPath(f"{nodegraph_path}/{base_name}"):
+    if names.is_taken(base_name):
         sanitized = _sanitize_name(input_name)
         base_name = f"Convert_{sanitized}"
-    return _unique_shader_name(stage, nodegraph_path, base_name)
+    return _unique_shader_name(names, base_name)
@@ -0,0 +1,163 @@
+"""
+Content-addressed sidecar material library.
+
+With `Material Library` enabled, `rewrite_materials` authors each converted
+MaterialX network once into a sidecar layer next to the exported USD file
+(`<name>.materials.usdc` or `.usda`) under `/MaterialLibrary/M_<hash>`, where
+the hash covers the built graph payload, the manifest fingerprint and
+`MATERIAL_LIBRARY_VERSION`. The scene's material prim then references the
+library prim instead of inlining the shader network. For USDZ exports the
+library is written beside the intermediate stage and packed with it.
+
+The library is reopened on later exports of the same file, so materials whose
+graph hash is already present are referenced without re-authoring; entries the
+export no longer references are pruned when it is saved. Texture staging
+rewrites the library's texture paths in place to the staged `textures/...`
+paths, so the library is self-contained next to the export. A library entry
+whose textures are missing is authored again.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Set
+
+from ..usd_utils import Sdf, Usd, UsdShade
+from .author import create_materialx_material
+
+
+MATERIAL_LIBRARY_VERSION = 1
+LIBRARY_ROOT = "/MaterialLibrary"
+LIBRARY_STEM = "materials"
+LIBRARY_EXTENSIONS = {"USDC": ".usdc", "USDA": ".usda"}
+
+
+class MaterialLibrary:
+    """Sidecar layer of MaterialX materials keyed by graph content hash."""
+
+    def __init__(self, path: Path, salt: str = ""):
+        self.path = Path(path)
+        self.salt = salt
+        layer = Sdf.Layer.FindOrOpen(str(self.path)) if self.path.exists() else None
+        if layer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            layer = Sdf.Layer.CreateNew(str(self.path))
+        if layer is None:
+            raise RuntimeError(f"Failed to open material library: {self.path}")
+        self.layer = layer
+        self.stage = Usd.Stage.Open(layer)
+        self._dirty = False
+        self._referenced: Set[str] = set()
+        self._stats: Dict[str, Any] = {
+            "hits": 0,
+            "writes": 0,
+            "refreshed": 0,
+            "conflicts": 0,
+            "pruned": 0,
+            "path": str(self.path),
+        }
+
+    def key_for(self, graph_hash: str) -> str:
+        """Return the library key for a graph fingerprint."""
+        payload = repr((MATERIAL_LIBRARY_VERSION, self.salt, graph_hash))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def material_path(
+        self,
+        graph_hash: str,
+        material_name: str,
+        graph: Dict[str, Any],
+        manifest: Dict[str, Any],
+        diagnostics=None,
+        templates=None,
+    ) -> str:
+        """Return the library prim path for a graph, authoring it on a miss.
+
+        `templates` (a `MaterialTemplates`) is used for authoring when given.
+        """
+        path = f"{LIBRARY_ROOT}/M_{self.key_for(graph_hash)}"
+        if self.layer.GetPrimAtPath(path):
+            if self._assets_present(path):
+                self._stats["hits"] += 1
+                return path
+            # Staged textures were removed since; author again from the sources.
+            self.stage.RemovePrim(path)
+            self._stats["refreshed"] += 1
+
+        if not self.layer.GetPrimAtPath(LIBRARY_ROOT):
+            self.stage.DefinePrim(LIBRARY_ROOT, "Scope")
+        try:
+            author = templates.author if templates is not None else create_materialx_material
+            author(self.stage, path, material_name, graph, manifest, diagnostics)
+        except Exception:
+            # Never leave a partial network behind for later exports to reuse.
+            self.stage.RemovePrim(path)
+            raise
+        self._dirty = True
+        self._stats["writes"] += 1
+        return path
+
+    def reference(self, stage, material_path: str, library_path: str):
+        """Make the scene material at `material_path` reference a library material.
+
+        Returns the bound material, or None when the scene material already has
+        children with the library network's names (it is then authored inline).
+        """
+        material_prim = stage.GetPrimAtPath(material_path)
+        library_spec = self.layer.GetPrimAtPath(library_path)
+        if not material_prim or not library_spec:
+            return None
+        if set(material_prim.GetAllChildrenNames()) & set(library_spec.nameChildren.keys()):
+            self._stats["conflicts"] += 1
+            return None
+
+        scene_dir = os.path.dirname(stage.GetRootLayer().realPath)
+        asset_path = Path(os.path.relpath(self.path, scene_dir)).as_posix()
+        if not asset_path.startswith("."):
+            asset_path = f"./{asset_path}"
+        material_prim.GetReferences().AddReference(asset_path, Sdf.Path(library_path))
+        self._referenced.add(library_path)
+        return UsdShade.Material(material_prim)
+
+    def save(self) -> None:
+        """Prune entries this export did not reference, then write the layer if it changed."""
+        root_spec = self.layer.GetPrimAtPath(LIBRARY_ROOT)
+        if root_spec:
+            for name in list(root_spec.nameChildren.keys()):
+                path = f"{LIBRARY_ROOT}/{name}"
+                if path not in self._referenced:
+                    self.stage.RemovePrim(path)
+                    self._stats["pruned"] += 1
+                    self._dirty = True
+        if self._dirty:
+            self.layer.Save()
+            self._dirty = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/write counters for diagnostics."""
+        return dict(self._stats)
+
+    def _assets_present(self, path: str) -> bool:
+        """True if every asset path authored under the library prim resolves to a file."""
+        missing = []
+
+        def visit(spec_path) -> None:
+            if not spec_path.IsPropertyPath():
+                return
+            attr_spec = self.layer.GetAttributeAtPath(spec_path)
+            value = attr_spec.default if attr_spec and attr_spec.HasDefaultValue() else None
+            if isinstance(value, Sdf.AssetPath) and value.path:
+                # Unresolvable paths come back as authored (relative); treat those as missing.
+                resolved = self.layer.ComputeAbsolutePath(value.path)
+                if not (os.path.isabs(resolved) and os.path.isfile(resolved)):
+                    missing.append(spec_path)
+
+        self.layer.Traverse(Sdf.Path(path), visit)
+        return not missing
+
+
+def material_library_path(usd_path: str, settings=None) -> Path:
+    """Return the sidecar library path for an exported USD file (one library per file)."""
+    library_format = getattr(settings, "material_library_format", "USDC") if settings is not None else "USDC"
+    extension = LIBRARY_EXTENSIONS.get(library_format, LIBRARY_EXTENSIONS["USDC"])
+    return Path(usd_path).with_name(f"{Path(usd_path).stem}.{LIBRARY_STEM}{extension}")
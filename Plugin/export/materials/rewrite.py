@@ -2,19 +2,47 @@
 Material rewrite orchestration for USD stages.
 """
 
+import hashlib
+import json
+from typing import Any, Dict
+
 from ..usd_utils import UsdShade, UsdGeom
-from ...manifest.materialx_nodes import load_manifest
+from ...manifest.materialx_nodes import get_manifest_registry, load_manifest
 from .graph import MaterialXGraphBuilder
 from .extract import extract_blender_material_data, collect_material_warnings
+from .cache import MaterialCache, material_cache_dir
+from .library import MaterialLibrary, material_library_path
 from .author import create_materialx_material
+from .templates import MaterialTemplates
 from .helpers import _get_blender_data_name
 
 
-def rewrite_materials(stage, settings, context, diagnostics=None) -> None:
-    """Rewrite materials to MaterialX graphs (Pass 2)."""
+# Prim types `rewrite_materials` reads from the stage index.
+MESH_PRIM_TYPES = ("Mesh",)
+
+
+def rewrite_materials(stage, settings, context, diagnostics=None, index=None) -> None:
+    """Rewrite materials to MaterialX graphs (Pass 2).
+
+    `index` is the post-process `StageIndex`; without one the stage is traversed.
+    """
     manifest = load_manifest()
     builder = MaterialXGraphBuilder(manifest, diagnostics)
     force_unlit = bool(getattr(settings, "force_unlit_materials", False))
+    material_cache = None
+    if getattr(settings, "cache_materials", False):
+        material_cache = MaterialCache(
+            material_cache_dir(),
+            salt=get_manifest_registry().fingerprint() or "",
+        )
+    dedupe = bool(getattr(settings, "dedupe_materials", False))
+    shared_materials: Dict[str, Any] = {}
+    deduplicated_paths = set()
+    material_library = _open_material_library(stage, settings, diagnostics)
+    templates = None
+    if getattr(settings, "use_material_templates", False):
+        templates = MaterialTemplates()
+    author = templates.author if templates is not None else create_materialx_material
 
     blender_materials = {
         material.name: material
@@ -24,10 +52,12 @@ def rewrite_materials(stage, settings, context, diagnostics=None) -> None:
 
     created_materials = {}
 
-    for prim in stage.Traverse():
-        if not prim.IsA(UsdGeom.Mesh):
-            continue
+    if index is not None:
+        meshes = index.prims(MESH_PRIM_TYPES)
+    else:
+        meshes = [prim for prim in stage.Traverse() if prim.IsA(UsdGeom.Mesh)]
 
+    for prim in meshes:
         material_binding = UsdShade.MaterialBindingAPI(prim)
         bound_material = material_binding.GetDirectBinding().GetMaterial()
         if not bound_material:
@@ -48,39 +78,58 @@ def rewrite_materials(stage, settings, context, diagnostics=None) -> None:
                 for warning in warnings:
                     diagnostics.add_warning(warning)
 
-            material_data = extract_blender_material_data(blender_material)
+            cache_key = None
+            cached = None
+            if material_cache is not None:
+                cache_key = material_cache.key_for(blender_material, variant="unlit" if force_unlit else "")
+                if cache_key:
+                    cached = material_cache.get(cache_key)
+
+            if cached:
+                material_data = cached["material_data"]
+            else:
+                material_data = extract_blender_material_data(blender_material)
             unresolved = material_data.get("unresolved_warnings") or []
             if diagnostics:
                 for warning in unresolved:
                     diagnostics.add_warning(warning)
                     diagnostics.add_error(warning)
 
+            graph = None
             try:
-                if force_unlit and material_data['type'] in {'principled', 'emission', 'simple'}:
-                    graph = builder.build_unlit_material(material_data)
-                elif material_data['type'] == 'principled':
-                    graph = builder.build_pbr_material(material_data)
-                elif material_data['type'] in ['emission', 'simple']:
-                    graph = builder.build_unlit_material(material_data)
-                elif material_data['type'] == 'rk_graph':
-                    graph = builder.build_rk_graph(material_data.get('rk_graph'))
-                elif material_data['type'] == 'rk_group':
-                    graph = builder.build_rk_material(
-                        material_data.get('rk_node_id'),
-                        material_data.get('rk_inputs', {})
-                    )
+                if cached and cached.get("graph"):
+                    graph = cached["graph"]
                 else:
-                    graph = None
-
-                if graph:
-                    created_materials[material_key] = create_materialx_material(
-                        stage,
-                        str(material_prim.GetPath()),
-                        blender_name,
-                        graph,
-                        manifest,
-                        diagnostics
-                    )
+                    graph = _build_material_graph(builder, material_data, force_unlit)
+
+                graph_hash = None
+                if graph and (dedupe or material_library is not None):
+                    graph_hash = _graph_fingerprint(graph)
+                shared = shared_materials.get(graph_hash) if dedupe and graph_hash else None
+                if shared:
+                    created_materials[material_key] = shared
+                    deduplicated_paths.add(material_key)
+                    if diagnostics:
+                        diagnostics.add_material_deduplicated(blender_name, str(shared.GetPath()))
+                elif graph:
+                    new_material = None
+                    if material_library is not None:
+                        library_path = material_library.material_path(
+                            graph_hash, blender_name, graph, manifest, diagnostics, templates
+                        )
+                        new_material = material_library.reference(stage, material_key, library_path)
+                    if new_material is None:
+                        new_material = author(
+                            stage,
+                            str(material_prim.GetPath()),
+                            blender_name,
+                            graph,
+                            manifest,
+                            diagnostics
+                        )
+                    created_materials[material_key] = new_material
+                    if dedupe:
+                        shared_materials[graph_hash] = created_materials[material_key]
                     if diagnostics:
                         diagnostics.add_material_converted(blender_name)
             except Exception as e:
@@ -88,6 +137,97 @@ def rewrite_materials(stage, settings, context, diagnostics=None) -> None:
                     diagnostics.add_material_failed(blender_name, str(e))
                 created_materials[material_key] = None
 
+            if cache_key and not cached:
+                material_cache.put(cache_key, material_data, graph)
+
         new_material = created_materials.get(material_key)
         if new_material:
             material_binding.Bind(new_material)
+
+    if deduplicated_paths:
+        _remove_unbound_materials(stage, deduplicated_paths, index)
+
+    if material_library is not None:
+        material_library.save()
+        if diagnostics:
+            diagnostics.set_material_library_stats(material_library.stats())
+
+    if diagnostics:
+        if templates is not None:
+            diagnostics.set_material_template_stats(templates.stats())
+        # After the material loop, so nodedef selection counters include this export.
+        diagnostics.set_manifest_stats(get_manifest_registry().stats())
+
+    if material_cache is not None:
+        material_cache.prune()
+        if diagnostics:
+            diagnostics.set_material_cache_stats(material_cache.stats())
+
+
+def _open_material_library(stage, settings, diagnostics=None):
+    """Open the sidecar material library when enabled and the stage is on disk."""
+    if not getattr(settings, "use_material_library", False):
+        return None
+    usd_path = stage.GetRootLayer().realPath
+    if not usd_path:
+        return None
+    try:
+        return MaterialLibrary(
+            material_library_path(usd_path, settings),
+            salt=get_manifest_registry().fingerprint() or "",
+        )
+    except Exception as e:
+        if diagnostics:
+            diagnostics.add_warning(f"Material library unavailable, authoring materials inline: {e}")
+        return None
+
+
+def _graph_fingerprint(graph: Dict[str, Any]) -> str:
+    """Hash a built graph payload; structurally identical materials hash the same."""
+    payload = json.dumps(graph, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _remove_unbound_materials(stage, material_paths, index=None) -> None:
+    """Remove deduplicated material prims that nothing binds to any more.
+
+    Direct and collection bindings of every purpose count as uses.
+    """
+    if index is not None:
+        prims = (stage.GetPrimAtPath(path) for path in index.paths())
+    else:
+        prims = stage.Traverse()
+    purposes = (UsdShade.Tokens.allPurpose, UsdShade.Tokens.preview, UsdShade.Tokens.full)
+    still_bound = set()
+    for prim in prims:
+        if not prim.HasAPI(UsdShade.MaterialBindingAPI):
+            continue
+        binding_api = UsdShade.MaterialBindingAPI(prim)
+        for purpose in purposes:
+            binding_rel = binding_api.GetDirectBindingRel(purpose)
+            if binding_rel:
+                still_bound.update(str(target) for target in binding_rel.GetTargets())
+            for collection_rel in binding_api.GetCollectionBindingRels(purpose):
+                binding = UsdShade.MaterialBindingAPI.CollectionBinding(collection_rel)
+                still_bound.add(str(binding.GetMaterialPath()))
+    for path in sorted(material_paths - still_bound):
+        stage.RemovePrim(path)
+
+
+def _build_material_graph(builder, material_data, force_unlit: bool):
+    """Build the MaterialX graph payload for extracted material data."""
+    builder.begin_material()
+    if force_unlit and material_data['type'] in {'principled', 'emission', 'simple'}:
+        return builder.build_unlit_material(material_data)
+    if material_data['type'] == 'principled':
+        return builder.build_pbr_material(material_data)
+    if material_data['type'] in ['emission', 'simple']:
+        return builder.build_unlit_material(material_data)
+    if material_data['type'] == 'rk_graph':
+        return builder.build_rk_graph(material_data.get('rk_graph'))
+    if material_data['type'] == 'rk_group':
+        return builder.build_rk_material(
+            material_data.get('rk_node_id'),
+            material_data.get('rk_inputs', {})
+        )
+    return None
@@ -0,0 +1,290 @@
+"""
+Topology templates for MaterialX material authoring.
+
+Most materials in a scene share a handful of graph shapes (e.g. Principled
+with base color, normal and ORM textures) and differ only in constant input
+values and texture files. `MaterialTemplates.author()` keys each graph by its
+topology: the payload with constant node inputs reduced to their type/shape
+and texture paths reduced to their sharing pattern and extension. The first
+graph of a topology is authored once into a private layer with placeholder
+texture paths; every material of that topology (including the first) is then
+instantiated with `Sdf.CopySpec` and only its constants, texture paths and
+connection targets are patched.
+
+Diagnostics reported while authoring a template are recorded and replayed for
+each instance with its own material name and texture paths. Graphs that fail to
+author, and target materials that already have children with the template's
+shader names, go through `create_materialx_material()` as before.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..usd_utils import Sdf, Usd, UsdShade
+from .author import create_materialx_material
+from .conversions import _coerce_value_to_input_type, _set_shader_input_value
+from .helpers import (
+    ChildNameIndex,
+    _assign_graph_node_names,
+    _collect_connected_inputs,
+    _get_input_def,
+    _get_node_def,
+)
+
+
+TEMPLATE_ROOT = "/MaterialTemplates"
+_MATERIAL_PLACEHOLDER = "@template_material"
+_TEXTURE_PLACEHOLDER = "@template_texture_{index}{suffix}"
+
+
+class _DiagnosticsRecorder:
+    """Diagnostics stand-in that records calls for replay per instance."""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str):
+        def record(*args):
+            self.calls.append((name, args))
+        return record
+
+    def replay(self, diagnostics, material_name: str, texture_paths: List[str]) -> None:
+        for name, args in self.calls:
+            getattr(diagnostics, name)(*(_fill_placeholders(arg, material_name, texture_paths) for arg in args))
+
+
+class _Template:
+    """An authored material network plus the slots patched per instance."""
+
+    def __init__(self, path, children, properties, connections, textures, constants, diagnostics):
+        self.path = path
+        self.children: List[str] = children
+        self.properties: List[str] = properties
+        self.connections: List[Tuple[Any, List[Any]]] = connections
+        self.textures: List[Tuple[Any, int]] = textures
+        self.constants: List[Tuple[Any, str, str, Optional[Dict[str, Any]]]] = constants
+        self.diagnostics: _DiagnosticsRecorder = diagnostics
+
+
+class MaterialTemplates:
+    """Per-export cache of material templates keyed by graph topology."""
+
+    def __init__(self):
+        self.layer = Sdf.Layer.CreateAnonymous("material_templates.usda")
+        self.stage = Usd.Stage.Open(self.layer)
+        self._templates: Dict[str, Optional[_Template]] = {}
+        self._stats: Dict[str, Any] = {"templates": 0, "instances": 0, "authored": 0}
+
+    def author(
+        self,
+        stage,
+        material_path: str,
+        material_name: str,
+        graph: Dict[str, Any],
+        manifest: Dict[str, Any],
+        diagnostics=None,
+    ):
+        """Author a MaterialX material, instantiating a template when possible.
+
+        Same contract as `create_materialx_material()`.
+        """
+        key, texture_paths = _topology(graph)
+        if key not in self._templates:
+            self._templates[key] = self._record(graph, manifest)
+        template = self._templates[key]
+        if template is not None and self._instantiate(stage, template, material_path, graph, texture_paths):
+            self._stats["instances"] += 1
+            if diagnostics:
+                template.diagnostics.replay(diagnostics, material_name, texture_paths)
+            return UsdShade.Material(stage.GetPrimAtPath(material_path))
+
+        self._stats["authored"] += 1
+        return create_materialx_material(stage, material_path, material_name, graph, manifest, diagnostics)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return template/instance counters for diagnostics."""
+        return dict(self._stats)
+
+    def _record(self, graph: Dict[str, Any], manifest: Dict[str, Any]):
+        path = Sdf.Path(f"{TEMPLATE_ROOT}/T_{len(self._templates)}")
+        nodes = graph.get("nodes", [])
+        name_map = _assign_graph_node_names(ChildNameIndex(self.stage, str(path)), nodes)
+        recorder = _DiagnosticsRecorder()
+        try:
+            create_materialx_material(
+                self.stage, str(path), _MATERIAL_PLACEHOLDER, _with_placeholders(graph), manifest, recorder
+            )
+        except Exception:
+            return None
+
+        spec = self.layer.GetPrimAtPath(path)
+        placeholders = {
+            _TEXTURE_PLACEHOLDER.format(index=index, suffix=_suffix(texture)): index
+            for index, texture in enumerate(_texture_paths(graph))
+        }
+        connections = []
+        textures = []
+        for attr_spec in _attribute_specs(spec):
+            targets = list(attr_spec.connectionPathList.explicitItems)
+            if targets:
+                connections.append((attr_spec.path, targets))
+            value = attr_spec.default
+            value = value.path if isinstance(value, Sdf.AssetPath) else value
+            if isinstance(value, str) and value in placeholders:
+                textures.append((attr_spec.path, placeholders[value]))
+
+        constants = []
+        connected_inputs = _collect_connected_inputs(graph.get("connections", []))
+        for node in nodes:
+            node_name = node.get("name")
+            node_id = node.get("node_id")
+            if not node_name or not node_id:
+                continue
+            for input_name, input_value in node.get("inputs", {}).items():
+                if isinstance(input_value, dict) or input_name in connected_inputs.get(node_name, set()):
+                    continue
+                attr_path = path.AppendChild(name_map.get(node_name, node_name)).AppendProperty(f"inputs:{input_name}")
+                if not self.layer.GetAttributeAtPath(attr_path):
+                    return None
+                input_def = _get_input_def(_get_node_def(manifest, node_id), input_name)
+                constants.append((attr_path, node_name, input_name, input_def))
+
+        self._stats["templates"] += 1
+        return _Template(
+            path,
+            list(spec.nameChildren.keys()),
+            list(spec.properties.keys()),
+            connections,
+            textures,
+            constants,
+            recorder,
+        )
+
+    def _instantiate(self, stage, template: _Template, material_path: str, graph, texture_paths) -> bool:
+        layer = stage.GetEditTarget().GetLayer()
+        target = Sdf.Path(material_path)
+        existing = set()
+        target_spec = layer.GetPrimAtPath(target)
+        if target_spec:
+            existing.update(target_spec.nameChildren.keys())
+        target_prim = stage.GetPrimAtPath(target)
+        if target_prim:
+            existing.update(target_prim.GetAllChildrenNames())
+        if not existing.isdisjoint(template.children):
+            return False
+
+        source = template.path
+        values = {
+            (node.get("name"), input_name): input_value
+            for node in graph.get("nodes", [])
+            for input_name, input_value in node.get("inputs", {}).items()
+        }
+        stage.DefinePrim(material_path, "Material")
+        with Sdf.ChangeBlock():
+            if not layer.GetPrimAtPath(target):
+                Sdf.CreatePrimInLayer(layer, target)
+            for child in template.children:
+                Sdf.CopySpec(self.layer, source.AppendChild(child), layer, target.AppendChild(child))
+            for prop in template.properties:
+                Sdf.CopySpec(self.layer, source.AppendProperty(prop), layer, target.AppendProperty(prop))
+            for attr_path, targets in template.connections:
+                attr_spec = layer.GetAttributeAtPath(attr_path.ReplacePrefix(source, target))
+                attr_spec.connectionPathList.explicitItems = [
+                    item.ReplacePrefix(source, target) for item in targets
+                ]
+            for attr_path, index in template.textures:
+                layer.GetAttributeAtPath(attr_path.ReplacePrefix(source, target)).default = texture_paths[index]
+            for attr_path, node_name, input_name, input_def in template.constants:
+                attr = _SpecValue(layer.GetAttributeAtPath(attr_path.ReplacePrefix(source, target)))
+                value = _coerce_value_to_input_type(values[(node_name, input_name)], input_def)
+                _set_shader_input_value(attr, value)
+        return True
+
+
+class _SpecValue:
+    """Attribute spec with the `Set()` that `_set_shader_input_value` calls."""
+
+    def __init__(self, spec):
+        self._spec = spec
+
+    def Set(self, value: Any) -> bool:
+        self._spec.default = value
+        return True
+
+
+def _topology(graph: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """Return the topology key for a graph and its distinct texture paths in order."""
+    texture_paths = _texture_paths(graph)
+    indices = {texture: index for index, texture in enumerate(texture_paths)}
+    nodes = []
+    for node in graph.get("nodes", []):
+        inputs = {}
+        for input_name, input_value in node.get("inputs", {}).items():
+            if isinstance(input_value, dict):
+                texture = input_value.get("path")
+                if texture:
+                    input_value = dict(input_value, path=(indices[texture], _suffix(texture)))
+                inputs[input_name] = input_value
+            else:
+                inputs[input_name] = _value_shape(input_value)
+        nodes.append(dict(node, inputs=inputs))
+    payload = json.dumps(dict(graph, nodes=nodes), sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest(), texture_paths
+
+
+def _texture_paths(graph: Dict[str, Any]) -> List[str]:
+    paths: List[str] = []
+    for node in graph.get("nodes", []):
+        for input_value in node.get("inputs", {}).values():
+            if isinstance(input_value, dict):
+                texture = input_value.get("path")
+                if texture and texture not in paths:
+                    paths.append(texture)
+    return paths
+
+
+def _with_placeholders(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `graph` with each distinct texture path replaced by a placeholder."""
+    indices = {texture: index for index, texture in enumerate(_texture_paths(graph))}
+    nodes = []
+    for node in graph.get("nodes", []):
+        inputs = {}
+        for input_name, input_value in node.get("inputs", {}).items():
+            if isinstance(input_value, dict) and input_value.get("path"):
+                texture = input_value["path"]
+                placeholder = _TEXTURE_PLACEHOLDER.format(index=indices[texture], suffix=_suffix(texture))
+                input_value = dict(input_value, path=placeholder)
+            inputs[input_name] = input_value
+        nodes.append(dict(node, inputs=inputs))
+    return dict(graph, nodes=nodes)
+
+
+def _fill_placeholders(value: Any, material_name: str, texture_paths: List[str]) -> Any:
+    if not isinstance(value, str) or "@template_" not in value:
+        return value
+    # Highest index first so "@template_texture_1" never matches inside "..._10".
+    for index in reversed(range(len(texture_paths))):
+        texture = texture_paths[index]
+        value = value.replace(_TEXTURE_PLACEHOLDER.format(index=index, suffix=_suffix(texture)), texture)
+    return value.replace(_MATERIAL_PLACEHOLDER, material_name)
+
+
+def _suffix(texture: str) -> str:
+    # The extension picks KTX-only nodedefs, so it is part of the topology.
+    return os.path.splitext(str(texture))[1]
+
+
+def _value_shape(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_value_shape(item) for item in value]
+    return type(value).__name__
+
+
+def _attribute_specs(prim_spec):
+    stack = [prim_spec]
+    while stack:
+        spec = stack.pop()
+        yield from spec.attributes
+        stack.extend(spec.nameChildren)
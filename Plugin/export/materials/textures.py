@@ -11,26 +11,27 @@ from ...manifest.materialx_nodes import (
     select_nodedef_name_for_node,
 )
 from .conversions import _map_mtlx_type_to_sdf, _create_convert_output
-from .helpers import _image_shader_name, _sanitize_name
+from .helpers import ChildNameIndex, _image_shader_name, _sanitize_name
+
+
+def _mapping_key(mapping: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """Build a hashable key for a UV mapping transform."""
+    mapping = mapping or {}
+    return (
+        tuple(mapping.get("offset") or (0.0, 0.0)),
+        tuple(mapping.get("scale") or (1.0, 1.0)),
+        float(mapping.get("rotate") or 0.0),
+        tuple(mapping.get("pivot") or (0.0, 0.0)),
+        mapping.get("operationorder"),
+    )
 
 
 def _texture_cache_key(texture_spec: Dict[str, Any]) -> Tuple[Any, ...]:
     """Build a stable cache key for shared texture nodes."""
-    mapping = texture_spec.get("mapping") or {}
-    offset = tuple(mapping.get("offset") or (0.0, 0.0))
-    scale = tuple(mapping.get("scale") or (1.0, 1.0))
-    rotate = float(mapping.get("rotate") or 0.0)
-    pivot = tuple(mapping.get("pivot") or (0.0, 0.0))
-    operationorder = mapping.get("operationorder")
-
     return (
         texture_spec.get("path"),
         texture_spec.get("texcoord"),
-        offset,
-        scale,
-        rotate,
-        pivot,
-        operationorder,
+        *_mapping_key(texture_spec.get("mapping")),
         texture_spec.get("colorspace"),
         texture_spec.get("alpha_mode"),
         texture_spec.get("type"),
@@ -82,8 +83,14 @@ def _create_texture_connection(
     material_name: str,
     texture_cache: Optional[Dict[Any, Dict[str, Any]]] = None,
     diagnostics=None,
+    coordinate_cache: Optional[Dict[Any, Any]] = None,
+    names: Optional[ChildNameIndex] = None,
 ):
-    """Create texture nodes and return the output to connect."""
+    """Create texture nodes and return the output to connect.
+
+    `coordinate_cache` (per material) shares texcoord/place2d nodes between
+    image nodes that sample the same UV set with the same mapping.
+    """
     texture_path = texture_spec.get('path')
     if not texture_path:
         return None
@@ -92,7 +99,9 @@ def _create_texture_connection(
     desired_type = (output_type or 'color3').lower()
     channel = (texture_spec.get('channel') or '').lower()
     texture_kind = texture_spec.get('type') or 'texture'
-    node_base = _image_shader_name(stage, nodegraph_path, input_name)
+    if names is None:
+        names = ChildNameIndex(stage, nodegraph_path)
+    node_base = _image_shader_name(names, input_name)
 
     cache_key = _texture_cache_key(texture_spec)
     if texture_cache is not None:
@@ -113,6 +122,7 @@ def _create_texture_connection(
                     texture_kind,
                     bool(texture_spec.get("force_separate4")),
                     diagnostics,
+                    names,
                 )
                 scale = texture_spec.get('scale')
                 if scale is not None and texture_output:
@@ -161,44 +171,19 @@ def _create_texture_connection(
     file_input = texture_shader.CreateInput("file", Sdf.ValueTypeNames.Asset)
     file_input.Set(texture_path)
 
-    texcoord_name = texture_spec.get('texcoord')
-    mapping = texture_spec.get('mapping')
-    texcoord_output = None
-    if texcoord_name:
-        texcoord_output = _create_geomprop_texcoord(
-            manifest,
-            stage,
-            nodegraph_path,
-            input_name,
-            texcoord_name,
-            diagnostics,
-        )
-    elif mapping:
-        texcoord_output = _create_geomprop_texcoord(
-            manifest,
-            stage,
-            nodegraph_path,
-            input_name,
-            "UV0",
-            diagnostics,
-        )
-
-    if mapping:
-        place2d_output = _create_place2d_node(
-            manifest,
-            stage,
-            nodegraph_path,
-            input_name,
-            mapping,
-            texcoord_output,
-            diagnostics,
-        )
-        if place2d_output:
-            texcoord_input = texture_shader.CreateInput("texcoord", Sdf.ValueTypeNames.Float2)
-            texcoord_input.ConnectToSource(place2d_output)
-    elif texcoord_output:
+    coordinate_output = _texture_coordinate_output(
+        manifest,
+        stage,
+        nodegraph_path,
+        input_name,
+        texture_spec.get('texcoord'),
+        texture_spec.get('mapping'),
+        coordinate_cache,
+        diagnostics,
+    )
+    if coordinate_output:
         texcoord_input = texture_shader.CreateInput("texcoord", Sdf.ValueTypeNames.Float2)
-        texcoord_input.ConnectToSource(texcoord_output)
+        texcoord_input.ConnectToSource(coordinate_output)
 
     texture_output = texture_shader.CreateOutput("out", output_sdf_type)
 
@@ -220,6 +205,7 @@ def _create_texture_connection(
                 current_type,
                 'vector3',
                 diagnostics,
+                names,
             )
             current_type = 'vector3'
 
@@ -266,6 +252,7 @@ def _create_texture_connection(
         texture_kind,
         bool(texture_spec.get("force_separate4")),
         diagnostics,
+        names,
     )
 
     scale = texture_spec.get('scale')
@@ -298,6 +285,53 @@ def _texture_node_id_from_nodedef(nodedef_name: str) -> str:
     return base
 
 
+def _texture_coordinate_output(
+    manifest: Dict[str, Any],
+    stage,
+    nodegraph_path: str,
+    input_name: str,
+    texcoord_name: Optional[str],
+    mapping: Optional[Dict[str, Any]],
+    coordinate_cache: Optional[Dict[Any, Any]] = None,
+    diagnostics=None,
+):
+    """Return the texcoord (or place2d) output an image node should read, if any.
+
+    Outputs are cached per (texcoord name, mapping), so image nodes sampling the
+    same UV set with the same transform share one texcoord/place2d pair.
+    """
+    if not texcoord_name and not mapping:
+        return None
+    uv_name = (texcoord_name or "").strip() or "UV0"
+    cache_key = ("UV0" if uv_name.upper() == "UV0" else uv_name, _mapping_key(mapping) if mapping else None)
+    if coordinate_cache is not None and cache_key in coordinate_cache:
+        return coordinate_cache[cache_key]
+
+    texcoord_output = _create_geomprop_texcoord(
+        manifest,
+        stage,
+        nodegraph_path,
+        input_name,
+        texcoord_name or "UV0",
+        diagnostics,
+    )
+    output = texcoord_output
+    if mapping:
+        output = _create_place2d_node(
+            manifest,
+            stage,
+            nodegraph_path,
+            input_name,
+            mapping,
+            texcoord_output,
+            diagnostics,
+        )
+
+    if coordinate_cache is not None:
+        coordinate_cache[cache_key] = output
+    return output
+
+
 def _create_geomprop_texcoord(
     manifest: Dict[str, Any],
     stage,
@@ -561,6 +595,7 @@ def _resolve_texture_output(
     texture_kind: str,
     force_separate4: bool,
     diagnostics=None,
+    names: Optional[ChildNameIndex] = None,
 ):
     """Resolve texture output conversions including RGBA separation."""
     if not texture_output:
@@ -641,6 +676,7 @@ def _resolve_texture_output(
             current_type,
             desired_type,
             diagnostics,
+            names,
         )
         current_type = desired_type
 
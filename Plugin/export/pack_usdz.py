@@ -1,15 +1,22 @@
 """
 USDZ packager
 
-Creates USDZ files as stored (uncompressed) ZIP archives.
+Creates USDZ files as stored (uncompressed) ZIP archives. The Python fallback
+streams each entry through `UsdzWriter`, which pads local file headers so
+every entry's data starts on a 64-byte boundary, as the USDZ spec requires for
+memory-mapping the archive in place.
 """
 
 import os
+import struct
 import zipfile
 from pathlib import Path
 from typing import Optional, List
 
 from .. import prefs as addon_prefs
+from .materials.library import material_library_path
+from .usd_asset_paths import stage_dependencies
+from .usd_utils import Usd, require_pxr
 
 def create_usdz(usd_path: str, output_path: str, settings, context, diagnostics=None):
     """Create USDZ file from USD stage
@@ -28,19 +35,19 @@ def create_usdz(usd_path: str, output_path: str, settings, context, diagnostics=
     
     if usdzip_path and os.path.exists(usdzip_path):
         # Use external tool
-        create_usdz_with_tool(usd_path, output_path, usdzip_path)
+        create_usdz_with_tool(usd_path, output_path, usdzip_path, _sidecar_layers(usd_path, settings))
     else:
         # Use Python fallback
         create_usdz_python(usd_path, output_path, settings, diagnostics)
 
 
-def create_usdz_with_tool(usd_path: str, output_path: str, usdzip_path: str):
+def create_usdz_with_tool(usd_path: str, output_path: str, usdzip_path: str, extra_files: Optional[List[str]] = None):
     """Create USDZ using external usdzip tool"""
     import subprocess
     
     try:
         result = subprocess.run(
-            [usdzip_path, output_path, usd_path],
+            [usdzip_path, output_path, usd_path, *(extra_files or [])],
             capture_output=True,
             text=True,
             check=True
@@ -52,8 +59,56 @@ def create_usdz_with_tool(usd_path: str, output_path: str, usdzip_path: str):
         raise RuntimeError(f"Failed to run usdzip: {e}") from e
 
 
+USDZ_ALIGNMENT = 64
+# Extra field ID used for alignment padding, as written by USD's own zip writer.
+_PADDING_HEADER_ID = 0x1986
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class UsdzWriter:
+    """Stored ZIP writer that aligns every entry's data to `USDZ_ALIGNMENT` bytes.
+
+    Entries are streamed from disk in fixed-size chunks, so memory use does not
+    grow with file size; `zipfile` updates the CRC32 per chunk.
+    """
+
+    def __init__(self, path: str):
+        self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED)
+
+    def __enter__(self) -> "UsdzWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def add_file(self, source_path: str, arcname: str) -> None:
+        """Stream `source_path` into the archive as `arcname`."""
+        zinfo = zipfile.ZipInfo.from_file(source_path, Path(arcname).as_posix())
+        zinfo.compress_type = zipfile.ZIP_STORED
+        # Same rule `zipfile` applies when it writes the local header.
+        zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        # Header fields `zipfile` resets before writing; CRC and size are patched after.
+        zinfo.flag_bits = 0
+        zinfo.CRC = 0
+        zinfo.compress_size = 0
+        zinfo.extra = b""
+        header_size = len(zinfo.FileHeader(zip64)) + 4
+        padding = -(self._zip.fp.tell() + header_size) % USDZ_ALIGNMENT
+        zinfo.extra = struct.pack("<HH", _PADDING_HEADER_ID, padding) + bytes(padding)
+
+        with open(source_path, "rb") as source, self._zip.open(zinfo, "w", force_zip64=zip64) as dest:
+            while True:
+                chunk = source.read(_COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                dest.write(chunk)
+
+
 def create_usdz_python(usd_path: str, output_path: str, settings, diagnostics=None):
-    """Create USDZ using Python ZIP (stored, uncompressed)"""
+    """Create USDZ by streaming stored, 64-byte-aligned entries"""
     usd_file = Path(usd_path)
     usd_dir = usd_file.parent
     
@@ -61,31 +116,33 @@ def create_usdz_python(usd_path: str, output_path: str, settings, diagnostics=No
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Create ZIP archive with no compression (stored)
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_STORED) as usdz:
-        # Add main USD file at root
-        usd_arcname = usd_file.name
-        usdz.write(usd_path, usd_arcname)
-        
-        # Add textures directory if it exists
-        textures_dir = usd_dir / "textures"
-        if textures_dir.exists():
-            for texture_file in textures_dir.rglob("*"):
-                if texture_file.is_file():
-                    # Preserve relative path structure
-                    arcname = texture_file.relative_to(usd_dir)
-                    usdz.write(str(texture_file), str(arcname))
-
-        # Add staged assets directory if it exists
-        assets_dir = usd_dir / "assets"
-        if assets_dir.exists():
-            for asset_file in assets_dir.rglob("*"):
-                if asset_file.is_file():
-                    arcname = asset_file.relative_to(usd_dir)
-                    usdz.write(str(asset_file), str(arcname))
-        
-        # Add any other referenced assets
-        # (This is a simplified implementation - full version would parse USD for all asset references)
+    # Pack exactly what the final stage references (sidecar layers, staged
+    # textures and assets), not whatever earlier exports left in the folder.
+    require_pxr()
+    stage = Usd.Stage.Open(str(usd_file), Usd.Stage.LoadAll)
+    if not stage:
+        raise RuntimeError(f"Failed to open USD stage: {usd_path}")
+    layer_files, asset_files = stage_dependencies(stage)
+    del stage
+
+    with UsdzWriter(output_path) as usdz:
+        # The root layer comes first; it is the post-processed crate itself.
+        usdz.add_file(usd_path, usd_file.name)
+
+        packed = set()
+        for file_path in layer_files[1:] + asset_files:
+            file_path = os.path.normpath(file_path)
+            if file_path in packed:
+                continue
+            packed.add(file_path)
+            try:
+                arcname = Path(file_path).resolve().relative_to(usd_dir.resolve())
+            except ValueError:
+                # Package-relative paths cannot point outside the archive.
+                if diagnostics:
+                    diagnostics.add_warning(f"USDZ dependency outside the export folder not packed: {file_path}")
+                continue
+            usdz.add_file(file_path, str(arcname))
     
     print(f"USDZ created: {output_path}")
     
@@ -93,6 +150,14 @@ def create_usdz_python(usd_path: str, output_path: str, settings, diagnostics=No
         diagnostics.add_warning("USDZ packaged using Python fallback (stored ZIP)")
 
 
+def _sidecar_layers(usd_path: str, settings) -> List[str]:
+    """Return sidecar layers next to the USD file that the scene references."""
+    if not getattr(settings, "use_material_library", False):
+        return []
+    library_path = material_library_path(usd_path, settings)
+    return [str(library_path)] if library_path.is_file() else []
+
+
 def validate_usdz(usdz_path: str) -> bool:
     """Validate USDZ file structure
     
@@ -4,32 +4,101 @@ USD post-processing pipeline for RealityKit compatibility.
 Runs scene normalization, material rewriting, and texture preparation.
 """
 
-from .materials.rewrite import rewrite_materials
-from .usd_animation_library import author_animation_library
-from .usd_scene import normalize_scene
+import os
+from typing import Optional
+
+from .materials.library import material_library_path
+from .materials.rewrite import MESH_PRIM_TYPES, rewrite_materials
+from .usd_asset_paths import rebase_relative_asset_paths, scan_asset_paths
+from .usd_animation_library import SKEL_PRIM_TYPES, author_animation_library
+from .usd_passes import PostProcessPass, run_passes
+from .usd_scene import SCENE_PRIM_TYPES, normalize_scene
 from .usd_textures import prepare_textures
 from .usd_assets import prepare_assets
-from .usd_utils import Usd, require_pxr
+from .usd_utils import Sdf, Usd, require_pxr
+
+
+def process_usd_stage(
+    usd_path: str,
+    settings,
+    context,
+    diagnostics=None,
+    output_path: Optional[str] = None,
+) -> None:
+    """Post-process a USD stage for RealityKit compatibility.
 
+    The passes share one `StageIndex`, so the stage is traversed once; texture
+    and asset staging read asset paths from the layers instead.
 
-def process_usd_stage(usd_path: str, settings, context, diagnostics=None) -> None:
-    """Post-process a USD stage for RealityKit compatibility."""
+    With `output_path`, the stage is processed as if it lived there (textures,
+    assets and the material library are staged next to it) and written there
+    once, in the format of its extension, instead of saving `usd_path`.
+    """
     require_pxr()
 
-    stage = Usd.Stage.Open(usd_path, Usd.Stage.LoadAll)
+    layer = Sdf.Layer.FindOrOpen(usd_path)
+    if not layer:
+        raise RuntimeError(f"Failed to open USD stage: {usd_path}")
+    if output_path and os.path.abspath(output_path) != os.path.abspath(usd_path):
+        rebase_relative_asset_paths(layer, os.path.dirname(usd_path), os.path.dirname(output_path))
+        # Anchor the layer at the output path; it keeps its crate-backed data.
+        layer.identifier = os.path.abspath(output_path)
+    else:
+        output_path = None
+
+    stage = Usd.Stage.Open(layer, Usd.Stage.LoadAll)
     if not stage:
         raise RuntimeError(f"Failed to open USD stage: {usd_path}")
 
-    normalize_scene(stage, settings)
+    run_passes(stage, [
+        PostProcessPass(
+            "normalize_scene",
+            lambda stage, index: normalize_scene(stage, settings, index),
+            prim_types=SCENE_PRIM_TYPES,
+        ),
+        PostProcessPass(
+            "rewrite_materials",
+            lambda stage, index: rewrite_materials(stage, settings, context, diagnostics, index),
+            prim_types=MESH_PRIM_TYPES,
+        ),
+        PostProcessPass(
+            "author_animation_library",
+            lambda stage, index: author_animation_library(stage, settings, diagnostics, index),
+            prim_types=SKEL_PRIM_TYPES,
+            xform_samples=True,
+        ),
+        PostProcessPass(
+            "prepare_textures_and_assets",
+            lambda stage, index: _prepare_textures_and_assets(stage, output_path or usd_path, settings, diagnostics),
+        ),
+    ])
 
-    rewrite_materials(stage, settings, context, diagnostics)
+    if output_path:
+        if not layer.Export(output_path):
+            raise RuntimeError(f"Failed to write USD file: {output_path}")
+    else:
+        stage.Save()
 
-    author_animation_library(stage, settings, diagnostics)
+    if diagnostics:
+        diagnostics.add_warning("USD stage post-processed for RealityKit compatibility")
 
-    prepare_textures(stage, usd_path, settings, diagnostics)
-    prepare_assets(stage, usd_path, diagnostics)
 
-    stage.Save()
+def _prepare_textures_and_assets(stage, usd_path: str, settings, diagnostics=None) -> None:
+    # One layer scan serves both steps. The material library gets the staged
+    # paths written into it rather than root-layer overrides.
+    library_layer = _material_library_layer(stage, usd_path, settings)
+    scan = scan_asset_paths(stage, [library_layer] if library_layer else ())
+    prepare_textures(stage, usd_path, settings, diagnostics, scan)
+    prepare_assets(stage, usd_path, diagnostics, scan)
+    if library_layer is not None and library_layer.dirty:
+        library_layer.Save()
 
-    if diagnostics:
-        diagnostics.add_warning("USD stage post-processed for RealityKit compatibility")
+
+def _material_library_layer(stage, usd_path: str, settings):
+    """Return the sidecar material library layer if the stage composes it."""
+    if not getattr(settings, "use_material_library", False):
+        return None
+    layer = Sdf.Layer.Find(str(material_library_path(usd_path, settings)))
+    if layer is None or layer not in stage.GetUsedLayers():
+        return None
+    return layer
@@ -8,15 +8,19 @@ export-time animation schedule recorded in diagnostics.
 
 from __future__ import annotations
 
+from .usd_passes import StageIndex
 from .usd_utils import Sdf
 
 
+# Prim types whose presence means the stage carries UsdSkel animation.
+SKEL_PRIM_TYPES = ("SkelAnimation", "Skeleton", "SkelRoot")
+
 DEFAULT_SOURCE_ANIMATION_NAME = "default subtree animation"
 DEFAULT_TRANSFORM_ANIMATION_NAME = "transform animation"
 DEFAULT_SCENE_ANIMATION_NAME = "default scene animation"
 
 
-def author_animation_library(stage, settings, diagnostics=None) -> None:
+def author_animation_library(stage, settings, diagnostics=None, index=None) -> None:
     """Author a minimal RCP AnimationLibrary with clip start times."""
     if not bool(getattr(settings, "export_animation", False)):
         return
@@ -63,7 +67,11 @@ def author_animation_library(stage, settings, diagnostics=None) -> None:
     lib_prim = stage.DefinePrim(str(lib_path), "RealityKitComponent")
     _set_uniform_attr(lib_prim, "info:id", Sdf.ValueTypeNames.Token, "RealityKit.AnimationLibrary")
 
-    source_names = _pick_source_animation_names(stage)
+    if index is None:
+        with StageIndex(stage, SKEL_PRIM_TYPES, xform_samples=True) as index:
+            source_names = _pick_source_animation_names(index)
+    else:
+        source_names = _pick_source_animation_names(index)
     primary_source = source_names[0] if source_names else DEFAULT_SOURCE_ANIMATION_NAME
 
     for source_name in source_names:
@@ -106,7 +114,7 @@ def _set_uniform_attr(prim, name: str, type_name, value):
     attr.Set(value)
 
 
-def _pick_source_animation_name(stage) -> str:
+def _pick_source_animation_name(index) -> str:
     """
     Reality Composer Pro presents different animation "sources" depending on how
     the USD encodes animation.
@@ -117,9 +125,9 @@ def _pick_source_animation_name(stage) -> str:
     - Else fall back to "default subtree animation" (and let RCP decide).
     """
     try:
-        if _stage_contains_prim_type(stage, {"SkelAnimation", "Skeleton", "SkelRoot"}):
+        if index.has_prims(SKEL_PRIM_TYPES):
             return DEFAULT_SOURCE_ANIMATION_NAME
-        if _stage_has_timesampled_xform_ops(stage):
+        if index.has_animated_xform_ops():
             return DEFAULT_TRANSFORM_ANIMATION_NAME
     except Exception:
         # If inspection fails for any reason, keep previous default.
@@ -127,7 +135,7 @@ def _pick_source_animation_name(stage) -> str:
     return DEFAULT_SOURCE_ANIMATION_NAME
 
 
-def _pick_source_animation_names(stage) -> list[str]:
+def _pick_source_animation_names(index) -> list[str]:
     """
     Return a prioritized list of possible Reality Composer Pro animation source names.
 
@@ -136,7 +144,7 @@ def _pick_source_animation_names(stage) -> list[str]:
     doesn't match what RCP generated, we author multiple clip definitions (same
     clip names/start times) keyed to likely sources.
     """
-    primary = _pick_source_animation_name(stage)
+    primary = _pick_source_animation_name(index)
     out: list[str] = []
 
     def add(name: str) -> None:
@@ -150,7 +158,7 @@ def _pick_source_animation_names(stage) -> list[str]:
 
     # For transform-only exports, RCP often exposes "transform animation".
     try:
-        if _stage_has_timesampled_xform_ops(stage):
+        if index.has_animated_xform_ops():
             add(DEFAULT_TRANSFORM_ANIMATION_NAME)
     except Exception:
         pass
@@ -168,33 +176,6 @@ def _clip_definition_name(source_animation_name: str) -> str:
     return f"Clip_{safe}"
 
 
-def _stage_contains_prim_type(stage, type_names: set[str]) -> bool:
-    for prim in stage.Traverse():
-        if prim.GetTypeName() in type_names:
-            return True
-    return False
-
-
-def _stage_has_timesampled_xform_ops(stage) -> bool:
-    for prim in stage.Traverse():
-        for attr in prim.GetAttributes():
-            name = attr.GetName()
-            if not name.startswith("xformOp:"):
-                continue
-            # ValueMightBeTimeVarying() is cheap and avoids querying samples for constants.
-            try:
-                if attr.ValueMightBeTimeVarying():
-                    return True
-            except Exception:
-                # Fall back to counting samples if the USD API wrapper doesn't expose it.
-                try:
-                    if attr.GetNumTimeSamples() > 0:
-                        return True
-                except Exception:
-                    continue
-    return False
-
-
 def _ensure_default_prim(stage):
     """Pick a stable default prim if the stage doesn't define one."""
     try:
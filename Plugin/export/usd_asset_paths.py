@@ -0,0 +1,299 @@
+"""
+Layer-level asset path scanning and rewriting.
+
+`scan_asset_paths()` reads asset paths straight from the stage's layers with
+`UsdUtils.ModifyAssetPaths`, which walks the layer specs in C++ and calls back
+only for asset values: attribute defaults, time samples and `asset[]` array
+elements. A stage without asset-valued attributes (e.g. meshes only) never
+calls into Python per attribute and never queries the composed stage.
+
+Each scanned path is anchored to the layer it is relative to
+(`AssetPathScan.anchored_paths`): the root layer for the root and editable
+layers, otherwise the sublayer or referenced layer that authors it. The same
+relative string can mean different files in different layers.
+
+`AssetPathScan.rewrite()` applies an old -> new path mapping in one change
+block. Keys are a path (rewritten wherever it is authored) or an
+`(anchor layer, path)` pair (rewritten only where it is anchored to that layer):
+
+- The root layer is rewritten in place, so every prim that composes one of its
+  specs (internal references, instances, variants) sees the new path.
+- Layers passed as `editable_layers` (the sidecar material library, which sits
+  beside the root layer) are rewritten in place the same way; the caller saves
+  them.
+- Other layers (sublayers, referenced layers) are never modified. Each composed
+  attribute whose value comes from one of their specs gets an override in the
+  root layer, with time samples mapped through the arc's layer offset.
+
+Sublayer, reference and payload asset paths are composition arcs, not asset
+values, and are left alone. A scan stays valid across its own rewrites, so one
+scan serves both texture and asset staging.
+
+`stage_dependencies()` lists the layer and asset files a stage composes, for
+packaging exactly what the final stage references.
+
+`rebase_relative_asset_paths()` re-anchors a layer's relative paths (asset
+values and composition arcs alike) when the layer is written to another
+directory.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .usd_utils import Pcp, Sdf, UsdUtils
+
+
+class AssetPathScan:
+    """Asset paths authored in a stage's layers, and where they are composed."""
+
+    def __init__(self, stage, editable_layers: Iterable[Any] = ()):
+        self.stage = stage
+        self.root_layer = stage.GetRootLayer()
+        # Rewritten in place like the root layer; mapped paths are relative to the root layer's directory.
+        self.editable_layers = [layer for layer in editable_layers if layer and layer != self.root_layer]
+        # (source layer, source attribute spec path, stage attribute path, layer offset)
+        self._overrides: List[Tuple[Any, Any, Any, Any]] = []
+        # Other layers -> paths of theirs that some composed attribute resolves to, as scanned.
+        self._external_paths: Dict[Any, Set[str]] = {}
+
+        anchored: Set[Tuple[Any, str]] = {(self.root_layer, path) for path in _layer_asset_paths(self.root_layer)}
+        session_layer = stage.GetSessionLayer()
+        for layer in stage.GetUsedLayers():
+            if layer == self.root_layer or layer == session_layer:
+                continue
+            if layer in self.editable_layers:
+                anchored.update((self.root_layer, path) for path in _layer_asset_paths(layer))
+                continue
+            if _layer_asset_paths(layer):
+                external_paths = self._scan_external_layer(layer)
+                if external_paths:
+                    self._external_paths[layer] = external_paths
+                    anchored.update((layer, path) for path in external_paths)
+        # (anchor layer, path), ordered by path.
+        self.anchored_paths: List[Tuple[Any, str]] = _sorted_anchored(anchored)
+        self.paths: List[str] = sorted({path for _, path in anchored})
+
+    def anchor_directory(self, layer) -> Optional[str]:
+        """Directory `layer`'s relative paths resolve against.
+
+        None for the root layer (and anonymous layers), whose paths are relative
+        to the export directory.
+        """
+        if layer == self.root_layer or layer.anonymous or not layer.realPath:
+            return None
+        return os.path.dirname(layer.realPath)
+
+    def rewrite(self, mapping: Dict[Any, str]) -> None:
+        """Replace every asset path found in `mapping` with its new value.
+
+        Keys are paths or `(anchor layer, path)` pairs. Rewritten paths are
+        authored in the root layer and anchored to it from then on. The scan
+        stays valid afterwards, so texture and asset staging share one.
+        """
+        mapping = {old: new for old, new in mapping.items() if _key_path(old) != new}
+        if not mapping:
+            return
+
+        def mapped(anchor, path: str) -> Optional[str]:
+            return mapping.get((anchor, path), mapping.get(path))
+
+        with Sdf.ChangeBlock():
+            for layer in (self.root_layer, *self.editable_layers):
+                arcs = set(layer.GetCompositionAssetDependencies())
+                UsdUtils.ModifyAssetPaths(
+                    layer,
+                    lambda path, arcs=arcs: path if path in arcs else (mapped(self.root_layer, path) or path),
+                )
+            for layer, spec_path, stage_path, offset in self._overrides:
+                self._author_override(
+                    layer, spec_path, stage_path, offset, lambda path, layer=layer: mapped(layer, path)
+                )
+        anchored = set()
+        for anchor, path in self.anchored_paths:
+            new_path = mapped(anchor, path)
+            anchored.add((anchor, path) if new_path is None else (self.root_layer, new_path))
+        self.anchored_paths = _sorted_anchored(anchored)
+        self.paths = sorted({path for _, path in anchored})
+
+    def _scan_external_layer(self, layer) -> Set[str]:
+        cache = self.stage._GetPcpCache()
+        layer_stacks = cache.FindAllLayerStacksUsingLayer(layer)
+        paths: Set[str] = set()
+        for spec_path in _asset_attribute_spec_paths(layer):
+            targets = set()
+            composed = False
+            for layer_stack in layer_stacks:
+                for dependency in cache.FindSiteDependencies(
+                    layer_stack, spec_path.GetPrimPath(), Pcp.DependencyTypeAnyNonVirtual, False, False, False
+                ):
+                    stage_path = dependency.mapFunc.MapSourceToTarget(spec_path)
+                    if stage_path.isEmpty or stage_path in targets:
+                        continue
+                    targets.add(stage_path)
+                    prim = self.stage.GetPrimAtPath(stage_path.GetPrimPath())
+                    if not self._resolves_from(prim, stage_path.name, layer, spec_path):
+                        continue
+                    composed = True
+                    # Instance proxies cannot be overridden from the root layer.
+                    if not prim.IsInstanceProxy():
+                        self._overrides.append((layer, spec_path, stage_path, dependency.mapFunc.timeOffset))
+            # Values shadowed by a stronger opinion everywhere are not used by the stage.
+            if composed:
+                for _, value in _asset_values(layer, spec_path):
+                    paths.update(_value_paths(value))
+        return paths
+
+    def _resolves_from(self, prim, attr_name: str, layer, spec_path) -> bool:
+        """True if the composed value of `prim`'s attribute comes from `layer`'s spec."""
+        if not prim:
+            return False
+        attr = prim.GetAttribute(attr_name)
+        if not attr:
+            return False
+        for prop_spec in attr.GetPropertyStack():
+            if _asset_values(prop_spec.layer, prop_spec.path):
+                return prop_spec.layer == layer and prop_spec.path == spec_path
+        return False
+
+    def _author_override(
+        self, layer, spec_path, stage_path, offset, mapped: Callable[[str], Optional[str]]
+    ) -> None:
+        if _asset_values(self.root_layer, stage_path):
+            # Overridden by an earlier rewrite; the in-place pass updated it.
+            return
+        values = _asset_values(layer, spec_path)
+        if not any(mapped(path) is not None for _, value in values for path in _value_paths(value)):
+            return
+        source = layer.GetAttributeAtPath(spec_path)
+        prim_spec = self.root_layer.GetPrimAtPath(stage_path.GetPrimPath())
+        if not prim_spec:
+            prim_spec = Sdf.CreatePrimInLayer(self.root_layer, stage_path.GetPrimPath())
+        attr_spec = prim_spec.attributes.get(stage_path.name)
+        if attr_spec is None:
+            attr_spec = Sdf.AttributeSpec(
+                prim_spec, stage_path.name, source.typeName, source.variability, declaresCustom=source.custom
+            )
+        for time, value in values:
+            value = _map_value(value, mapped)
+            if time is None:
+                attr_spec.default = value
+            else:
+                self.root_layer.SetTimeSample(attr_spec.path, offset * time, value)
+
+
+def scan_asset_paths(stage, editable_layers: Iterable[Any] = ()) -> AssetPathScan:
+    """Collect the asset paths authored in `stage`'s layers."""
+    return AssetPathScan(stage, editable_layers)
+
+
+def stage_dependencies(stage) -> Tuple[List[str], List[str]]:
+    """Return the layer files and asset files `stage` composes.
+
+    Layers come root layer first. Asset paths are resolved against the layer
+    that authors them; values shadowed by a stronger opinion, and paths that do
+    not resolve to an existing file, are left out.
+    """
+    root_layer = stage.GetRootLayer()
+    session_layer = stage.GetSessionLayer()
+    layer_files = [root_layer.realPath]
+    for layer in stage.GetUsedLayers():
+        if layer not in (root_layer, session_layer) and not layer.anonymous and layer.realPath:
+            layer_files.append(layer.realPath)
+
+    asset_files = set()
+    for layer, path in AssetPathScan(stage).anchored_paths:
+        resolved = layer.ComputeAbsolutePath(path)
+        if os.path.isfile(resolved):
+            asset_files.add(os.path.normpath(resolved))
+    return layer_files, sorted(asset_files)
+
+
+def rebase_relative_asset_paths(layer, source_dir: str, target_dir: str) -> None:
+    """Rewrite `layer`'s relative paths from `source_dir` to `target_dir`.
+
+    Absolute paths, URLs and package-relative paths are left alone.
+    """
+    source_dir = os.path.abspath(source_dir)
+    target_dir = os.path.abspath(target_dir)
+    if source_dir == target_dir:
+        return
+
+    def rebase(path: str) -> str:
+        if not path or os.path.isabs(path) or "://" in path or path.endswith("]"):
+            return path
+        resolved = os.path.normpath(os.path.join(source_dir, path))
+        try:
+            rebased = Path(os.path.relpath(resolved, target_dir)).as_posix()
+        except ValueError:
+            # Different drive on Windows; there is no relative path.
+            return Path(resolved).as_posix()
+        return rebased if rebased.startswith(".") else f"./{rebased}"
+
+    with Sdf.ChangeBlock():
+        UsdUtils.ModifyAssetPaths(layer, rebase)
+
+
+def _layer_asset_paths(layer) -> List[str]:
+    """Asset value paths in `layer`, without its composition arc paths."""
+    arcs = set(layer.GetCompositionAssetDependencies())
+    found: List[str] = []
+
+    def visit(path: str) -> str:
+        if path and path not in arcs:
+            found.append(path)
+        return path
+
+    UsdUtils.ModifyAssetPaths(layer, visit)
+    return found
+
+
+def _asset_attribute_spec_paths(layer) -> List[Any]:
+    asset_types = (Sdf.ValueTypeNames.Asset, Sdf.ValueTypeNames.AssetArray)
+    spec_paths: List[Any] = []
+
+    def visit(path) -> None:
+        if path.IsPropertyPath():
+            attr_spec = layer.GetAttributeAtPath(path)
+            if attr_spec and attr_spec.typeName in asset_types:
+                spec_paths.append(path)
+
+    layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+    return spec_paths
+
+
+def _asset_values(layer, spec_path) -> List[Tuple[Optional[float], Any]]:
+    """The default (time None) and time-sampled values authored on a spec."""
+    values: List[Tuple[Optional[float], Any]] = []
+    attr_spec = layer.GetAttributeAtPath(spec_path)
+    if not attr_spec:
+        return values
+    if attr_spec.HasDefaultValue():
+        values.append((None, attr_spec.default))
+    for time in layer.ListTimeSamplesForPath(spec_path):
+        values.append((time, layer.QueryTimeSample(spec_path, time)))
+    return values
+
+
+def _value_paths(value) -> List[str]:
+    if isinstance(value, Sdf.AssetPath):
+        return [value.path] if value.path else []
+    if isinstance(value, Sdf.AssetPathArray):
+        return [item.path for item in value if item.path]
+    return []
+
+
+def _map_value(value, mapped: Callable[[str], Optional[str]]):
+    if isinstance(value, Sdf.AssetPath):
+        return Sdf.AssetPath(mapped(value.path) or value.path)
+    if isinstance(value, Sdf.AssetPathArray):
+        return Sdf.AssetPathArray([Sdf.AssetPath(mapped(item.path) or item.path) for item in value])
+    return value
+
+
+def _key_path(key) -> str:
+    return key[1] if isinstance(key, tuple) else key
+
+
+def _sorted_anchored(anchored: Iterable[Tuple[Any, str]]) -> List[Tuple[Any, str]]:
+    return sorted(anchored, key=lambda item: (item[1], item[0].identifier))
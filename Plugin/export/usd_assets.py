@@ -10,7 +10,8 @@ import hashlib
 from urllib.parse import urlparse
 from urllib.request import url2pathname
 
-from .usd_utils import Sdf
+from .file_staging import FileStager
+from .usd_asset_paths import scan_asset_paths
 from .usd_textures import _is_texture_path
 
 
@@ -24,65 +25,59 @@ NON_FILE_PREFIXES = (
 )
 
 
-def prepare_assets(stage, usd_path: str, diagnostics=None) -> None:
-    """Stage non-texture assets and normalize their paths to be relative."""
+def prepare_assets(stage, usd_path: str, diagnostics=None, scan=None) -> None:
+    """Stage non-texture assets and normalize their paths to be relative.
+
+    `scan` is an `AssetPathScan` to reuse; the stage's layers are scanned when omitted.
+    """
     usd_dir = Path(usd_path).parent
     assets_dir = usd_dir / "assets"
     assets_dir.mkdir(exist_ok=True)
 
-    import shutil
-
+    stager = FileStager()
     seen_sources = {}
     seen_names = {}
-    for prim in stage.Traverse():
-        for attr in prim.GetAttributes():
-            if attr.GetTypeName() != Sdf.ValueTypeNames.Asset:
-                continue
-
-            asset_value = attr.Get()
-            asset_path = None
-            if isinstance(asset_value, Sdf.AssetPath):
-                asset_path = asset_value.path or asset_value.resolvedPath
-            elif asset_value:
-                asset_path = str(asset_value)
-
-            if not asset_path:
-                continue
-
-            if _is_texture_path(asset_path):
-                continue
-
-            if _is_non_file_asset(asset_path):
-                continue
-
-            source_path = Path(_normalize_file_url(asset_path))
-            if not source_path.is_absolute():
-                source_path = (usd_dir / source_path).resolve()
-
-            if not source_path.name:
-                continue
-
-            dest_name = _unique_destination_name(source_path, seen_names, diagnostics, "asset")
-            dest_path = assets_dir / dest_name
-            if source_path.exists():
-                if source_path not in seen_sources:
-                    try:
-                        if source_path.resolve() != dest_path.resolve():
-                            shutil.copy2(source_path, dest_path)
-                        seen_sources[source_path] = dest_path
-                    except Exception as exc:
-                        if diagnostics:
-                            diagnostics.add_warning(
-                                f"Failed to stage asset '{source_path}': {exc}"
-                            )
-            else:
-                if diagnostics:
-                    diagnostics.add_warning(
-                        f"Asset file not found for '{source_path}'"
-                    )
-
-            relative_path = Path("assets") / dest_path.name
-            attr.Set(Sdf.AssetPath(str(relative_path)))
+    if scan is None:
+        scan = scan_asset_paths(stage)
+    rewrites = {}
+    for anchor, asset_path in scan.anchored_paths:
+        if _is_texture_path(asset_path):
+            continue
+
+        if _is_non_file_asset(asset_path):
+            continue
+
+        source_path = Path(_normalize_file_url(asset_path))
+        if not source_path.is_absolute():
+            source_path = (Path(scan.anchor_directory(anchor) or usd_dir) / source_path).resolve()
+
+        if not source_path.name:
+            continue
+
+        dest_name = _unique_destination_name(source_path, seen_names, diagnostics, "asset")
+        dest_path = assets_dir / dest_name
+        if source_path.exists():
+            if source_path not in seen_sources:
+                seen_sources[source_path] = dest_path
+                stager.add(source_path, dest_path)
+        else:
+            if diagnostics:
+                diagnostics.add_warning(
+                    f"Asset file not found for '{source_path}'"
+                )
+
+        relative_path = Path("assets") / dest_path.name
+        rewrites[(anchor, asset_path)] = str(relative_path)
+
+    for result in stager.run():
+        if result.error is not None and diagnostics:
+            diagnostics.add_warning(
+                f"Failed to stage asset '{result.source}': {result.error}"
+            )
+    if diagnostics:
+        diagnostics.set_staging_stats("assets", stager.stats())
+
+    scan.rewrite(rewrites)
 
 
 def _is_non_file_asset(asset_path: str) -> bool:
@@ -0,0 +1,270 @@
+"""
+Single-traversal post-process pass framework.
+
+Each post-process step is a `PostProcessPass` that declares the prim types and
+attribute value types it reads. `run_passes()` traverses the stage once to
+build a `StageIndex` for the union of those interests (prims by type,
+attributes by value type, prims with time-sampled xformOps) and hands it to
+every pass instead of each pass calling `stage.Traverse()` again.
+
+The index is built on its first query, and attributes are read on the first
+attribute query. Passes keep authoring through the stage; the index listens for
+`Usd.Notice.ObjectsChanged` and, before the next query, re-indexes only the
+resynced subtrees (renamed prims, new material networks, removed duplicates)
+and the prims whose attributes were added or re-timed, so later passes see
+earlier passes' edits without another full traversal. Query results come back
+in `stage.Traverse()` order.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+from .usd_utils import Sdf, Tf, Usd
+
+
+class PostProcessPass:
+    """A post-process step and the stage content it reads."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Any, "StageIndex"], None],
+        prim_types: Iterable[str] = (),
+        attribute_types: Iterable[Any] = (),
+        xform_samples: bool = False,
+    ):
+        self.name = name
+        self.run = run
+        self.prim_types = frozenset(prim_types)
+        self.attribute_types = frozenset(attribute_types)
+        self.xform_samples = xform_samples
+
+
+def run_passes(stage, passes: List[PostProcessPass]) -> None:
+    """Index the stage once for all passes, then run them in order."""
+    prim_types: Set[str] = set()
+    attribute_types: Set[Any] = set()
+    for post_pass in passes:
+        prim_types |= post_pass.prim_types
+        attribute_types |= post_pass.attribute_types
+    xform_samples = any(post_pass.xform_samples for post_pass in passes)
+
+    with StageIndex(stage, prim_types, attribute_types, xform_samples) as index:
+        for post_pass in passes:
+            post_pass.run(stage, index)
+
+
+class StageIndex:
+    """Prims and attributes of interest, gathered in one traversal and kept current."""
+
+    def __init__(
+        self,
+        stage,
+        prim_types: Iterable[str] = (),
+        attribute_types: Iterable[Any] = (),
+        xform_samples: bool = False,
+    ):
+        self.stage = stage
+        self.xform_samples = xform_samples
+        self._by_type: Dict[str, Set[Any]] = {type_name: set() for type_name in prim_types}
+        self._attributes: Dict[Any, Dict[Any, List[str]]] = {type_name: {} for type_name in attribute_types}
+        self._animated_xforms: Set[Any] = set()
+        self._children: Dict[Any, List[Any]] = {}
+        self._position: Dict[Any, int] = {}
+        self._pending_subtrees: Set[Any] = set()
+        self._pending_prims: Set[Any] = set()
+        self._built = False
+        self._attributes_loaded = False
+        self._listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage)
+
+    def __enter__(self) -> "StageIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop tracking stage changes."""
+        if self._listener is not None:
+            self._listener.Revoke()
+            self._listener = None
+
+    def paths(self) -> List[Any]:
+        """All traversed prim paths, in traversal order."""
+        self._flush()
+        ordered = []
+        stack = list(reversed(self._children[Sdf.Path.absoluteRootPath]))
+        while stack:
+            path = stack.pop()
+            ordered.append(path)
+            stack.extend(reversed(self._children.get(path, ())))
+        return ordered
+
+    def prims(self, type_names: Iterable[str]) -> List[Any]:
+        """Prims whose type name is one of `type_names` (must be indexed types)."""
+        self._flush()
+        paths: Set[Any] = set()
+        for type_name in type_names:
+            paths |= self._by_type[type_name]
+        return [self.stage.GetPrimAtPath(path) for path in self._ordered(paths)]
+
+    def has_prims(self, type_names: Iterable[str]) -> bool:
+        self._flush()
+        return any(self._by_type[type_name] for type_name in type_names)
+
+    def attributes(self, type_name) -> List[Any]:
+        """Attributes of value type `type_name` (must be an indexed type)."""
+        self._flush()
+        self._load_attributes()
+        by_prim = self._attributes[type_name]
+        attributes = []
+        for path in self._ordered(by_prim):
+            prim = self.stage.GetPrimAtPath(path)
+            attributes.extend(prim.GetAttribute(name) for name in by_prim[path])
+        return attributes
+
+    def has_animated_xform_ops(self) -> bool:
+        """True if any prim has a time-varying `xformOp:*` attribute."""
+        self._flush()
+        self._load_attributes()
+        return bool(self._animated_xforms)
+
+    def _build(self) -> None:
+        self._built = True
+        self._children[Sdf.Path.absoluteRootPath] = []
+        for prim in self.stage.Traverse():
+            self._add_prim(prim)
+
+    def _add_prim(self, prim) -> None:
+        path = prim.GetPath()
+        siblings = self._children.setdefault(path.GetParentPath(), [])
+        self._position[path] = len(siblings)
+        siblings.append(path)
+        self._children[path] = []
+        type_paths = self._by_type.get(prim.GetTypeName())
+        if type_paths is not None:
+            type_paths.add(path)
+        if self._attributes_loaded:
+            self._read_attributes(prim)
+
+    def _load_attributes(self) -> None:
+        # Attributes are read on the first attribute query, so passes that
+        # only need prims (or never reach their attribute query) skip them.
+        if self._attributes_loaded:
+            return
+        self._attributes_loaded = True
+        for path in self._position:
+            self._read_attributes(self.stage.GetPrimAtPath(path))
+
+    def _read_attributes(self, prim) -> None:
+        if not self._attributes and not self.xform_samples:
+            return
+        path = prim.GetPath()
+        # Schema fallbacks carry no asset paths or time samples; skipping them
+        # avoids materializing every builtin Mesh/Xform attribute.
+        for attr in prim.GetAuthoredAttributes():
+            by_prim = self._attributes.get(attr.GetTypeName())
+            if by_prim is not None:
+                by_prim.setdefault(path, []).append(attr.GetName())
+            if self.xform_samples and attr.GetName().startswith("xformOp:") and attr.ValueMightBeTimeVarying():
+                self._animated_xforms.add(path)
+
+    def _forget_attributes(self, path) -> None:
+        for by_prim in self._attributes.values():
+            by_prim.pop(path, None)
+        self._animated_xforms.discard(path)
+
+    def _remove_subtree(self, path) -> None:
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            stack.extend(self._children.pop(current, ()))
+            self._position.pop(current, None)
+            for type_paths in self._by_type.values():
+                type_paths.discard(current)
+            self._forget_attributes(current)
+
+    def _on_objects_changed(self, notice, sender) -> None:
+        if not self._built:
+            return
+        for path in notice.GetResyncedPaths():
+            if path.IsPropertyPath():
+                self._pending_prims.add(path.GetPrimPath())
+            else:
+                self._pending_subtrees.add(path)
+        if self.xform_samples:
+            for path in notice.GetChangedInfoOnlyPaths():
+                if path.IsPropertyPath() and path.name.startswith("xformOp:"):
+                    self._pending_prims.add(path.GetPrimPath())
+
+    def _flush(self) -> None:
+        if not self._built:
+            # Built on first query, so edits made before it (e.g. setting the
+            # default prim, which resyncs "/") cost nothing.
+            self._build()
+            return
+        if not self._pending_subtrees and not self._pending_prims:
+            return
+        subtrees = sorted(self._pending_subtrees, key=lambda path: path.pathElementCount)
+        prims = self._pending_prims
+        self._pending_subtrees = set()
+        self._pending_prims = set()
+
+        if Sdf.Path.absoluteRootPath in subtrees:
+            self._by_type = {type_name: set() for type_name in self._by_type}
+            self._attributes = {type_name: {} for type_name in self._attributes}
+            self._animated_xforms = set()
+            self._children = {}
+            self._position = {}
+            self._build()
+            return
+
+        roots: Set[Any] = set()
+        for path in subtrees:
+            if not _has_ancestor_in(path, roots):
+                roots.add(path)
+
+        parents = set()
+        for root in sorted(roots):
+            parent = root.GetParentPath()
+            if parent not in self._children:
+                continue
+            self._remove_subtree(root)
+            parents.add(parent)
+            prim = self.stage.GetPrimAtPath(root)
+            if prim:
+                for descendant in Usd.PrimRange(prim, Usd.PrimDefaultPredicate):
+                    self._add_prim(descendant)
+
+        for parent in parents:
+            parent_prim = self.stage.GetPseudoRoot() if parent == Sdf.Path.absoluteRootPath else self.stage.GetPrimAtPath(parent)
+            children = [parent.AppendChild(name) for name in parent_prim.GetChildrenNames()]
+            children = [child for child in children if child in self._children]
+            self._children[parent] = children
+            for position, child in enumerate(children):
+                self._position[child] = position
+
+        for path in prims:
+            if not self._attributes_loaded or path not in self._children or _has_ancestor_in(path, roots):
+                continue
+            self._forget_attributes(path)
+            self._read_attributes(self.stage.GetPrimAtPath(path))
+
+    def _ordered(self, paths: Iterable[Any]) -> List[Any]:
+        memo: Dict[Any, tuple] = {Sdf.Path.absoluteRootPath: ()}
+
+        def order(path) -> tuple:
+            key = memo.get(path)
+            if key is None:
+                key = memo[path] = order(path.GetParentPath()) + (self._position[path],)
+            return key
+
+        return sorted(paths, key=order)
+
+
+def _has_ancestor_in(path, paths: Set[Any]) -> bool:
+    """True if `path` or one of its ancestors is in `paths`."""
+    while path != Sdf.Path.absoluteRootPath:
+        if path in paths:
+            return True
+        path = path.GetParentPath()
+    return False
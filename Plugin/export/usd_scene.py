@@ -5,12 +5,26 @@ Keeps stage metadata and prim names aligned with RealityKit expectations.
 """
 
 import re
+from typing import Any, Dict, List, Set, Tuple
 
+from .usd_passes import StageIndex
 from .usd_utils import Sdf
 
 
-def normalize_scene(stage, settings) -> None:
+# Prim types `normalize_scene` reads from the stage index.
+SCENE_PRIM_TYPES = ("Xform",)
+
+# Illegal names under one parent from which its children are rebuilt at once
+# instead of renamed one by one.
+_REBUILD_MIN_RENAMES = 64
+
+
+def normalize_scene(stage, settings, index=None) -> None:
     """Normalize scene metadata and prim names for RCP."""
+    if index is None:
+        with StageIndex(stage, SCENE_PRIM_TYPES) as index:
+            return normalize_scene(stage, settings, index)
+
     # Ensure default prim
     if not stage.GetDefaultPrim():
         root_prim_name = settings.root_prim_name or "Scene"
@@ -26,44 +40,14 @@ def normalize_scene(stage, settings) -> None:
             stage.SetMetadata("upAxis", up_axis.lstrip('-'))
 
     # Fix illegal prim names if needed (USD has restrictions on prim names).
-    rename_ops = []
-    for prim in stage.Traverse():
-        prim_name = prim.GetName()
-        if not _is_valid_identifier(prim_name):
-            new_name = f"prim_{prim_name}" if prim_name else "prim"
-            rename_ops.append((prim.GetPath(), prim.GetTypeName(), new_name))
-
-    for prim_path, prim_type, new_name in rename_ops:
-        prim = stage.GetPrimAtPath(prim_path)
-        if not prim:
-            continue
-        parent = prim.GetParent()
-        if not parent:
-            continue
-
-        base_name = new_name
-        suffix = 1
-        new_path = parent.GetPath().AppendChild(base_name)
-        while stage.GetPrimAtPath(new_path):
-            suffix += 1
-            new_path = parent.GetPath().AppendChild(f"{base_name}_{suffix}")
-
-        stage.DefinePrim(new_path, prim_type)
-        new_prim = stage.GetPrimAtPath(new_path)
-        if new_prim:
-            for attr in prim.GetAttributes():
-                new_attr = new_prim.CreateAttribute(
-                    attr.GetName(),
-                    attr.GetTypeName()
-                )
-                if new_attr:
-                    new_attr.Set(attr.Get())
-        stage.RemovePrim(prim_path)
+    renames = _collect_renames(stage, index)
+    if renames:
+        _apply_renames(stage.GetEditTarget().GetLayer(), renames)
 
     # Blender can sometimes export mesh schema attributes onto an Xform prim type.
     # Reality Composer Pro won't treat this as geometry, so we re-type such prims
     # to Mesh when they clearly contain mesh topology.
-    _repair_xform_mesh_prims(stage)
+    _repair_xform_mesh_prims(stage, index)
 
 
 def _is_valid_identifier(name: str) -> bool:
@@ -76,7 +60,110 @@ def _is_valid_identifier(name: str) -> bool:
         return re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', name) is not None
 
 
-def _repair_xform_mesh_prims(stage) -> None:
+def _collect_renames(stage, index) -> List[Tuple[Any, str]]:
+    """Return (path, new name) for every prim with an illegal name.
+
+    Only prims with a spec in the edit-target layer can be renamed there.
+    """
+    layer = stage.GetEditTarget().GetLayer()
+    taken: Dict[Any, Set[str]] = {}
+    renames = []
+    for path in index.paths():
+        prim_name = path.name
+        if _is_valid_identifier(prim_name) or not layer.GetPrimAtPath(path):
+            continue
+        parent_path = path.GetParentPath()
+        names = taken.get(parent_path)
+        if names is None:
+            parent = stage.GetPrimAtPath(parent_path)
+            names = taken[parent_path] = set(parent.GetAllChildrenNames()) if parent else set()
+
+        base_name = f"prim_{prim_name}" if prim_name else "prim"
+        new_name = base_name
+        suffix = 1
+        while new_name in names:
+            suffix += 1
+            new_name = f"{base_name}_{suffix}"
+        names.add(new_name)
+        renames.append((path, new_name))
+    return renames
+
+
+def _apply_renames(layer, renames: List[Tuple[Any, str]]) -> None:
+    """Rename prim specs in the layer, keeping subtrees, time samples and metadata."""
+    by_parent: Dict[Any, Dict[str, str]] = {}
+    for path, new_name in renames:
+        by_parent.setdefault(path.GetParentPath(), {})[path.name] = new_name
+
+    with Sdf.ChangeBlock():
+        # Retarget first: the rebuild's `Sdf.CopySpec` would otherwise remap
+        # paths inside the copied subtrees on its own.
+        _retarget_paths(layer, {path: path.ReplaceName(new_name) for path, new_name in renames})
+        # Deepest parents first, so every parent is still at its original path.
+        for parent_path in sorted(by_parent, key=lambda path: path.pathElementCount, reverse=True):
+            parent = layer.GetPrimAtPath(parent_path)
+            if not parent:
+                continue
+            names = by_parent[parent_path]
+            # Each in-place rename rewrites the parent's child list, so many
+            # renames under one parent are cheaper as one rebuild.
+            if len(names) >= _REBUILD_MIN_RENAMES:
+                _rebuild_children(layer, parent, names)
+            else:
+                for old_name, new_name in names.items():
+                    parent.nameChildren[old_name].name = new_name
+            if parent_path == Sdf.Path.absoluteRootPath and layer.defaultPrim in names:
+                layer.defaultPrim = names[layer.defaultPrim]
+
+
+def _rebuild_children(layer, parent, names: Dict[str, str]) -> None:
+    """Re-create `parent`'s children in order, renamed per `names`, via `Sdf.CopySpec`."""
+    staging_layer = Sdf.Layer.CreateAnonymous("rename_staging")
+    staging_path = Sdf.Path("/RenameStaging")
+    Sdf.CreatePrimInLayer(staging_layer, staging_path)
+    children = [(name, names.get(name, name)) for name in parent.nameChildren.keys()]
+    for old_name, new_name in children:
+        Sdf.CopySpec(layer, parent.path.AppendChild(old_name), staging_layer, staging_path.AppendChild(new_name))
+    parent.nameChildren.clear()
+    for _, new_name in children:
+        Sdf.CopySpec(staging_layer, staging_path.AppendChild(new_name), layer, parent.path.AppendChild(new_name))
+
+
+def _retarget_paths(layer, moved: Dict[Any, Any]) -> None:
+    """Point relationship targets and connections at renamed prims' new paths."""
+
+    def remap(path):
+        prefix = path.GetPrimPath()
+        while not prefix.isEmpty and prefix != Sdf.Path.absoluteRootPath:
+            if prefix in moved:
+                path = path.ReplacePrefix(prefix, moved[prefix])
+            prefix = prefix.GetParentPath()
+        return path
+
+    def remap_list(path_list) -> None:
+        if not path_list.isExplicit and not path_list.prependedItems and not path_list.appendedItems:
+            return
+        for field in ("explicitItems", "prependedItems", "appendedItems"):
+            items = list(getattr(path_list, field))
+            remapped = [remap(item) for item in items]
+            if remapped != items:
+                setattr(path_list, field, remapped)
+
+    def visit(path) -> None:
+        if not path.IsPropertyPath():
+            return
+        relationship = layer.GetRelationshipAtPath(path)
+        if relationship:
+            remap_list(relationship.targetPathList)
+            return
+        attribute = layer.GetAttributeAtPath(path)
+        if attribute:
+            remap_list(attribute.connectionPathList)
+
+    layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+
+
+def _repair_xform_mesh_prims(stage, index) -> None:
     def has_attr(prim, name: str) -> bool:
         try:
             attr = prim.GetAttribute(name)
@@ -84,13 +171,7 @@ def _repair_xform_mesh_prims(stage) -> None:
         except Exception:
             return False
 
-    for prim in stage.Traverse():
-        try:
-            if prim.GetTypeName() != "Xform":
-                continue
-        except Exception:
-            continue
-
+    for prim in index.prims(SCENE_PRIM_TYPES):
         # Minimal signature of a Mesh: topology + points.
         if has_attr(prim, "faceVertexCounts") and has_attr(prim, "faceVertexIndices") and has_attr(prim, "points"):
             try:
@@ -7,7 +7,8 @@ Ensures referenced assets are copied and paths are made relative for USDZ.
 from pathlib import Path
 import hashlib
 
-from .usd_utils import Sdf
+from .file_staging import FileStager, StagingManifest, hash_files
+from .usd_asset_paths import scan_asset_paths
 
 
 TEXTURE_EXTENSIONS = {
@@ -28,67 +29,86 @@ TEXTURE_EXTENSIONS = {
 }
 
 
-def prepare_textures(stage, usd_path: str, settings, diagnostics=None) -> None:
-    """Prepare textures for USDZ packaging."""
+def prepare_textures(stage, usd_path: str, settings, diagnostics=None, scan=None) -> None:
+    """Prepare textures for USDZ packaging.
+
+    `scan` is an `AssetPathScan` to reuse; the stage's layers are scanned when omitted.
+    """
     usd_dir = Path(usd_path).parent
     textures_dir = usd_dir / "textures"
     textures_dir.mkdir(exist_ok=True)
 
-    import shutil
-
-    # Copy textures and update asset paths
+    # Stage textures in parallel after the scan, then update asset paths.
+    # The manifest is loaded before hashing so unchanged sources reuse their hash.
+    manifest = StagingManifest(usd_dir)
+    stager = FileStager(manifest=manifest)
     seen_sources = {}
     seen_names = {}
-    for prim in stage.Traverse():
-        for attr in prim.GetAttributes():
-            if attr.GetTypeName() != Sdf.ValueTypeNames.Asset:
-                continue
-
-            asset_value = attr.Get()
-            asset_path = None
-            if isinstance(asset_value, Sdf.AssetPath):
-                asset_path = asset_value.path or asset_value.resolvedPath
-            elif asset_value:
-                asset_path = str(asset_value)
-
-            if not asset_path:
-                continue
-
-            if not _is_texture_path(asset_path):
-                continue
-
-            if asset_path.lower().startswith(("http:", "https:", "data:", "blob:", "mem:", "anon:")):
-                continue
-
-            source_path = Path(asset_path)
-            if not source_path.is_absolute():
-                source_path = (usd_dir / source_path).resolve()
-
-            if not source_path.name:
-                continue
-
-            dest_name = _unique_destination_name(source_path, seen_names, diagnostics, "texture")
-            dest_path = textures_dir / dest_name
-
-            if source_path.exists():
-                if source_path not in seen_sources:
-                    try:
-                        if source_path.resolve() != dest_path.resolve():
-                            shutil.copy2(source_path, dest_path)
-                        seen_sources[source_path] = dest_path
-                        if diagnostics:
-                            diagnostics.add_texture_copied(str(source_path))
-                    except Exception as e:
-                        if diagnostics:
-                            diagnostics.add_texture_failed(str(source_path), str(e))
+    if scan is None:
+        scan = scan_asset_paths(stage)
+    candidates = []
+    for anchor, asset_path in scan.anchored_paths:
+        if not _is_texture_path(asset_path):
+            continue
+
+        if asset_path.lower().startswith(("http:", "https:", "data:", "blob:", "mem:", "anon:")):
+            continue
+
+        source_path = Path(asset_path)
+        if not source_path.is_absolute():
+            source_path = (Path(scan.anchor_directory(anchor) or usd_dir) / source_path).resolve()
+            # Already staged (e.g. a material library entry): restage from the original.
+            if source_path.parent == textures_dir.resolve():
+                source_path = manifest.source_for(source_path) or source_path
+
+        if not source_path.name:
+            continue
+        candidates.append(((anchor, asset_path), source_path, source_path.exists()))
+
+    # Byte-identical textures (same extension) are staged once and shared.
+    digests = hash_files(source_path for _, source_path, exists in candidates if exists)
+    staged_by_content = {}
+    deduplicated = {"files": 0, "bytes": 0}
+    rewrites = {}
+    for asset_key, source_path, exists in candidates:
+        dest_path = seen_sources.get(source_path)
+        if dest_path is None and exists:
+            content_key = (digests.get(source_path), source_path.suffix.lower())
+            dest_path = staged_by_content.get(content_key) if content_key[0] else None
+            if dest_path is not None:
+                deduplicated["files"] += 1
+                deduplicated["bytes"] += source_path.stat().st_size
             else:
-                # Normalize to relative even if the source is missing.
-                if not dest_path.exists():
-                    if diagnostics:
-                        diagnostics.add_texture_failed(str(source_path), "Texture file not found")
+                dest_path = textures_dir / _unique_destination_name(source_path, seen_names, diagnostics, "texture")
+                stager.add(source_path, dest_path)
+                if content_key[0]:
+                    staged_by_content[content_key] = dest_path
+            seen_sources[source_path] = dest_path
+        elif dest_path is None:
+            dest_path = textures_dir / _unique_destination_name(source_path, seen_names, diagnostics, "texture")
+            # Normalize to relative even if the source is missing.
+            if not dest_path.exists():
+                if diagnostics:
+                    diagnostics.add_texture_failed(str(source_path), "Texture file not found")
+
+        relative_path = Path("textures") / dest_path.name
+        rewrites[asset_key] = str(relative_path)
+
+    for result in stager.run():
+        if diagnostics:
+            if result.error is None:
+                diagnostics.add_texture_copied(str(result.source))
+            else:
+                diagnostics.add_texture_failed(str(result.source), str(result.error))
+    try:
+        manifest.save()
+    except OSError as e:
+        if diagnostics:
+            diagnostics.add_warning(f"Failed to write texture staging manifest: {e}")
+    if diagnostics:
+        diagnostics.set_staging_stats("textures", dict(stager.stats(), deduplicated=deduplicated))
 
-            relative_path = Path("textures") / dest_path.name
-            attr.Set(Sdf.AssetPath(str(relative_path)))
+    scan.rewrite(rewrites)
 
 
 def _is_texture_path(asset_path: str) -> bool:
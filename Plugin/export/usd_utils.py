@@ -7,10 +7,10 @@ Centralizes pxr imports so other modules can depend on a single source.
 from typing import Optional
 
 try:
-    from pxr import Usd, UsdShade, Sdf, Gf, UsdGeom, Vt
+    from pxr import Usd, UsdShade, UsdUtils, Sdf, Pcp, Gf, UsdGeom, Vt, Tf
     PXR_AVAILABLE = True
 except ImportError:
-    Usd = UsdShade = Sdf = Gf = UsdGeom = Vt = None
+    Usd = UsdShade = UsdUtils = Sdf = Pcp = Gf = UsdGeom = Vt = Tf = None
     PXR_AVAILABLE = False
 
 
@@ -0,0 +1,138 @@
+"""
+Precompiled (binary) form of the MaterialX nodedef manifest.
+
+`scripts/build_materialx_manifest.py` writes `rk_nodes_manifest.bin` next to the
+JSON manifest. The runtime loader prefers it when its recorded source hash
+matches the JSON bytes on disk, and silently falls back to JSON otherwise.
+
+Layout:
+  magic (8 bytes) | schema version (u32, little endian) | sha256 of JSON (32 bytes)
+  | head length (u64) | head | nodedef blobs
+
+The head is a pickled dict holding `metadata`, the prebuilt `by_node*` indexes,
+and an offset table (`nodedef name -> (offset, length)`) into the blob section.
+Each nodedef is pickled on its own, so the reader loads only the head eagerly
+and unpickles individual nodedefs on first access. The file (a few hundred KB)
+is read into memory in one go rather than memory-mapped, so no handle stays
+open and the build script can overwrite it while Blender has the add-on loaded.
+All strings are interned, so repeated node names/types are stored once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+
+COMPILED_MAGIC = b"RKMNFST\0"
+COMPILED_SCHEMA_VERSION = 2
+
+_HEADER = struct.Struct("<8sI32sQ")
+
+
+class CompiledNodeTable(Mapping):
+    """Read-only nodedef table that unpickles entries from the blob section on access."""
+
+    def __init__(self, buffer, base: int, offsets: Dict[str, Tuple[int, int]]):
+        self._buffer = buffer
+        self._base = base
+        self._offsets = offsets
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        offset, length = self._offsets[name]
+        start = self._base + offset
+        return pickle.loads(self._buffer[start:start + length])
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+def compiled_path_for(json_path: Path) -> Path:
+    """Return the precompiled manifest path that sits next to a JSON manifest."""
+    return Path(json_path).with_suffix(".bin")
+
+
+def source_digest(source_bytes: bytes) -> bytes:
+    """Return the digest recorded for the JSON source of a compiled manifest."""
+    return hashlib.sha256(source_bytes).digest()
+
+
+def write_compiled_manifest(manifest: Dict[str, Any], source_bytes: bytes, path: Path) -> None:
+    """Write the precompiled manifest for `manifest` (built from `source_bytes`)."""
+    manifest = _intern(manifest)
+    blobs = bytearray()
+    offsets: Dict[str, Tuple[int, int]] = {}
+    for nodedef_name, node_def in manifest.get("nodes", {}).items():
+        blob = pickle.dumps(node_def, protocol=4)
+        offsets[nodedef_name] = (len(blobs), len(blob))
+        blobs += blob
+
+    head = pickle.dumps(
+        {
+            "metadata": manifest.get("metadata", {}),
+            "index": manifest.get("index", {}),
+            "offsets": offsets,
+        },
+        protocol=4,
+    )
+    header = _HEADER.pack(COMPILED_MAGIC, COMPILED_SCHEMA_VERSION, source_digest(source_bytes), len(head))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + head + bytes(blobs))
+
+
+def read_compiled_manifest(path: Path, source_bytes: bytes) -> Optional[Dict[str, Any]]:
+    """Return the precompiled manifest, or None if missing, stale, or unreadable.
+
+    `nodes` is a lazy `CompiledNodeTable` over the file's bytes, read into memory.
+    """
+    buffer = _read_file(Path(path))
+    if buffer is None or len(buffer) < _HEADER.size:
+        return None
+
+    magic, version, digest, head_length = _HEADER.unpack_from(buffer)
+    if magic != COMPILED_MAGIC or version != COMPILED_SCHEMA_VERSION:
+        return None
+    if digest != source_digest(source_bytes):
+        return None
+
+    head_end = _HEADER.size + head_length
+    try:
+        head = pickle.loads(buffer[_HEADER.size:head_end])
+    except Exception:
+        return None
+    if not isinstance(head, dict) or not isinstance(head.get("offsets"), dict):
+        return None
+
+    return {
+        "metadata": head.get("metadata"),
+        "index": head.get("index"),
+        "nodes": CompiledNodeTable(buffer, head_end, head["offsets"]),
+    }
+
+
+def _read_file(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {sys.intern(key) if isinstance(key, str) else key: _intern(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
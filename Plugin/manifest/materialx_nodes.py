@@ -6,15 +6,33 @@ target (RealityKit + stdlib/pbrlib). It is generated from Apple's `.mtlx`
 definition files by a repo script (see `scripts/build_materialx_manifest.py`).
 
 Important: the Blender add-on does not rebuild this manifest at runtime.
+
+The parsed manifest is held by a process-wide `ManifestRegistry`: every caller
+of `load_manifest()` shares one frozen (read-only) view, and the file is only
+re-parsed when its mtime or size changes. When a precompiled
+`rk_nodes_manifest.bin` with a matching source hash sits next to the JSON, it is
+loaded instead of parsing the JSON (see `compiled.py`).
+
+Only `metadata` and `index` are materialized eagerly; `manifest["nodes"]` is a
+`LazyNodeDefs` mapping that builds (and caches) each frozen nodedef entry on
+first access, straight from the precompiled file's bytes when available.
+The shared `ManifestView` also memoizes `select_nodedef_name_for_node` results
+and the `convert` type-conversion graph, so both are dropped together with the
+manifest when the file changes.
 """
 
 from __future__ import annotations
 
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 from ..core.paths import manifest_path as _manifest_path
+from .compiled import compiled_path_for, read_compiled_manifest
 
 
 MANIFEST_SCHEMA_VERSION = "2.0.0"
@@ -29,32 +47,197 @@ def get_manifest_path() -> Path:
     return _manifest_path()
 
 
-def load_manifest() -> Dict[str, Any]:
-    """Load the bundled manifest JSON (no rebuild)."""
-    manifest_path = get_manifest_path()
-    if not manifest_path.exists():
-        raise ManifestError(
-            f"MaterialX manifest missing: {manifest_path}. "
-            f"Run `python3 scripts/build_materialx_manifest.py` to generate it."
-        )
-
+class LazyNodeDefs(Mapping):
+    """Read-only `nodes` mapping that materializes frozen nodedefs on first access."""
+
+    def __init__(self, source: Mapping[str, Any]):
+        self._source = source
+        self._loaded: Dict[str, Mapping[str, Any]] = {}
+
+    def __getitem__(self, nodedef_name: str) -> Mapping[str, Any]:
+        node_def = self._loaded.get(nodedef_name)
+        if node_def is None:
+            node_def = _freeze(self._source[nodedef_name])
+            self._loaded[nodedef_name] = node_def
+        return node_def
+
+    def __contains__(self, nodedef_name: object) -> bool:
+        return nodedef_name in self._source
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._source)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    @property
+    def loaded_count(self) -> int:
+        return len(self._loaded)
+
+
+# One hop of a conversion chain: (nodedef name, input type, output type).
+ConversionStep = Tuple[str, str, str]
+ConversionChain = Tuple[ConversionStep, ...]
+
+
+class ManifestView(Mapping):
+    """Shared read-only manifest plus its memoized nodedef selection table."""
+
+    def __init__(self, sections: Dict[str, Any]):
+        self._sections = sections
+        self._selection: Dict[Tuple[Any, ...], Optional[str]] = {}
+        self._conversions: Optional[Dict[Tuple[str, str], ConversionChain]] = None
+        self.selection_hits = 0
+        self.selection_misses = 0
+
+    def __getitem__(self, key: str) -> Any:
+        return self._sections[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def selection_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._selection),
+            "hits": self.selection_hits,
+            "misses": self.selection_misses,
+        }
+
+
+class ManifestRegistry:
+    """Process-wide cache of the parsed manifest, keyed by file mtime + size."""
+
+    def __init__(self, path_getter=get_manifest_path):
+        self._path_getter = path_getter
+        self._lock = threading.Lock()
+        self._manifest: Optional[ManifestView] = None
+        self._key: Optional[Tuple[str, int, int]] = None
+        self._stats: Dict[str, Any] = {
+            "loads": 0,
+            "hits": 0,
+            "last_load_seconds": None,
+            "total_load_seconds": 0.0,
+            "path": None,
+            "source": None,
+        }
+
+    def get(self) -> ManifestView:
+        """Return the shared manifest view, re-parsing only if the file changed."""
+        manifest_path = self._path_getter()
+        try:
+            stat = manifest_path.stat()
+        except FileNotFoundError:
+            raise ManifestError(
+                f"MaterialX manifest missing: {manifest_path}. "
+                f"Run `python3 scripts/build_materialx_manifest.py` to generate it."
+            ) from None
+        key = (str(manifest_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if self._manifest is not None and self._key == key:
+                self._stats["hits"] += 1
+                return self._manifest
+
+            start = time.perf_counter()
+            manifest, source = _read_manifest(manifest_path)
+            elapsed = time.perf_counter() - start
+
+            self._manifest = manifest
+            self._key = key
+            self._stats["loads"] += 1
+            self._stats["last_load_seconds"] = elapsed
+            self._stats["total_load_seconds"] += elapsed
+            self._stats["path"] = str(manifest_path)
+            self._stats["source"] = source
+            return manifest
+
+    def invalidate(self) -> None:
+        """Drop the cached manifest so the next `get()` re-parses it."""
+        with self._lock:
+            self._manifest = None
+            self._key = None
+
+    def fingerprint(self) -> Optional[str]:
+        """Return an identifier for the loaded manifest file (path, mtime, size)."""
+        with self._lock:
+            if self._key is None:
+                return None
+            path, mtime_ns, size = self._key
+            return f"{path}:{mtime_ns}:{size}"
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load/hit counters for diagnostics."""
+        with self._lock:
+            stats = dict(self._stats)
+            if self._manifest is not None:
+                nodes = self._manifest.get("nodes")
+                if isinstance(nodes, LazyNodeDefs):
+                    stats["nodedefs_total"] = len(nodes)
+                    stats["nodedefs_loaded"] = nodes.loaded_count
+                stats["selection"] = self._manifest.selection_stats()
+            return stats
+
+
+_REGISTRY = ManifestRegistry()
+
+
+def get_manifest_registry() -> ManifestRegistry:
+    """Return the process-wide manifest registry."""
+    return _REGISTRY
+
+
+def load_manifest() -> ManifestView:
+    """Return the shared, read-only manifest view (no rebuild)."""
+    return _REGISTRY.get()
+
+
+def _read_manifest(manifest_path: Path) -> Tuple[ManifestView, str]:
+    """Read the manifest, preferring the precompiled form; returns (manifest, source)."""
     try:
-        manifest = json.loads(manifest_path.read_text())
-    except Exception as exc:
-        raise ManifestError(f"Failed to parse MaterialX manifest: {manifest_path}: {exc}") from exc
+        source_bytes = manifest_path.read_bytes()
+    except OSError as exc:
+        raise ManifestError(f"Failed to read MaterialX manifest: {manifest_path}: {exc}") from exc
+
+    manifest = read_compiled_manifest(compiled_path_for(manifest_path), source_bytes)
+    source = "compiled"
+    if manifest is None:
+        source = "json"
+        try:
+            manifest = json.loads(source_bytes)
+        except Exception as exc:
+            raise ManifestError(f"Failed to parse MaterialX manifest: {manifest_path}: {exc}") from exc
 
     _validate_manifest(manifest, manifest_path)
-    return manifest
+    view = ManifestView(
+        {
+            "metadata": _freeze(manifest["metadata"]),
+            "index": _freeze(manifest["index"]),
+            "nodes": LazyNodeDefs(manifest["nodes"]),
+        }
+    )
+    return view, source
 
 
-def get_node_def(manifest: Dict[str, Any], nodedef_name: str) -> Optional[Dict[str, Any]]:
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def get_node_def(manifest: Mapping[str, Any], nodedef_name: str) -> Optional[Mapping[str, Any]]:
     """Return a nodedef entry by its nodedef name."""
     if not manifest:
         return None
     return manifest.get("nodes", {}).get(nodedef_name)
 
 
-def get_node_defs_for_node(manifest: Dict[str, Any], node_name: str) -> List[Dict[str, Any]]:
+def get_node_defs_for_node(manifest: Mapping[str, Any], node_name: str) -> List[Mapping[str, Any]]:
     """Return all nodedef entries for a node name."""
     if not manifest:
         return []
@@ -63,17 +246,44 @@ def get_node_defs_for_node(manifest: Dict[str, Any], node_name: str) -> List[Dic
 
 
 def select_nodedef_name_for_node(
-    manifest: Dict[str, Any],
+    manifest: Mapping[str, Any],
     node_name: str,
     input_type: Optional[str] = None,
     output_type: Optional[str] = None,
     signature: Optional[str] = None,
     prefer_non_half: bool = True,
 ) -> Optional[str]:
-    """Select the best nodedef name for a node based on IO signature."""
+    """Select the best nodedef name for a node based on IO signature.
+
+    Results are memoized per shared `ManifestView`; plain dict manifests are
+    resolved on every call.
+    """
     if not manifest or not node_name:
         return None
 
+    if not isinstance(manifest, ManifestView):
+        return _resolve_nodedef_name(manifest, node_name, input_type, output_type, signature, prefer_non_half)
+
+    key = (node_name, input_type, output_type, signature, bool(prefer_non_half))
+    selection = manifest._selection
+    if key in selection:
+        manifest.selection_hits += 1
+        return selection[key]
+
+    manifest.selection_misses += 1
+    nodedef_name = _resolve_nodedef_name(manifest, node_name, input_type, output_type, signature, prefer_non_half)
+    selection[key] = nodedef_name
+    return nodedef_name
+
+
+def _resolve_nodedef_name(
+    manifest: Mapping[str, Any],
+    node_name: str,
+    input_type: Optional[str],
+    output_type: Optional[str],
+    signature: Optional[str],
+    prefer_non_half: bool,
+) -> Optional[str]:
     index = manifest.get("index", {})
     by_node_signature = index.get("by_node_signature", {})
     by_node_io = index.get("by_node_io", {})
@@ -102,13 +312,13 @@ def select_nodedef_name_for_node(
 
 
 def select_node_def_for_node(
-    manifest: Dict[str, Any],
+    manifest: Mapping[str, Any],
     node_name: str,
     input_type: Optional[str] = None,
     output_type: Optional[str] = None,
     signature: Optional[str] = None,
     prefer_non_half: bool = True,
-) -> Optional[Dict[str, Any]]:
+) -> Optional[Mapping[str, Any]]:
     """Return the nodedef entry selected for a node name."""
     nodedef_name = select_nodedef_name_for_node(
         manifest,
@@ -123,6 +333,60 @@ def select_node_def_for_node(
     return get_node_def(manifest, nodedef_name)
 
 
+def get_conversion_chain(
+    manifest: Mapping[str, Any],
+    from_type: Optional[str],
+    to_type: Optional[str],
+) -> Optional[ConversionChain]:
+    """Return the shortest chain of `convert` nodedefs from one type to another.
+
+    Returns an empty chain when the types already match and None when no chain
+    of `convert` nodedefs exists in the manifest.
+    """
+    from_type = _normalize_type(from_type)
+    to_type = _normalize_type(to_type)
+    if from_type == to_type:
+        return ()
+    if not manifest:
+        return None
+
+    if isinstance(manifest, ManifestView):
+        if manifest._conversions is None:
+            manifest._conversions = _build_conversion_table(manifest)
+        table = manifest._conversions
+    else:
+        table = _build_conversion_table(manifest)
+    return table.get((from_type, to_type))
+
+
+def _build_conversion_table(manifest: Mapping[str, Any]) -> Dict[Tuple[str, str], ConversionChain]:
+    """Compute shortest `convert` chains between every pair of reachable types."""
+    edges: Dict[str, Dict[str, str]] = {}
+    by_io = manifest.get("index", {}).get("by_node_io", {}).get("convert", {})
+    for io_key in sorted(by_io):
+        in_type, _, out_type = io_key.partition("->")
+        nodedef_name = _pick_nodedef(manifest, sorted(set(by_io[io_key])))
+        if in_type and out_type and nodedef_name:
+            edges.setdefault(in_type, {})[out_type] = nodedef_name
+
+    table: Dict[Tuple[str, str], ConversionChain] = {}
+    for source in sorted(edges):
+        # Breadth-first with sorted neighbours keeps equal-length chains deterministic.
+        chains: Dict[str, ConversionChain] = {source: ()}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for target in sorted(edges.get(current, {})):
+                if target in chains:
+                    continue
+                chains[target] = chains[current] + ((edges[current][target], current, target),)
+                queue.append(target)
+        for target, chain in chains.items():
+            if chain:
+                table[(source, target)] = chain
+    return table
+
+
 def _validate_manifest(manifest: Dict[str, Any], manifest_path: Path) -> None:
     if not isinstance(manifest, dict):
         raise ManifestError(f"Invalid manifest format (expected dict): {manifest_path}")
@@ -140,7 +404,7 @@ def _validate_manifest(manifest: Dict[str, Any], manifest_path: Path) -> None:
 
     nodes = manifest.get("nodes")
     index = manifest.get("index")
-    if not isinstance(nodes, dict) or not isinstance(index, dict):
+    if not isinstance(nodes, Mapping) or not isinstance(index, dict):
         raise ManifestError(f"Invalid manifest structure (missing nodes/index): {manifest_path}")
 
 
@@ -149,7 +413,7 @@ def _normalize_type(type_name: Optional[str]) -> str:
 
 
 def _pick_nodedef(
-    manifest: Dict[str, Any],
+    manifest: Mapping[str, Any],
     candidates: List[str],
     prefer_non_half: bool = True,
 ) -> Optional[str]:
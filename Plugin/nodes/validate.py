@@ -2,14 +2,17 @@
 RealityKit material validation and enforcement helpers.
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Tuple
 
 from . import metadata
+from ..core.material_ir import get_material_ir, group_used_nodes
 
 
 ALLOWED_UI_TYPES = {
     'FRAME',
     'REROUTE',
+    'GROUP_INPUT',
+    'GROUP_OUTPUT',
 }
 
 SUPPORTED_TYPES = {
@@ -144,93 +147,98 @@ def validate_material(
         "warning_nodes": [],
     }
 
-    if not material or not material.use_nodes or not material.node_tree:
+    if not material:
+        return result
+
+    ir = get_material_ir(material)
+    if not ir.has_node_tree:
         return result
 
     if only_connected:
-        used_nodes = _collect_used_nodes(material)
+        used_nodes = list(ir.used_nodes)
+        if ir.active_output is not None and ir.active_output not in used_nodes:
+            used_nodes.append(ir.active_output)
     else:
-        used_nodes = set(material.node_tree.nodes)
-
-    def add_issue(kind: str, node, message: str, force_error: bool = False) -> None:
-        target = "errors" if force_error else kind
-        _add_issue(result, target, node, message)
-
-    for node in used_nodes:
+        used_nodes = ir.nodes
+
+    # Ordinary node groups are validated through their interior nodes. Each tree
+    # is walked once; its issues are reported on every top-level group node that
+    # uses it, so the select/remove operators act on something in the material's
+    # node tree.
+    tree_issues: Dict[Any, List[Tuple[str, str, Any, str]]] = {}
+
+    def group_issues(node_tree) -> List[Tuple[str, str, Any, str]]:
+        key = node_tree.as_pointer()
+        if key not in tree_issues:
+            tree_issues[key] = []
+            group_nodes = group_used_nodes(node_tree) if only_connected else list(node_tree.nodes)
+            tree_issues[key] = [
+                (kind, inner_tree or node_tree.name, issue_node, message)
+                for group_node in group_nodes
+                for kind, inner_tree, issue_node, message in node_issues(group_node)
+            ]
+        return tree_issues[key]
+
+    def node_issues(node) -> List[Tuple[str, str, Any, str]]:
+        """Return (kind, group tree name or "", node, message) issues for one node."""
         node_type = getattr(node, "type", "")
-        node_name = getattr(node, "name", node_type)
+
+        def issue(kind: str, message: str, force_error: bool = False):
+            return [("errors" if force_error else kind, "", node, message)]
 
         if node_type in ALLOWED_UI_TYPES:
-            continue
+            return []
 
         if node_type == 'GROUP':
             if _is_rk_group(node):
-                continue
-            add_issue("errors", node, "Non-RealityKit node group used.")
-            continue
+                return []
+            node_tree = getattr(node, "node_tree", None)
+            if node_tree is None:
+                return issue("errors", "Node group has no node tree.")
+            return group_issues(node_tree)
 
         if node_type in SUPPORTED_TYPES:
             if node_type == 'TEX_IMAGE' and getattr(node, "image", None) is None:
-                add_issue(
-                    "warnings",
-                    node,
-                    "Image Texture node has no image.",
-                    force_error=strict,
-                )
-            continue
+                return issue("warnings", "Image Texture node has no image.", force_error=strict)
+            return []
 
         if node_type in SHADERGRAPH_SUPPORTED_TYPES:
-            add_issue(
-                "errors",
-                node,
-                "Node is supported by ShaderGraph but not yet mapped by the exporter.",
-            )
-            continue
+            return issue("errors", "Node is supported by ShaderGraph but not yet mapped by the exporter.")
 
         if node_type in {'MIX_RGB', 'MIX'}:
             if _is_identity_mix(node):
-                continue
-            add_issue(
+                return []
+            return issue(
                 "warnings",
-                node,
                 "Mix node requires baking unless Factor is 0/1 with a passthrough input.",
                 force_error=strict,
             )
-            continue
 
         if node_type == 'MATH':
             if _is_identity_math_node(node):
-                continue
-            add_issue(
+                return []
+            return issue(
                 "warnings",
-                node,
                 "Math node requires baking unless it is a pass-through (add 0, subtract 0, multiply 1, divide 1).",
                 force_error=strict,
             )
-            continue
 
         if node_type in PARTIAL_TYPES:
-            add_issue(
-                "warnings",
-                node,
-                "Node has limited support; UV mapping is only applied for Image Texture inputs.",
-            )
-            continue
+            return issue("warnings", "Node has limited support; UV mapping is only applied for Image Texture inputs.")
 
         if node_type in BAKE_TYPES:
-            add_issue(
-                "warnings",
-                node,
-                "Node requires baking for RealityKit.",
-                force_error=strict,
-            )
-            continue
+            return issue("warnings", "Node requires baking for RealityKit.", force_error=strict)
 
         if node_type in UNSUPPORTED_TYPES:
-            add_issue("errors", node, "Node is not supported by RealityKit export.")
-            continue
+            return issue("errors", "Node is not supported by RealityKit export.")
+
+        return issue("errors", "Node type is unrecognized by the exporter.")
 
-        add_issue("errors", node, "Node type is unrecognized by the exporter.")
+    for node in used_nodes:
+        for kind, tree_name, issue_node, message in node_issues(node):
+            if tree_name:
+                message = f"Inside node group '{tree_name}', node '{issue_node.name}': {message}"
+            _add_issue(result, kind, node, message)
 
     result["ok"] = not result["errors"]
     return result
@@ -314,7 +322,8 @@ def _add_issue(result: Dict[str, object], kind: str, node, message: str) -> None
         "node_name": getattr(node, "name", ""),
         "node_type": getattr(node, "type", ""),
         "message": message,
-        "node": node,
+        # Keep the real bpy node: operators select/remove it from the node tree.
+        "node": getattr(node, "bpy_node", node),
     }
     result[kind].append(entry)
     if kind == "errors":
@@ -334,46 +343,6 @@ def _is_rk_group(node) -> bool:
     return metadata.is_catalog_group_name(name)
 
 
-def _collect_used_nodes(material) -> Set[object]:
-    node_tree = material.node_tree
-    used_nodes: Set[object] = set()
-
-    output_nodes = [n for n in node_tree.nodes if n.type == 'OUTPUT_MATERIAL']
-    if not output_nodes:
-        return used_nodes
-
-    active_output = None
-    for node in output_nodes:
-        if getattr(node, "is_active_output", False):
-            active_output = node
-            break
-    if not active_output:
-        active_output = output_nodes[0]
-
-    def visit(node):
-        if node in used_nodes:
-            return
-        used_nodes.add(node)
-        for input_socket in getattr(node, "inputs", []):
-            if not input_socket.is_linked:
-                continue
-            for link in input_socket.links:
-                from_node = link.from_node
-                if from_node:
-                    visit(from_node)
-
-    for socket_name in ("Surface", "Volume", "Displacement"):
-        socket = active_output.inputs.get(socket_name)
-        if not socket or not socket.is_linked:
-            continue
-        for link in socket.links:
-            if link.from_node:
-                visit(link.from_node)
-
-    used_nodes.add(active_output)
-    return used_nodes
-
-
 def _is_identity_mix(node) -> bool:
     """Return True when a Mix/MixRGB node is a passthrough."""
     if not node or getattr(node, "type", "") not in {'MIX', 'MIX_RGB'}:
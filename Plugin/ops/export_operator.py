@@ -79,6 +79,14 @@ class BLENDERTORCP_OT_export(Operator, ExportHelper):
     
     def execute(self, context):
         """Execute the export"""
+        from ..core.material_ir import material_ir_scope
+
+        # Validation, warnings and extraction share one node-tree snapshot per material.
+        with material_ir_scope():
+            return self._run_export(context)
+
+    def _run_export(self, context):
+        """Validate materials, export, post-process and package."""
         import sys
         
         # Validate filepath
@@ -122,6 +130,7 @@ class BLENDERTORCP_OT_export(Operator, ExportHelper):
                     self.report({'ERROR'}, f"{error_count - 6} more errors in '{material.name}'.")
                 return {'CANCELLED'}
 
+        temp_usd_path = None
         try:
             # Import export modules
             from ..export import blender_usd_export, postprocess_usd, pack_usdz, diagnostics
@@ -144,11 +153,13 @@ class BLENDERTORCP_OT_export(Operator, ExportHelper):
             
             # Step 2: Post-process USD (material rewrite, etc.)
             self.report({'INFO'}, "Rewriting materials to RealityKit ShaderGraph...")
+            # Non-USDZ output is converted from the binary intermediate here, once.
             postprocess_usd.process_usd_stage(
                 temp_usd_path,
                 settings,
                 context,
-                diag
+                diag,
+                output_path=None if settings.export_format == 'USDZ' else self.filepath,
             )
             
             # Fail fast on strict export errors before packaging.
@@ -173,11 +184,6 @@ class BLENDERTORCP_OT_export(Operator, ExportHelper):
                     context,
                     diag
                 )
-            else:
-                # Just copy/move the USD file to final location
-                import shutil
-                if temp_usd_path != self.filepath:
-                    shutil.move(temp_usd_path, self.filepath)
             
             # Save diagnostics if enabled
             if prefs and prefs.enable_diagnostics:
@@ -201,6 +207,11 @@ class BLENDERTORCP_OT_export(Operator, ExportHelper):
             self.report({'ERROR'}, f"Export failed: {str(e)}")
             traceback.print_exc()
             return {'CANCELLED'}
+        finally:
+            # Non-USDZ output was written by post-processing; the intermediate
+            # (and, for USDZ, the staged files already packed) can go.
+            if temp_usd_path:
+                blender_usd_export.remove_temp_export(temp_usd_path)
     
 class BLENDERTORCP_OT_show_diagnostics(Operator):
     """Show export diagnostics"""
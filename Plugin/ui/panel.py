@@ -422,6 +422,45 @@ class BlenderToRCPExportSettings(PropertyGroup):
         options={'HIDDEN'},
         update=_on_settings_changed,
     )
+
+    cache_materials: BoolProperty(
+        name="Cache Materials",
+        description="Reuse converted materials from previous exports when their node trees are unchanged (stored in the user cache directory)",
+        default=False,
+        update=_on_settings_changed,
+    )
+
+    dedupe_materials: BoolProperty(
+        name="Deduplicate Materials",
+        description="Author one shared material for materials whose converted graphs are identical",
+        default=False,
+        update=_on_settings_changed,
+    )
+
+    use_material_library: BoolProperty(
+        name="Material Library",
+        description="Author converted materials once into a sidecar library layer (<name>.materials.usdc) next to the export and reference them from the scene; re-exports reuse its entries",
+        default=False,
+        update=_on_settings_changed,
+    )
+
+    material_library_format: EnumProperty(
+        name="Library Format",
+        description="File format of the sidecar material library",
+        items=[
+            ('USDC', "USD Binary (.usdc)", "Write the library as <name>.materials.usdc"),
+            ('USDA', "USD ASCII (.usda)", "Write the library as <name>.materials.usda"),
+        ],
+        default='USDC',
+        update=_on_settings_changed,
+    )
+
+    use_material_templates: BoolProperty(
+        name="Material Templates",
+        description="Author materials that share a node layout by copying one template network and patching its values (experimental)",
+        default=False,
+        update=_on_settings_changed,
+    )
     
 
     last_diagnostics_path: StringProperty(
@@ -604,6 +643,12 @@ class BLENDERTORCP_PT_export_usd_general(Panel):
         layout.prop(settings, "xform_op_mode")
         layout.prop(settings, "evaluation_mode")
         layout.prop(settings, "use_instancing")
+        layout.prop(settings, "cache_materials")
+        layout.prop(settings, "dedupe_materials")
+        layout.prop(settings, "use_material_library")
+        if settings.use_material_library:
+            layout.prop(settings, "material_library_format")
+        layout.prop(settings, "use_material_templates")
 
 
 class BLENDERTORCP_PT_export_usd_object_types(Panel):
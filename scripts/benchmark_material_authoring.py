@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark MaterialX material authoring.
+
+Authors the same synthetic materials (textured PBR graphs with normal maps,
+channel splits and UV transforms) into an in-memory stage directly through
+`create_materialx_material()` and through `MaterialTemplates`, reports wall
+time per run, and checks that both stages serialize to identical layers.
+
+Requires the OpenUSD Python bindings (`pxr`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from Plugin.export.usd_utils import Usd, UsdGeom, require_pxr  # noqa: E402
+from Plugin.export.materials.author import create_materialx_material  # noqa: E402
+from Plugin.export.materials.graph import MaterialXGraphBuilder  # noqa: E402
+from Plugin.export.materials.templates import MaterialTemplates  # noqa: E402
+from Plugin.manifest.materialx_nodes import load_manifest  # noqa: E402
+
+
+def main() -> int:
+    args = _parse_args()
+    require_pxr()
+    manifest = load_manifest()
+    graphs = _build_graphs(manifest, args.materials)
+
+    report: Dict[str, Any] = {"materials": args.materials, "repeat": args.repeat, "backends": {}}
+    layers: Dict[str, str] = {}
+    for backend in ("usd", "templates"):
+        timings: List[float] = []
+        for _ in range(args.repeat):
+            stage = _make_stage(args.materials)
+            start = time.perf_counter()
+            if backend == "templates":
+                templates = MaterialTemplates()
+                for index, graph in enumerate(graphs):
+                    templates.author(stage, _material_path(index), f"Material_{index}", graph, manifest)
+            else:
+                for index, graph in enumerate(graphs):
+                    create_materialx_material(stage, _material_path(index), f"Material_{index}", graph, manifest)
+            timings.append(time.perf_counter() - start)
+        layers[backend] = stage.GetRootLayer().ExportToString()
+        report["backends"][backend] = {
+            "best_seconds": round(min(timings), 4),
+            "mean_seconds": round(sum(timings) / len(timings), 4),
+        }
+
+    baseline = report["backends"]["usd"]["best_seconds"]
+    for stats in report["backends"].values():
+        stats["speedup_vs_usd"] = round(baseline / stats["best_seconds"], 2) if stats["best_seconds"] else None
+    report["identical_layers"] = len(set(layers.values())) == 1
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical_layers"] else 1
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--materials", type=int, default=500, help="Number of materials to author.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode (best time is reported).")
+    return parser.parse_args()
+
+
+def _material_path(index: int) -> str:
+    return f"/Root/Materials/Material_{index}"
+
+
+def _make_stage(count: int):
+    stage = Usd.Stage.CreateInMemory()
+    UsdGeom.Xform.Define(stage, "/Root")
+    stage.DefinePrim("/Root/Materials", "Scope")
+    for index in range(count):
+        stage.DefinePrim(_material_path(index), "Material")
+    return stage
+
+
+def _build_graphs(manifest, count: int) -> List[Dict[str, Any]]:
+    builder = MaterialXGraphBuilder(manifest)
+    graphs = []
+    for index in range(count):
+        material_data = {
+            "name": f"Material_{index}",
+            "type": "principled",
+            "base_color_texture": f"textures/albedo_{index % 50}.png",
+            "base_color_texture_colorspace": "srgb",
+            "base_color_texture_mapping": {"offset": (0.1, 0.0), "scale": (2.0, 2.0), "rotate": 0.0},
+            "roughness_texture": f"textures/orm_{index % 50}.png",
+            "roughness_texture_channel": "g",
+            "metallic_texture": f"textures/orm_{index % 50}.png",
+            "metallic_texture_channel": "b",
+            "normal_texture": f"textures/normal_{index % 50}.png",
+            "normal_texture_scale": 0.8,
+            "specular": 0.5,
+            "alpha": 1.0,
+        }
+        builder.begin_material()
+        graphs.append(builder.build_pbr_material(material_data))
+    return graphs
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
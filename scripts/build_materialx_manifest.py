@@ -7,16 +7,32 @@ index consumed by the add-on at runtime:
 
   `Plugin/manifest/rk_nodes_manifest.json`
 
+plus a precompiled binary copy (`rk_nodes_manifest.bin`) that the add-on loads
+instead of parsing the JSON while its source hash still matches.
+
+`.mtlx` files are parsed in a process pool, and per-file parse results are cached
+by content hash (`.cache/materialx_manifest/parse_cache.json` by default), so a
+rebuild only re-parses definition files that changed. Results are merged in
+sorted file order, so the output does not depend on worker scheduling.
+
 The add-on intentionally does NOT rebuild this manifest inside Blender.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
+import sys
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Bump when `_extract_nodedef_info` output changes so cached parses are discarded.
+PARSE_CACHE_VERSION = 1
 
 
 # Policy flags based on Apple's README / observed RealityKit behavior.
@@ -64,9 +80,32 @@ def main() -> int:
         action="store_true",
         help="Include .mtlx files with 'half' in their filename (RealityKit half libraries).",
     )
+    parser.add_argument(
+        "--no-compiled",
+        action="store_true",
+        help="Skip writing the precompiled binary manifest next to the JSON.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for parsing .mtlx files (default: CPU count, 1 = serial).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".cache/materialx_manifest",
+        help="Directory for the per-file parse cache.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every .mtlx file and do not read or write the parse cache.",
+    )
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    from Plugin.manifest.compiled import compiled_path_for, write_compiled_manifest
 
     source_dir = Path(args.source)
     if not source_dir.is_absolute():
@@ -78,15 +117,40 @@ def main() -> int:
         output_path = repo_root / output_path
     output_path = output_path.resolve()
 
-    manifest = build_manifest(repo_root, source_dir, include_half=bool(args.include_half))
+    cache_path: Optional[Path] = None
+    if not args.no_cache:
+        cache_dir = Path(args.cache_dir)
+        if not cache_dir.is_absolute():
+            cache_dir = repo_root / cache_dir
+        cache_path = cache_dir / "parse_cache.json"
+
+    manifest = build_manifest(
+        repo_root,
+        source_dir,
+        include_half=bool(args.include_half),
+        jobs=args.jobs,
+        cache_path=cache_path,
+    )
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(manifest, indent=2))
+    source_text = json.dumps(manifest, indent=2)
+    output_path.write_text(source_text)
 
     print(f"Wrote {len(manifest.get('nodes', {}))} nodedefs -> {output_path}")
+
+    if not args.no_compiled:
+        compiled_path = compiled_path_for(output_path)
+        write_compiled_manifest(manifest, source_text.encode("utf-8"), compiled_path)
+        print(f"Wrote precompiled manifest -> {compiled_path}")
     return 0
 
 
-def build_manifest(repo_root: Path, source_dir: Path, include_half: bool) -> Dict[str, Any]:
+def build_manifest(
+    repo_root: Path,
+    source_dir: Path,
+    include_half: bool,
+    jobs: int = 1,
+    cache_path: Optional[Path] = None,
+) -> Dict[str, Any]:
     if not source_dir.exists():
         raise SystemExit(f"MaterialX source directory not found: {source_dir}")
 
@@ -108,31 +172,106 @@ def build_manifest(repo_root: Path, source_dir: Path, include_half: bool) -> Dic
         },
     }
 
+    cache = _load_parse_cache(cache_path)
+    parsed = _parse_mtlx_files(repo_root, mtlx_files, cache, jobs)
+    if cache_path is not None:
+        _save_parse_cache(cache_path, cache)
+
+    # Merge in sorted file order so the result matches a serial build exactly.
     for mtlx_file in mtlx_files:
-        _parse_mtlx_file(repo_root, manifest, mtlx_file)
+        for node_info in parsed.get(mtlx_file, []):
+            manifest["nodes"][node_info["nodedef_name"]] = node_info
+            _index_node(manifest, node_info)
         manifest["metadata"]["source_files"].append(_format_source_path(repo_root, mtlx_file))
 
     return manifest
 
 
-def _parse_mtlx_file(repo_root: Path, manifest: Dict[str, Any], filepath: Path) -> None:
+def _parse_mtlx_files(
+    repo_root: Path,
+    mtlx_files: List[Path],
+    cache: Dict[str, Any],
+    jobs: int,
+) -> Dict[Path, List[Dict[str, Any]]]:
+    """Parse `.mtlx` files, reusing cached results whose content hash matches."""
+    parsed: Dict[Path, List[Dict[str, Any]]] = {}
+    pending: List[Tuple[Path, str]] = []
+    used_keys = set()
+
+    for mtlx_file in mtlx_files:
+        key = _parse_cache_key(repo_root, mtlx_file)
+        used_keys.add(key)
+        if key in cache:
+            parsed[mtlx_file] = cache[key]
+        else:
+            pending.append((mtlx_file, key))
+
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    workers = min(workers, len(pending))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_mtlx_file, [repo_root] * len(pending), [path for path, _ in pending]))
+    else:
+        results = [_parse_mtlx_file(repo_root, path) for path, _ in pending]
+
+    for (mtlx_file, key), node_infos in zip(pending, results):
+        parsed[mtlx_file] = node_infos
+        if node_infos is not None:
+            cache[key] = node_infos
+
+    for key in list(cache):
+        if key not in used_keys:
+            del cache[key]
+
+    print(f"Parsed {len(pending)} .mtlx file(s), reused {len(mtlx_files) - len(pending)} from cache")
+    return {path: infos or [] for path, infos in parsed.items()}
+
+
+def _parse_mtlx_file(repo_root: Path, filepath: Path) -> Optional[List[Dict[str, Any]]]:
+    """Return nodedef entries for one file, or None if it failed to parse."""
     try:
         tree = ET.parse(filepath)
-        root = tree.getroot()
-
-        ns_uri = _get_namespace_uri(root.tag)
-        ns = {"mx": ns_uri} if ns_uri else None
-
-        nodedefs = root.findall(".//mx:nodedef", ns) if ns else root.findall(".//nodedef")
-        for nodedef in nodedefs:
-            node_info = _extract_nodedef_info(repo_root, nodedef, ns, filepath)
-            if not node_info:
-                continue
-            nodedef_name = node_info["nodedef_name"]
-            manifest["nodes"][nodedef_name] = node_info
-            _index_node(manifest, node_info)
     except ET.ParseError as exc:
         print(f"Warning: Failed to parse {filepath}: {exc}")
+        return None
+
+    root = tree.getroot()
+    ns_uri = _get_namespace_uri(root.tag)
+    ns = {"mx": ns_uri} if ns_uri else None
+
+    node_infos: List[Dict[str, Any]] = []
+    nodedefs = root.findall(".//mx:nodedef", ns) if ns else root.findall(".//nodedef")
+    for nodedef in nodedefs:
+        node_info = _extract_nodedef_info(repo_root, nodedef, ns, filepath)
+        if node_info:
+            node_infos.append(node_info)
+    return node_infos
+
+
+def _parse_cache_key(repo_root: Path, filepath: Path) -> str:
+    """Hash file content plus the inputs that shape `_extract_nodedef_info` output."""
+    digest = hashlib.sha256()
+    digest.update(f"{PARSE_CACHE_VERSION}\0{_format_source_path(repo_root, filepath)}\0".encode("utf-8"))
+    digest.update(filepath.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_parse_cache(cache_path: Optional[Path]) -> Dict[str, Any]:
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        data = json.loads(cache_path.read_text())
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != PARSE_CACHE_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_parse_cache(cache_path: Path, cache: Dict[str, Any]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps({"version": PARSE_CACHE_VERSION, "entries": cache}))
 
 
 def _extract_nodedef_info(
@@ -0,0 +1,122 @@
+"""Minimal stand-ins for Blender node trees, enough for the material extractors."""
+
+import itertools
+
+_pointers = itertools.count(1)
+
+
+class Obj:
+    """Attribute bag with a stable `as_pointer()`, like a bpy struct."""
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+        self._pointer = next(_pointers)
+
+    def as_pointer(self):
+        return self._pointer
+
+
+class Collection(list):
+    """List with bpy_prop_collection-style lookup by name."""
+
+    def get(self, name, default=None):
+        for item in self:
+            if item.name == name:
+                return item
+        return default
+
+    def items(self):
+        return [(item.name, item) for item in self]
+
+
+class Socket(Obj):
+    def __init__(self, name, default=None, **attrs):
+        super().__init__(name=name, identifier=name, **attrs)
+        if default is not None:
+            self.default_value = default
+        self.links = []
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+
+class Node(Obj):
+    def __init__(self, name, type, inputs=(), outputs=(), **attrs):
+        super().__init__(name=name, type=type, label="", **attrs)
+        self._properties = tuple(attrs)
+        self.inputs = Collection(inputs)
+        self.outputs = Collection(outputs)
+        for socket in (*self.inputs, *self.outputs):
+            socket.node = self
+
+    @property
+    def bl_rna(self):
+        """RNA description listing the node's own properties (the extra constructor attributes)."""
+        return Obj(properties=[_rna_property(key, getattr(self, key)) for key in self._properties])
+
+
+class NodeTree(Obj):
+    def __init__(self, name="NodeTree", properties=None, **attrs):
+        super().__init__(name=name, name_full=name, nodes=Collection(), links=[], **attrs)
+        self.properties = dict(properties or {})
+
+    def get(self, key, default=None):
+        """ID property lookup, like `bpy.types.ID.get`."""
+        return self.properties.get(key, default)
+
+    def keys(self):
+        return list(self.properties)
+
+    def node(self, name, type, inputs=(), outputs=("Out",), **attrs):
+        """Add a node; sockets are names or (name, default_value) pairs."""
+        node = Node(name, type, [_socket(spec, 0.0) for spec in inputs], [_socket(spec) for spec in outputs], **attrs)
+        self.nodes.append(node)
+        return node
+
+    def link(self, from_socket, to_socket):
+        link = Obj(from_node=from_socket.node, from_socket=from_socket, to_node=to_socket.node, to_socket=to_socket)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        self.links.append(link)
+        return link
+
+
+def material(tree, name="Material"):
+    return Obj(name=name, use_nodes=True, node_tree=tree, blend_method="OPAQUE", diffuse_color=(1, 1, 1, 1))
+
+
+def image(path, packed_data=None):
+    """Image datablock for `path`; `packed_data` bytes make it a packed image."""
+    packed_file = None if packed_data is None else Obj(data=packed_data, size=len(packed_data))
+    return Obj(
+        name=path.stem,
+        name_full=path.stem,
+        source="FILE",
+        filepath=str(path),
+        filepath_raw=str(path),
+        file_format="PNG",
+        packed_file=packed_file,
+        colorspace_settings=Obj(name="sRGB"),
+        alpha_mode="STRAIGHT",
+    )
+
+
+def _socket(spec, default=None):
+    if isinstance(spec, tuple):
+        return Socket(*spec)
+    return Socket(spec, default)
+
+
+def _rna_property(identifier, value):
+    if hasattr(value, "as_pointer"):
+        prop_type = "POINTER"
+    elif isinstance(value, bool):
+        prop_type = "BOOLEAN"
+    elif isinstance(value, int):
+        prop_type = "INT"
+    elif isinstance(value, float):
+        prop_type = "FLOAT"
+    else:
+        prop_type = "STRING"
+    return Obj(identifier=identifier, type=prop_type, is_readonly=False)
@@ -0,0 +1,76 @@
+"""Asset path staging for paths authored in sublayers and referenced layers."""
+
+import os
+
+import pytest
+
+pytest.importorskip("pxr")
+
+from pxr import Sdf, Usd
+
+from Plugin.export.usd_asset_paths import scan_asset_paths, stage_dependencies
+from Plugin.export.usd_assets import prepare_assets
+from Plugin.export.usd_textures import prepare_textures
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(data)
+    return path
+
+
+def _scene_with_referenced_layer(tmp_path):
+    """Root and a referenced layer in `sub/` both author `./tex/a.png`, meaning different files."""
+    _write(tmp_path / "tex" / "a.png", "root texture")
+    _write(tmp_path / "sub" / "tex" / "a.png", "referenced texture")
+    _write(tmp_path / "sub" / "cache.abc", "referenced cache")
+
+    ref_layer = Sdf.Layer.CreateNew(str(tmp_path / "sub" / "ref.usda"))
+    ref_stage = Usd.Stage.Open(ref_layer)
+    prim = ref_stage.DefinePrim("/Ref", "Xform")
+    prim.CreateAttribute("inputs:file", Sdf.ValueTypeNames.Asset).Set(Sdf.AssetPath("./tex/a.png"))
+    prim.CreateAttribute("cache", Sdf.ValueTypeNames.Asset).Set(Sdf.AssetPath("./cache.abc"))
+    ref_layer.Save()
+
+    usd_path = tmp_path / "scene.usda"
+    stage = Usd.Stage.CreateNew(str(usd_path))
+    stage.DefinePrim("/Root", "Xform")
+    stage.DefinePrim("/Root/A", "Xform").GetReferences().AddReference("./sub/ref.usda", "/Ref")
+    root_prim = stage.DefinePrim("/Root/B", "Xform")
+    root_prim.CreateAttribute("inputs:file", Sdf.ValueTypeNames.Asset).Set(Sdf.AssetPath("./tex/a.png"))
+    stage.Save()
+    return usd_path
+
+
+def _staged_text(usd_path, stage, prim_path, attr_name):
+    value = stage.GetPrimAtPath(prim_path).GetAttribute(attr_name).Get()
+    return (usd_path.parent / value.path).read_text()
+
+
+def test_relative_paths_resolve_against_the_authoring_layer(tmp_path):
+    usd_path = _scene_with_referenced_layer(tmp_path)
+    stage = Usd.Stage.Open(str(usd_path))
+    scan = scan_asset_paths(stage)
+
+    prepare_textures(stage, str(usd_path), None, scan=scan)
+    prepare_assets(stage, str(usd_path), scan=scan)
+
+    assert _staged_text(usd_path, stage, "/Root/A", "inputs:file") == "referenced texture"
+    assert _staged_text(usd_path, stage, "/Root/B", "inputs:file") == "root texture"
+    assert _staged_text(usd_path, stage, "/Root/A", "cache") == "referenced cache"
+    # The referenced layer itself is left alone.
+    ref_layer = Sdf.Layer.FindOrOpen(str(tmp_path / "sub" / "ref.usda"))
+    assert ref_layer.GetAttributeAtPath("/Ref.inputs:file").default.path == "./tex/a.png"
+    assert {path for _, path in scan.anchored_paths} == set(scan.paths)
+    assert all(anchor == stage.GetRootLayer() for anchor, _ in scan.anchored_paths)
+
+
+def test_stage_dependencies_agree_with_staging(tmp_path):
+    usd_path = _scene_with_referenced_layer(tmp_path)
+    _, asset_files = stage_dependencies(Usd.Stage.Open(str(usd_path)))
+    expected = {
+        os.path.normpath(str(tmp_path / "tex" / "a.png")),
+        os.path.normpath(str(tmp_path / "sub" / "tex" / "a.png")),
+        os.path.normpath(str(tmp_path / "sub" / "cache.abc")),
+    }
+    assert set(asset_files) == expected
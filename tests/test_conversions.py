@@ -0,0 +1,48 @@
+"""Convert node insertion between MaterialX types."""
+
+import pytest
+
+pytest.importorskip("pxr")
+
+from pxr import Sdf, Usd, UsdShade
+
+from Plugin.export.diagnostics import ExportDiagnostics
+from Plugin.export.materials.conversions import _create_convert_output
+from Plugin.manifest.materialx_nodes import get_conversion_chain, load_manifest
+
+
+def _source_output(stage, type_name):
+    shader = UsdShade.Shader.Define(stage, "/Material/Source")
+    return shader.CreateOutput("out", type_name)
+
+
+def test_multi_hop_chain_inserts_one_convert_per_hop():
+    manifest = load_manifest()
+    stage = Usd.Stage.CreateInMemory()
+    source = _source_output(stage, Sdf.ValueTypeNames.Bool)
+
+    output = _create_convert_output(manifest, stage, "/Material", "base_color", source, "boolean", "color3")
+
+    chain = get_conversion_chain(manifest, "boolean", "color3")
+    assert len(chain) == 2
+    shader = UsdShade.Shader(output.GetPrim())
+    assert shader.GetIdAttr().Get() == chain[-1][0]
+    first = UsdShade.Shader(shader.GetInput("in").GetConnectedSources()[0][0].source.GetPrim())
+    assert first.GetIdAttr().Get() == chain[0][0]
+    assert first.GetInput("in").GetConnectedSources()[0][0].source.GetPrim() == source.GetPrim()
+
+
+def test_missing_chain_keeps_the_connection_unconverted():
+    manifest = load_manifest()
+    assert get_conversion_chain(manifest, "string", "color3") is None
+    stage = Usd.Stage.CreateInMemory()
+    source = _source_output(stage, Sdf.ValueTypeNames.String)
+    diagnostics = ExportDiagnostics()
+
+    output = _create_convert_output(
+        manifest, stage, "/Material", "base_color", source, "string", "color3", diagnostics
+    )
+
+    assert output.GetAttr().GetPath() == source.GetAttr().GetPath()
+    assert [prim.GetName() for prim in stage.GetPrimAtPath("/Material").GetChildren()] == ["Source"]
+    assert any("string -> color3" in warning for warning in diagnostics.data["warnings"])
@@ -0,0 +1,71 @@
+"""Incremental texture staging across repeated exports."""
+
+import pytest
+
+pytest.importorskip("pxr")
+
+from pxr import Sdf, Usd
+
+from Plugin.export.diagnostics import ExportDiagnostics
+from Plugin.export.file_staging import export_work_dir, remove_temp_export
+from Plugin.export.usd_textures import prepare_textures
+
+
+def _export(final_path, texture_paths, keep_staged):
+    """Stage a scene referencing `texture_paths` the way an export does; return the texture stats."""
+    work_dir = export_work_dir(final_path, keep_staged=keep_staged)
+    usd_path = work_dir / "scene.usdc"
+    stage = Usd.Stage.CreateNew(str(usd_path))
+    prim = stage.DefinePrim("/Root", "Xform")
+    for index, texture in enumerate(texture_paths):
+        prim.CreateAttribute(f"inputs:file{index}", Sdf.ValueTypeNames.Asset).Set(Sdf.AssetPath(str(texture)))
+    stage.Save()
+    diagnostics = ExportDiagnostics()
+    prepare_textures(stage, str(usd_path), None, diagnostics)
+    stage.Save()
+    del stage
+    remove_temp_export(str(usd_path))
+    return work_dir, diagnostics.data["staging"]["textures"]
+
+
+def _placed(stats):
+    return sum(stats[strategy]["files"] for strategy in ("reflink", "hardlink", "copy"))
+
+
+@pytest.fixture
+def sources(tmp_path):
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    paths = []
+    for name in ("albedo.png", "normal.png"):
+        path = source_dir / name
+        path.write_bytes(name.encode("utf-8") * 64)
+        paths.append(path)
+    return paths
+
+
+def test_usdz_reexport_skips_unchanged_textures(tmp_path, sources):
+    final_path = tmp_path / "out" / "scene.usdz"
+
+    work_dir, first = _export(final_path, sources, keep_staged=True)
+    assert _placed(first) == 2
+    assert first["unchanged"]["files"] == 0
+    assert not (work_dir / "scene.usdc").exists()
+    assert (work_dir / "textures" / "albedo.png").exists()
+
+    same_dir, second = _export(final_path, sources, keep_staged=True)
+    assert same_dir == work_dir
+    assert _placed(second) == 0
+    assert second["unchanged"]["files"] == 2
+
+    # Paths already pointing at staged copies (e.g. a reused material library
+    # entry) are traced back to their sources through the manifest.
+    _, restaged = _export(final_path, ["textures/albedo.png", "textures/normal.png"], keep_staged=True)
+    assert _placed(restaged) == 0
+    assert restaged["unchanged"]["files"] == 2
+
+
+def test_temporary_export_dir_is_removed(tmp_path, sources):
+    work_dir, stats = _export(tmp_path / "out" / "scene.usdz", sources, keep_staged=False)
+    assert _placed(stats) == 2
+    assert not work_dir.exists()
@@ -0,0 +1,179 @@
+"""Ordinary node groups feeding the Emission and RealityKit-group extraction paths."""
+
+from pathlib import Path
+
+from fake_nodes import NodeTree, image, material
+
+from Plugin.core.material_ir import material_ir_scope
+from Plugin.export.materials.extract import core
+
+
+def _texture_group(tree, image_dir):
+    """Add an ordinary group whose output is an Image Texture inside it."""
+    path = Path(image_dir) / "inner.png"
+    path.write_bytes(b"x")
+    inner = NodeTree("Textured")
+    texture = inner.node("Tex", "TEX_IMAGE", ["Vector"], ["Color"], image=image(path), uv_map="")
+    group_output = inner.node("Group Output", "GROUP_OUTPUT", ["Color"], [])
+    inner.link(texture.outputs[0], group_output.inputs[0])
+    return tree.node("Group", "GROUP", [], ["Color"], node_tree=inner)
+
+
+def _passthrough_tree(name="Passthrough"):
+    """Group tree whose Group Input feeds its Group Output."""
+    inner = NodeTree(name)
+    group_input = inner.node("Group Input", "GROUP_INPUT", [], ["Value"])
+    group_output = inner.node("Group Output", "GROUP_OUTPUT", ["Value"], [])
+    inner.link(group_input.outputs[0], group_output.inputs[0])
+    return inner
+
+
+def _value_group(tree, value, name="Value Group", inner=None):
+    """Add an ordinary group passing its Group Input through, with `value` linked in."""
+    group = tree.node(name, "GROUP", ["Value"], ["Value"], node_tree=inner or _passthrough_tree(name))
+    source = tree.node(f"{name} Source", "VALUE", [], [("Value", value)])
+    tree.link(source.outputs[0], group.inputs[0])
+    return group
+
+
+def _unsupported_tree():
+    """Group tree whose output comes from a node extraction cannot resolve."""
+    inner = NodeTree("Fresnel Group")
+    fresnel = inner.node("Fresnel", "FRESNEL", [("IOR", 1.45)], ["Fac"])
+    group_output = inner.node("Group Output", "GROUP_OUTPUT", ["Value"], [])
+    inner.link(fresnel.outputs[0], group_output.inputs[0])
+    return inner
+
+
+def _principled_material(tree):
+    output = tree.node("Material Output", "OUTPUT_MATERIAL", ["Surface"], [], is_active_output=True)
+    bsdf = tree.node(
+        "Principled BSDF",
+        "BSDF_PRINCIPLED",
+        [("Base Color", (0.8, 0.8, 0.8, 1.0)), ("Metallic", 0.0), ("Roughness", 0.5), ("Alpha", 1.0)],
+        ["BSDF"],
+    )
+    tree.link(bsdf.outputs[0], output.inputs[0])
+    return bsdf
+
+
+def _emission_material(tree):
+    output = tree.node("Material Output", "OUTPUT_MATERIAL", ["Surface"], [], is_active_output=True)
+    emission = tree.node("Emission", "EMISSION", [("Color", (1.0, 1.0, 1.0, 1.0)), ("Strength", 1.0)], ["Emission"])
+    tree.link(emission.outputs[0], output.inputs[0])
+    return emission
+
+
+def test_emission_reads_textures_and_constants_through_groups(tmp_path):
+    tree = NodeTree()
+    emission = _emission_material(tree)
+    tree.link(_texture_group(tree, tmp_path).outputs[0], emission.inputs.get("Color"))
+    tree.link(_value_group(tree, 4.0).outputs[0], emission.inputs.get("Strength"))
+
+    data = core.extract_blender_material_data(material(tree))
+
+    assert data["type"] == "emission"
+    assert Path(data["base_color_texture"]).name.startswith("inner")
+    assert data["emission_strength"] == 4.0
+
+
+def test_rk_inputs_resolve_through_groups(tmp_path):
+    tree = NodeTree()
+    output = tree.node("Material Output", "OUTPUT_MATERIAL", ["Surface"], [], is_active_output=True)
+    rk_tree = NodeTree("RK_Unlit", properties={"rk_node_id": "ND_realitykit_unlit_surfaceshader"})
+    surface = tree.node("RK", "GROUP", ["color", ("opacity", 1.0)], ["out"], node_tree=rk_tree)
+    tree.link(surface.outputs[0], output.inputs[0])
+    tree.link(_texture_group(tree, tmp_path).outputs[0], surface.inputs.get("color"))
+    tree.link(_value_group(tree, 0.25).outputs[0], surface.inputs.get("opacity"))
+
+    data = core.extract_blender_material_data(material(tree))
+
+    inputs = data["rk_graph"]["nodes"][0]["inputs"]
+    assert inputs["color"]["type"] == "texture"
+    assert Path(inputs["color"]["path"]).name.startswith("inner")
+    assert inputs["opacity"] == 0.25
+    assert core._extract_group_inputs(surface) == {"color": inputs["color"], "opacity": 0.25}
+
+
+def test_nested_groups_resolve_textures_and_constants(tmp_path):
+    tree = NodeTree()
+    bsdf = _principled_material(tree)
+    middle = NodeTree("Middle")
+    inner_texture = _texture_group(middle, tmp_path)
+    middle_output = middle.node("Group Output", "GROUP_OUTPUT", ["Color"], [])
+    middle.link(inner_texture.outputs[0], middle_output.inputs[0])
+    outer = tree.node("Outer", "GROUP", [], ["Color"], node_tree=middle)
+    tree.link(outer.outputs[0], bsdf.inputs.get("Base Color"))
+
+    value_middle = NodeTree("Value Middle")
+    value_input = value_middle.node("Group Input", "GROUP_INPUT", [], ["Value"])
+    passthrough = value_middle.node("Inner", "GROUP", ["Value"], ["Value"], node_tree=_passthrough_tree())
+    value_output = value_middle.node("Group Output", "GROUP_OUTPUT", ["Value"], [])
+    value_middle.link(value_input.outputs[0], passthrough.inputs[0])
+    value_middle.link(passthrough.outputs[0], value_output.inputs[0])
+    tree.link(_value_group(tree, 0.3, "Outer Value", value_middle).outputs[0], bsdf.inputs.get("Roughness"))
+
+    data = core.extract_blender_material_data(material(tree))
+
+    assert Path(data["base_color_texture"]).name.startswith("inner")
+    assert data["roughness"] == 0.3
+
+
+def test_shared_group_tree_binds_each_instance_to_its_own_inputs(tmp_path):
+    shared = _passthrough_tree("Shared")
+    first = NodeTree()
+    bsdf = _principled_material(first)
+    tree_roughness = _value_group(first, 0.2, "Roughness Group", shared)
+    tree_metallic = _value_group(first, 0.7, "Metallic Group", shared)
+    first.link(tree_roughness.outputs[0], bsdf.inputs.get("Roughness"))
+    first.link(tree_metallic.outputs[0], bsdf.inputs.get("Metallic"))
+
+    second = NodeTree()
+    emission = _emission_material(second)
+    second.link(_value_group(second, 6.0, "Strength Group", shared).outputs[0], emission.inputs.get("Strength"))
+
+    # One scope, so both materials share the shared tree's template.
+    with material_ir_scope():
+        first_data = core.extract_blender_material_data(material(first, "First"))
+        second_data = core.extract_blender_material_data(material(second, "Second"))
+
+    assert first_data["roughness"] == 0.2
+    assert first_data["metallic"] == 0.7
+    assert second_data["emission_strength"] == 6.0
+
+
+def test_rk_inputs_through_a_shared_group_tree(tmp_path):
+    shared = _passthrough_tree("Shared")
+    tree = NodeTree()
+    output = tree.node("Material Output", "OUTPUT_MATERIAL", ["Surface"], [], is_active_output=True)
+    rk_tree = NodeTree("RK_PBR", properties={"rk_node_id": "ND_realitykit_pbr_surfaceshader"})
+    surface = tree.node("RK", "GROUP", [("metallic", 0.0), ("roughness", 0.5)], ["out"], node_tree=rk_tree)
+    tree.link(surface.outputs[0], output.inputs[0])
+    tree.link(_value_group(tree, 0.9, "Metallic Group", shared).outputs[0], surface.inputs.get("metallic"))
+    tree.link(_value_group(tree, 0.1, "Roughness Group", shared).outputs[0], surface.inputs.get("roughness"))
+
+    with material_ir_scope():
+        inputs = core._extract_group_inputs(surface)
+
+    assert inputs == {"metallic": 0.9, "roughness": 0.1}
+
+
+def test_group_interior_issues_are_reported_for_every_instance():
+    shared = _unsupported_tree()
+    tree = NodeTree()
+    bsdf = _principled_material(tree)
+    for name, input_name in (("Group A", "Roughness"), ("Group B", "Metallic")):
+        group = tree.node(name, "GROUP", [], ["Value"], node_tree=shared)
+        tree.link(group.outputs[0], bsdf.inputs.get(input_name))
+    mat = material(tree)
+
+    with material_ir_scope():
+        warnings = core.collect_material_warnings(mat)
+        data = core.extract_blender_material_data(mat)
+
+    for name in ("Group A", "Group B"):
+        assert any(f"Node group '{name}'" in warning and "Fresnel" in warning for warning in warnings)
+    unresolved = data["unresolved_warnings"]
+    assert len(unresolved) == 2
+    assert any("'Roughness'" in warning and "Group A" in warning for warning in unresolved)
+    assert any("'Metallic'" in warning and "Group B" in warning for warning in unresolved)
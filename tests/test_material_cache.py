@@ -0,0 +1,114 @@
+"""Material extraction cache keys and round trips."""
+
+import os
+
+from fake_nodes import NodeTree, image, material
+
+from Plugin.export.materials.cache import MaterialCache
+from Plugin.export.materials.extract import extract_blender_material_data
+from Plugin.export.materials.graph import MaterialXGraphBuilder
+from Plugin.export.materials.rewrite import _build_material_graph
+from Plugin.manifest.materialx_nodes import load_manifest
+
+
+def _textured_material(texture_image, roughness=0.5, **texture_attrs):
+    """Principled BSDF with an Image Texture on Base Color."""
+    tree = NodeTree()
+    output = tree.node("Material Output", "OUTPUT_MATERIAL", ["Surface"], [], is_active_output=True)
+    bsdf = tree.node(
+        "Principled BSDF",
+        "BSDF_PRINCIPLED",
+        [("Base Color", (0.8, 0.8, 0.8, 1.0)), ("Roughness", roughness), ("Metallic", 0.0), "Normal", ("Alpha", 1.0)],
+        ["BSDF"],
+    )
+    attrs = dict(interpolation="Linear", extension="REPEAT", location=(0.0, 0.0))
+    attrs.update(texture_attrs)
+    texture = tree.node("Tex", "TEX_IMAGE", ["Vector"], ["Color", "Alpha"], image=texture_image, uv_map="", **attrs)
+    tree.link(bsdf.outputs[0], output.inputs[0])
+    tree.link(texture.outputs[0], bsdf.inputs[0])
+    return material(tree)
+
+
+def _png(tmp_path, name="albedo.png", data=b"png-1"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def _key(material_, salt=""):
+    return MaterialCache(os.devnull, salt=salt).key_for(material_)
+
+
+def test_hit_returns_the_fresh_extraction(tmp_path):
+    path = _png(tmp_path)
+    manifest = load_manifest()
+    cache = MaterialCache(tmp_path / "cache", salt="manifest")
+    key = cache.key_for(_textured_material(image(path)))
+    material_data = extract_blender_material_data(_textured_material(image(path)))
+    graph = _build_material_graph(MaterialXGraphBuilder(manifest), material_data, False)
+    cache.put(key, material_data, graph)
+
+    reopened = MaterialCache(tmp_path / "cache", salt="manifest")
+    fresh = _textured_material(image(path))
+    assert reopened.key_for(fresh) == key
+    entry = reopened.get(key)
+    fresh_data = extract_blender_material_data(fresh)
+    assert entry["material_data"] == fresh_data
+    assert entry["graph"] == _build_material_graph(MaterialXGraphBuilder(manifest), fresh_data, False)
+    assert reopened.stats()["hits"] == 1
+
+
+def test_node_property_change_invalidates(tmp_path):
+    path = _png(tmp_path)
+    base = _key(_textured_material(image(path)))
+    assert _key(_textured_material(image(path))) == base
+    assert _key(_textured_material(image(path), interpolation="Closest")) != base
+    assert _key(_textured_material(image(path), extension="CLIP")) != base
+    assert _key(_textured_material(image(path), roughness=0.25)) != base
+
+
+def test_editor_only_change_keeps_the_key(tmp_path):
+    path = _png(tmp_path)
+    base = _key(_textured_material(image(path)))
+    assert _key(_textured_material(image(path), location=(300.0, -40.0))) == base
+
+
+def test_image_file_change_invalidates(tmp_path):
+    path = _png(tmp_path)
+    base = _key(_textured_material(image(path)))
+    path.write_bytes(b"png-2-longer")
+    assert _key(_textured_material(image(path))) != base
+
+    resized = _key(_textured_material(image(path)))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _key(_textured_material(image(path))) != resized
+
+
+def test_packed_image_change_invalidates(tmp_path):
+    path = tmp_path / "packed.png"
+    base = _key(_textured_material(image(path, packed_data=b"pixels-a")))
+    assert _key(_textured_material(image(path, packed_data=b"pixels-a"))) == base
+    # Same size, different bytes.
+    assert _key(_textured_material(image(path, packed_data=b"pixels-b"))) != base
+
+
+def test_manifest_fingerprint_change_misses(tmp_path):
+    path = _png(tmp_path)
+    cache = MaterialCache(tmp_path / "cache", salt="manifest-a")
+    key = cache.key_for(_textured_material(image(path)))
+    cache.put(key, {"type": "principled"}, None)
+
+    updated = MaterialCache(tmp_path / "cache", salt="manifest-b")
+    new_key = updated.key_for(_textured_material(image(path)))
+    assert new_key != key
+    assert updated.get(new_key) is None
+    assert updated.stats()["misses"] == 1
+
+
+def test_generated_image_is_uncacheable(tmp_path):
+    generated = image(tmp_path / "generated.png")
+    generated.source = "GENERATED"
+    cache = MaterialCache(tmp_path / "cache")
+    assert cache.key_for(_textured_material(generated)) is None
+    assert cache.stats()["uncacheable"] == 1
@@ -0,0 +1,110 @@
+"""Shader prim name allocation under a material nodegraph."""
+
+import pytest
+
+pytest.importorskip("pxr")
+
+from pxr import Usd
+
+from Plugin.export.materials.helpers import (
+    ChildNameIndex,
+    _assign_graph_node_names,
+    _convert_shader_name,
+    _image_shader_name,
+    _sanitize_name,
+)
+
+NODEGRAPH = "/Material"
+
+
+def _probe_image_name(stage, nodegraph_path):
+    """The probing loop `_image_shader_name` used before `ChildNameIndex`."""
+    if not stage.GetPrimAtPath(f"{nodegraph_path}/Image"):
+        return "Image"
+    index = 1
+    while stage.GetPrimAtPath(f"{nodegraph_path}/Image_{index}"):
+        index += 1
+    return f"Image_{index}"
+
+
+def _probe_unique_name(stage, nodegraph_path, base_name):
+    candidate = base_name
+    suffix = 1
+    while stage.GetPrimAtPath(f"{nodegraph_path}/{candidate}"):
+        suffix += 1
+        candidate = f"{base_name}_{suffix}"
+    return candidate
+
+
+def _probe_convert_name(stage, nodegraph_path, input_name):
+    base_name = "Convert"
+    if stage.GetPrimAtPath(f"{nodegraph_path}/{base_name}"):
+        base_name = f"Convert_{_sanitize_name(input_name)}"
+    return _probe_unique_name(stage, nodegraph_path, base_name)
+
+
+def _probe_graph_names(stage, nodegraph_path, nodes):
+    name_map = {}
+    used = set()
+    for node in nodes:
+        original = node.get("name") or "node"
+        base = _sanitize_name(original)
+        candidate = base
+        suffix = 1
+        while candidate in used or stage.GetPrimAtPath(f"{nodegraph_path}/{candidate}"):
+            suffix += 1
+            candidate = f"{base}_{suffix}"
+        used.add(candidate)
+        name_map[original] = candidate
+    return name_map
+
+
+def _populated_stage():
+    stage = Usd.Stage.CreateInMemory()
+    stage.DefinePrim(NODEGRAPH, "Material")
+    for name in ("Image", "Image_1", "Image_2", "Image_4", "Convert", "Convert_base_color", "Convert_base_color_3",
+                 "Surface", "Surface_2", "Surface_4", "NormalMap_normal"):
+        stage.DefinePrim(f"{NODEGRAPH}/{name}", "Shader")
+    return stage
+
+
+def test_graph_node_names_match_the_probing_loop():
+    stage = _populated_stage()
+    nodes = [{"name": name} for name in ("Surface", "Surface", "Surface", "Image", "Normal Map", "Surface")]
+
+    expected = _probe_graph_names(stage, NODEGRAPH, nodes)
+    assert _assign_graph_node_names(ChildNameIndex(stage, NODEGRAPH), nodes) == expected
+
+
+def test_allocations_match_the_probing_loop_while_the_nodegraph_grows():
+    stage = _populated_stage()
+    names = ChildNameIndex(stage, NODEGRAPH)
+
+    steps = [
+        ("image", None, True),
+        ("image", None, False),  # cached texture: the name is handed out but never defined
+        ("image", None, True),
+        ("convert", "base_color", True),
+        ("convert", "base_color", True),
+        ("convert", "roughness", True),
+        ("define", "Image_6", True),  # defined without going through the index
+        ("image", None, True),
+        ("image", None, True),
+        ("convert", "base_color", True),
+    ]
+    for kind, argument, define in steps:
+        if kind == "define":
+            stage.DefinePrim(f"{NODEGRAPH}/{argument}", "Shader")
+            continue
+        if kind == "image":
+            expected = _probe_image_name(stage, NODEGRAPH)
+            actual = _image_shader_name(names, "base_color")
+        else:
+            expected = _probe_convert_name(stage, NODEGRAPH, argument)
+            actual = _convert_shader_name(names, argument)
+        assert actual == expected
+        if define:
+            stage.DefinePrim(f"{NODEGRAPH}/{actual}", "Shader")
+
+    children = stage.GetPrimAtPath(NODEGRAPH).GetAllChildrenNames()
+    assert {"Image_3", "Image_5", "Image_7", "Convert_base_color_2", "Convert_roughness"} <= set(children)
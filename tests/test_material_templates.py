@@ -0,0 +1,137 @@
+"""Template-instanced materials author the same layers as direct authoring."""
+
+import pytest
+
+pytest.importorskip("pxr")
+
+from pxr import Usd
+
+from Plugin.export.diagnostics import ExportDiagnostics
+from Plugin.export.materials.author import create_materialx_material
+from Plugin.export.materials.graph import MaterialXGraphBuilder
+from Plugin.export.materials.templates import MaterialTemplates
+from Plugin.manifest.materialx_nodes import load_manifest
+
+
+@pytest.fixture(scope="module")
+def manifest():
+    return load_manifest()
+
+
+def _pbr(manifest, **material_data):
+    builder = MaterialXGraphBuilder(manifest)
+    builder.begin_material()
+    return builder.build_pbr_material(dict({"name": "M", "type": "principled"}, **material_data))
+
+
+def _unlit(manifest, **material_data):
+    builder = MaterialXGraphBuilder(manifest)
+    builder.begin_material()
+    return builder.build_unlit_material(dict({"name": "M", "type": "principled"}, **material_data))
+
+
+def _textured(texture="textures/albedo.png", orm="textures/orm.png", specular=0.5):
+    return {
+        "base_color_texture": texture,
+        "base_color_texture_colorspace": "srgb",
+        "base_color_texture_mapping": {"offset": (0.1, 0.0), "scale": (2.0, 2.0), "rotate": 15.0},
+        "roughness_texture": orm,
+        "roughness_texture_channel": "g",
+        "metallic_texture": orm,
+        "metallic_texture_channel": "b",
+        "normal_texture": "textures/normal.png",
+        "normal_texture_scale": 0.8,
+        "specular": specular,
+        "alpha": 1.0,
+    }
+
+
+def _material_path(index):
+    return f"/Root/Materials/M_{index}"
+
+
+def _author_both(manifest, graphs, existing_children=()):
+    """Author `graphs` directly and through one `MaterialTemplates`; return both layers."""
+    results = []
+    for use_templates in (False, True):
+        stage = Usd.Stage.CreateInMemory()
+        for index in range(len(graphs)):
+            for child in existing_children:
+                stage.DefinePrim(f"{_material_path(index)}/{child}", "Shader")
+        diagnostics = ExportDiagnostics()
+        templates = MaterialTemplates()
+        author = templates.author if use_templates else create_materialx_material
+        for index, graph in enumerate(graphs):
+            author(stage, _material_path(index), f"M_{index}", graph, manifest, diagnostics)
+        results.append((stage.GetRootLayer().ExportToString(), diagnostics.data["warnings"], templates.stats()))
+    (direct, direct_warnings, _), (instanced, instanced_warnings, stats) = results
+    assert instanced == direct
+    assert instanced_warnings == direct_warnings
+    return stats
+
+
+def test_textures_with_mappings(manifest):
+    stats = _author_both(manifest, [_pbr(manifest, **_textured())])
+    assert stats == {"templates": 1, "instances": 1, "authored": 0}
+
+
+def test_multi_hop_convert_chain(manifest):
+    graph = MaterialXGraphBuilder(manifest).build_rk_graph({
+        "nodes": [
+            {"name": "and_1", "node_id": "ND_realitykit_logical_and", "inputs": {"in1": True, "in2": False}},
+            {"name": "pbr_1", "node_id": "ND_realitykit_pbr_surfaceshader", "inputs": {"roughness": 0.4}},
+        ],
+        "connections": [{"from_node": "and_1", "from_output": "out", "to_node": "pbr_1", "to_input": "baseColor"}],
+        "output": "pbr_1",
+    })
+    stats = _author_both(manifest, [graph, graph])
+    assert stats["instances"] == 2
+
+
+def test_ktx_textures(manifest):
+    graphs = [
+        _pbr(manifest, **_textured(texture="textures/albedo.ktx2")),
+        _pbr(manifest, **_textured(texture="textures/other.ktx2")),
+        _pbr(manifest, **_textured(texture="textures/albedo.png")),
+    ]
+    stats = _author_both(manifest, graphs)
+    # The extension is part of the topology.
+    assert stats == {"templates": 2, "instances": 3, "authored": 0}
+
+
+def test_unlit(manifest):
+    graphs = [
+        _unlit(manifest, base_color=(0.2, 0.4, 0.6, 1.0)),
+        _unlit(manifest, base_color_texture="textures/a.png", base_color_texture_colorspace="srgb",
+               blend_method="BLEND", alpha_texture="textures/a.png"),
+    ]
+    _author_both(manifest, graphs)
+
+
+def test_realitykit_nodes(manifest):
+    builder = MaterialXGraphBuilder(manifest)
+    graphs = [
+        builder.build_rk_material(
+            "ND_realitykit_pbr_surfaceshader",
+            {"baseColor": [0.1, 0.2, 0.3], "metallic": 1.0, "clearcoat": 0.25, "hasPremultipliedAlpha": True},
+        ),
+        builder.build_rk_material(
+            "ND_realitykit_unlit_surfaceshader",
+            {"color": {"type": "texture", "path": "textures/a.png", "output_type": "color3"}},
+        ),
+    ]
+    _author_both(manifest, graphs)
+
+
+def test_shared_topology_with_different_constants_and_textures(manifest):
+    graphs = [
+        _pbr(manifest, **_textured()),
+        _pbr(manifest, **_textured(texture="textures/brick.png", orm="textures/brick_orm.png", specular=0.2)),
+    ]
+    stats = _author_both(manifest, graphs)
+    assert stats == {"templates": 1, "instances": 2, "authored": 0}
+
+
+def test_child_name_conflict_falls_back_to_direct_authoring(manifest):
+    stats = _author_both(manifest, [_pbr(manifest, **_textured())], existing_children=("Image",))
+    assert stats == {"templates": 1, "instances": 0, "authored": 1}
@@ -0,0 +1,293 @@
+"""Regression test for `_resolve_socket_value` against the recursive resolver it replaced.
+
+`data/socket_resolver_expected.txt` holds the specs the previous recursive
+implementation produced for `build_cases()`. Deep chains are recorded as a
+digest of their canonical encoding; the old resolver only reached them with a
+raised recursion limit.
+"""
+
+import ast
+import hashlib
+import re
+from pathlib import Path
+
+from fake_nodes import NodeTree, Obj, image
+
+from Plugin.export.materials.extract import core
+
+EXPECTED_PATH = Path(__file__).parent / "data" / "socket_resolver_expected.txt"
+DEEP_CHAIN_LENGTH = 3000
+
+
+def build_cases(image_dir):
+    """Return (name, socket, expected_type) cases, all linked into one sink node."""
+    tree = NodeTree()
+    cases = []
+    sink = tree.node("Sink", "BSDF_PRINCIPLED", [(f"In{index}", 0.0) for index in range(64)], ["BSDF"])
+    slots = iter(sink.inputs)
+
+    def case(name, socket, expected_type=None):
+        slot = next(slots)
+        tree.link(socket, slot)
+        cases.append((name, slot, expected_type))
+
+    def texture(name):
+        path = Path(image_dir) / f"{name}.png"
+        path.write_bytes(b"x")
+        return image(path)
+
+    tex1 = tree.node("Tex1", "TEX_IMAGE", ["Vector"], ["Color", "Alpha"], image=texture("a"), uv_map="")
+    uv_map = tree.node("UVMap", "UVMAP", [], ["UV"], uv_map="UVMap2")
+    mapping = tree.node(
+        "Mapping", "MAPPING", ["Vector"], ["Vector"], translation=(1, 2, 0), rotation=(0, 0, 0.5), scale=(2, 2, 1)
+    )
+    tree.link(uv_map.outputs[0], mapping.inputs[0])
+    tree.link(mapping.outputs[0], tex1.inputs[0])
+    case("image_color", tex1.outputs[0], "color3")
+    case("image_alpha", tex1.outputs[1], "float")
+
+    separate = tree.node("Sep", "SEPARATE_COLOR", ["Color"], ["Red", "Green", "Blue"])
+    tree.link(tex1.outputs[0], separate.inputs[0])
+    case("separate_green", separate.outputs[1], "float")
+    case("separate_blue", separate.outputs[2], "float")
+
+    normal_map = tree.node("NM", "NORMAL_MAP", [("Strength", 0.7), "Color"], ["Normal"], space="TANGENT")
+    tex2 = tree.node("Tex2", "TEX_IMAGE", ["Vector"], ["Color"], image=texture("n"), uv_map="")
+    tree.link(tex2.outputs[0], normal_map.inputs[1])
+    case("normal_map", normal_map.outputs[0], "vector3")
+
+    reroutes = [tree.node(f"R{index}", "REROUTE", ["In"], ["Out"]) for index in range(150)]
+    for downstream, upstream in zip(reroutes, reroutes[1:]):
+        tree.link(upstream.outputs[0], downstream.inputs[0])
+    value = tree.node("Val", "VALUE", [], [("Value", 0.25)])
+    tree.link(value.outputs[0], reroutes[-1].inputs[0])
+    case("reroute_chain", reroutes[0].outputs[0], "float")
+    case("value", value.outputs[0], "float")
+
+    clamp = tree.node("Clamp", "CLAMP", ["Value", ("Min", 0.1), ("Max", 0.9)], ["Result"])
+    tree.link(value.outputs[0], clamp.inputs[0])
+    case("clamp", clamp.outputs[0], "float")
+
+    map_range = tree.node(
+        "MR",
+        "MAP_RANGE",
+        ["Value", ("From Min", 0.0), ("From Max", 1.0), ("To Min", 0.2), ("To Max", 0.8)],
+        ["Result"],
+        clamp=True,
+    )
+    tree.link(separate.outputs[0], map_range.inputs[0])
+    case("map_range", map_range.outputs[0], "float")
+
+    hue_sat = tree.node(
+        "HS", "HUE_SAT", [("Hue", 0.5), ("Saturation", 1.2), ("Value", 1.0), ("Fac", 0.5), "Color"], ["Color"]
+    )
+    tree.link(tex1.outputs[0], hue_sat.inputs[4])
+    case("hue_saturation", hue_sat.outputs[0], "color3")
+
+    invert = tree.node("Inv", "INVERT", [("Fac", 1.0), "Color"], ["Color"])
+    tree.link(tex1.outputs[0], invert.inputs[1])
+    case("invert_float", invert.outputs[0], "float")
+    case("invert_color", invert.outputs[0], "color3")
+
+    bright_contrast = tree.node("BC", "BRIGHTCONTRAST", ["Color", ("Bright", 0.1), ("Contrast", 0.2)], ["Color"])
+    tree.link(tex1.outputs[0], bright_contrast.inputs[0])
+    case("bright_contrast", bright_contrast.outputs[0], "color3")
+
+    ramp = tree.node(
+        "Ramp",
+        "VALTORGB",
+        ["Fac"],
+        ["Color", "Alpha"],
+        color_ramp=Obj(elements=[Obj(color=(0, 0, 0, 1)), Obj(color=(1, 0.5, 0, 0.5))]),
+    )
+    tree.link(value.outputs[0], ramp.inputs[0])
+    case("color_ramp", ramp.outputs[0], "color3")
+
+    curve = tree.node(
+        "Curve",
+        "CURVE_RGB",
+        [("Fac", 1.0), "Color"],
+        ["Color"],
+        mapping=Obj(curves=[Obj(points=[Obj(location=(0, 0)), Obj(location=(1, 0.8))])] * 4),
+    )
+    tree.link(tex1.outputs[0], curve.inputs[1])
+    case("rgb_curve", curve.outputs[0], "color3")
+
+    to_bw = tree.node("BW", "RGBTOBW", ["Color"], ["Val"])
+    tree.link(tex2.outputs[0], to_bw.inputs[0])
+    case("rgb_to_bw", to_bw.outputs[0], "float")
+
+    combine = tree.node("CC", "COMBINE_COLOR", ["Red", ("R", 0.1), ("G", 0.2), ("B", 0.3)], ["Color"], mode="RGB")
+    tree.link(value.outputs[0], combine.inputs[1])
+    tree.link(to_bw.outputs[0], combine.inputs[2])
+    case("combine_color", combine.outputs[0], "color3")
+
+    rotate = tree.node("VR", "VECTOR_ROTATE", ["Vector", ("Axis", (0, 1, 0)), ("Angle", 0.3)], ["Vector"])
+    tree.link(mapping.outputs[0], rotate.inputs[0])
+    case("vector_rotate", rotate.outputs[0], "vector3")
+
+    transform = tree.node("VT", "VECTOR_TRANSFORM", ["Vector"], ["Vector"], vector_type="NORMAL")
+    tree.link(rotate.outputs[0], transform.inputs[0])
+    case("vector_transform", transform.outputs[0], "vector3")
+
+    normal = tree.node("Nrm", "NORMAL", [], [("Normal", (0, 0, 1))])
+    case("normal", normal.outputs[0], "vector3")
+
+    noise = tree.node(
+        "Noise",
+        "TEX_NOISE",
+        ["Vector", ("Scale", 5.0), ("Detail", 2.0), ("Roughness", 0.5), ("Distortion", 0.0)],
+        ["Fac"],
+    )
+    case("noise", noise.outputs[0], "float")
+
+    voronoi = tree.node("Vor", "TEX_VORONOI", ["Vector", ("Randomness", 1.0)], ["Distance"])
+    tree.link(mapping.outputs[0], voronoi.inputs[0])
+    case("voronoi", voronoi.outputs[0], "float")
+
+    musgrave = tree.node(
+        "Mus", "TEX_MUSGRAVE", ["Vector", ("Detail", 2.0), ("Lacunarity", 2.0), ("Dimension", 0.5)], ["Fac"]
+    )
+    case("musgrave", musgrave.outputs[0], "float")
+
+    gradient = tree.node("Grad", "TEX_GRADIENT", ["Vector"], ["Fac"])
+    case("gradient", gradient.outputs[0], "float")
+
+    rgb = tree.node("RGB", "RGB", [], [("Color", (0.1, 0.2, 0.3, 1))])
+    case("rgb", rgb.outputs[0], "color3")
+
+    mix = tree.node("Mix", "MIX", [("Factor", 0.0), "A", "B"], ["Result"])
+    tree.link(rgb.outputs[0], mix.inputs[1])
+    case("mix_identity", mix.outputs[0], "color3")
+
+    mix2 = tree.node("Mix2", "MIX", [("Factor", 0.4), "A", "B"], ["Result"])
+    tree.link(rgb.outputs[0], mix2.inputs[1])
+    case("mix", mix2.outputs[0], "color3")
+
+    multiply = tree.node("Math", "MATH", ["V1", ("V2", 1.0)], ["Value"], operation="MULTIPLY")
+    tree.link(value.outputs[0], multiply.inputs[0])
+    case("math_identity", multiply.outputs[0], "float")
+
+    power = tree.node("Math2", "MATH", ["V1", ("V2", 3.0)], ["Value"], operation="POWER")
+    tree.link(value.outputs[0], power.inputs[0])
+    case("math_power", power.outputs[0], "float")
+
+    wave = tree.node("Wave", "TEX_WAVE", ["Vector"], ["Color"])
+    clamp2 = tree.node("Clamp2", "CLAMP", ["Value", "Min", "Max"], ["Result"])
+    tree.link(value.outputs[0], clamp2.inputs[0])
+    tree.link(wave.outputs[0], clamp2.inputs[2])
+    tree.link(value.outputs[0], clamp2.inputs[1])
+    case("clamp_unsupported_input", clamp2.outputs[0], "float")
+    case("unsupported_node", wave.outputs[0], "color3")
+
+    group_tree = NodeTree()
+    group_output = group_tree.node("GOut", "GROUP_OUTPUT", ["Color"], [])
+    group = tree.node("Group", "GROUP", [], ["Color"], node_tree=group_tree)
+    tree.link(tex2.outputs[0], group_output.inputs[0])
+    case("group", group.outputs[0], "color3")
+    empty_group = tree.node("Group2", "GROUP", [], ["Color"], node_tree=None)
+    case("group_without_tree", empty_group.outputs[0], "color3")
+
+    bump = tree.node("Bump", "BUMP", ["Height"], ["Normal"])
+    tree.link(tex2.outputs[0], bump.inputs[0])
+    case("bump", bump.outputs[0], "vector3")
+
+    separate_xyz = tree.node("SXYZ", "SEPARATE_XYZ", ["Vector"], ["X", "Y", "Z"])
+    tree.link(mapping.outputs[0], separate_xyz.inputs[0])
+    case("separate_xyz", separate_xyz.outputs[2], "float")
+
+    environment = tree.node("Env", "TEX_ENVIRONMENT", ["Vector"], ["Color"], image=texture("e"))
+    case("environment", environment.outputs[0], "color3")
+    missing_environment = tree.node("Env2", "TEX_ENVIRONMENT", ["Vector"], ["Color"], image=None)
+    case("environment_without_image", missing_environment.outputs[0], "color3")
+
+    # Chains far past the default recursion limit.
+    upstream = value.outputs[0]
+    for index in range(DEEP_CHAIN_LENGTH):
+        reroute = tree.node(f"DeepR{index}", "REROUTE", ["In"], ["Out"])
+        tree.link(upstream, reroute.inputs[0])
+        upstream = reroute.outputs[0]
+    case("deep_reroute_chain", upstream, "float")
+
+    upstream = value.outputs[0]
+    for index in range(DEEP_CHAIN_LENGTH):
+        add = tree.node(f"DeepAdd{index}", "MATH", ["V1", ("V2", 0.5)], ["Value"], operation="ADD")
+        tree.link(upstream, add.inputs[0])
+        upstream = add.outputs[0]
+    case("deep_math_chain", upstream, "float")
+
+    upstream = tex1.outputs[0]
+    for index in range(DEEP_CHAIN_LENGTH):
+        hue_sat = tree.node(
+            f"DeepHS{index}",
+            "HUE_SAT",
+            [("Hue", 0.5), ("Saturation", 1.1), ("Value", 1.0), ("Fac", 1.0), "Color"],
+            ["Color"],
+        )
+        tree.link(upstream, hue_sat.inputs[4])
+        upstream = hue_sat.outputs[0]
+    case("deep_color_chain", upstream, "color3")
+
+    return cases
+
+
+def resolve_cases(image_dir):
+    """Resolve every case in order with one shared cache; returns {name: normalized spec}."""
+    cache = {}
+    results = {}
+    for name, socket, expected_type in build_cases(image_dir):
+        spec = normalize(core._resolve_socket_value(socket, cache=cache, expected_type=expected_type))
+        results[name] = {"sha256": digest(spec)} if name.startswith("deep_") else spec
+    return results
+
+
+def normalize(spec):
+    """Copy `spec`, reducing staged texture paths to their source file name."""
+    root = [spec]
+    stack = [(root, 0, spec)]
+    while stack:
+        parent, key, value = stack.pop()
+        if isinstance(value, dict):
+            copy = dict(value)
+            parent[key] = copy
+            for item_key, item in copy.items():
+                if item_key == "path" and isinstance(item, str):
+                    copy[item_key] = re.sub(r"_[0-9a-f]{8}(\.\w+)$", r"\1", Path(item).name)
+                else:
+                    stack.append((copy, item_key, item))
+        elif isinstance(value, list):
+            copy = list(value)
+            parent[key] = copy
+            stack.extend((copy, index, item) for index, item in enumerate(copy))
+    return root[0]
+
+
+def digest(spec):
+    """SHA-256 of a canonical encoding of `spec`, built without recursion."""
+    hasher = hashlib.sha256()
+    stack = [(False, spec)]
+    while stack:
+        is_token, value = stack.pop()
+        if is_token:
+            hasher.update(value.encode())
+        elif isinstance(value, dict):
+            hasher.update(b"{")
+            stack.append((True, "}"))
+            for key in sorted(value, reverse=True):
+                stack.append((False, value[key]))
+                stack.append((True, f"{key!r}:"))
+        elif isinstance(value, list):
+            hasher.update(b"[")
+            stack.append((True, "]"))
+            stack.extend((False, item) for item in reversed(value))
+        else:
+            hasher.update(f"{value!r},".encode())
+    return hasher.hexdigest()
+
+
+def test_resolver_matches_previous_implementation(tmp_path):
+    expected = ast.literal_eval(EXPECTED_PATH.read_text(encoding="utf-8"))
+    actual = resolve_cases(tmp_path)
+    assert list(actual) == list(expected)
+    for name in expected:
+        assert actual[name] == expected[name], name